@@ -0,0 +1,45 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNT = 20
+MATCHER_LATENCY = 0.002
+CONCURRENCIES = (1, 4, 16)
+REPEATS = 20
+
+
+def make_resolver(concurrency: int) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler, concurrency=concurrency)
+    for index in range(HANDLER_COUNT):
+        async def handler(request):
+            pass
+
+        # Only the oldest handler matches, so every matcher is evaluated
+        async def matcher(request, matches=(index == 0)):
+            await asyncio.sleep(MATCHER_LATENCY)
+            return matches
+        resolver.register_matcher(matcher, handler)
+    return resolver
+
+
+async def measure(resolver: Resolver) -> float:
+    request = SimpleNamespace(method="GET", path="/", segments=None)
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / REPEATS * 1_000
+
+
+async def main() -> None:
+    print(f"{'concurrency':>12} {'resolve, ms':>12}")
+    for concurrency in CONCURRENCIES:
+        elapsed = await measure(make_resolver(concurrency))
+        print(f"{concurrency:>12} {elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
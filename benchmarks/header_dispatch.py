@@ -0,0 +1,48 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from multidict import CIMultiDict, MultiDict
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, HeaderMatcher, MethodMatcher, PathMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNTS = (20, 200, 2_000, 20_000)
+REPEATS = 200
+
+
+def make_resolver(count: int) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler)
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            MethodMatcher("GET", resolver=resolver),
+            PathMatcher("/users", resolver=resolver),
+            HeaderMatcher({"X-Tenant": f"tenant{index}"}, resolver=resolver),
+        ], resolver=resolver)(handler)
+    return resolver
+
+
+async def measure(resolver: Resolver, tenant: str) -> float:
+    request = SimpleNamespace(method="GET", path="/users", segments=None,
+                              headers=CIMultiDict({"X-Tenant": tenant}), query=MultiDict())
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / REPEATS * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'handlers':>10} {'oldest hit, us':>16} {'miss, us':>10}")
+    for count in HANDLER_COUNTS:
+        resolver = make_resolver(count)
+        oldest_hit = await measure(resolver, "tenant0")
+        miss = await measure(resolver, "unknown")
+        print(f"{count:>10} {oldest_hit:>16.1f} {miss:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
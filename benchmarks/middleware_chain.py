@@ -0,0 +1,46 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import MethodMatcher
+from jj.middlewares import RootMiddleware
+from jj.resolvers import Registry, Resolver
+from jj.runners import AppRunner
+
+MIDDLEWARE_COUNTS = (0, 1, 5)
+REPEATS = 50_000
+
+
+def make_runner(middleware_count: int) -> AppRunner:
+    app = DefaultApp()
+    resolver = Resolver(Registry(), app, default_handler)
+
+    async def handler(request):
+        return None
+    MethodMatcher("*", resolver=resolver)(handler)
+
+    # Middlewares are unique per type, so each one gets its own class
+    middlewares = [type(f"Middleware{index}", (RootMiddleware,), {})(resolver)
+                   for index in range(middleware_count)]
+    return AppRunner(app, resolver, middlewares, asyncio.get_running_loop())
+
+
+async def measure(runner: AppRunner) -> float:
+    request = SimpleNamespace(method="GET", path="/", headers={}, segments=None)
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await runner._handle(request)
+    return (time.perf_counter() - started_at) / REPEATS * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'middlewares':>12} {'per request, us':>16}")
+    for count in MIDDLEWARE_COUNTS:
+        elapsed = await measure(make_runner(count))
+        print(f"{count:>12} {elapsed:>16.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
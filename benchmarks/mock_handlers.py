@@ -0,0 +1,60 @@
+import time
+
+from jj.matchers import AllMatcher, MethodMatcher, PathMatcher
+from jj.mock import Mock
+from jj.responses import Response
+
+HANDLER_COUNT = 100_000
+REPEATS = 1_000
+
+
+def make_matcher(mock: Mock, index: int) -> AllMatcher:
+    resolver = mock.resolver
+    return AllMatcher([
+        MethodMatcher("GET", resolver=resolver),
+        PathMatcher(f"/users/{index}", resolver=resolver),
+    ], resolver=resolver)
+
+
+def register(mock: Mock, start: int, count: int) -> None:
+    for index in range(start, start + count):
+        mock._register_handler(f"id{index}", make_matcher(mock, index), Response(), None)
+
+
+def measure_register(mock: Mock) -> float:
+    matchers = [make_matcher(mock, HANDLER_COUNT + index) for index in range(REPEATS)]
+    started_at = time.perf_counter()
+    for index, matcher in enumerate(matchers):
+        mock._register_handler(f"new{index}", matcher, Response(), None)
+    return REPEATS / (time.perf_counter() - started_at)
+
+
+def measure_deregister(mock: Mock) -> float:
+    started_at = time.perf_counter()
+    for index in range(REPEATS):
+        mock._deregister_handler(f"new{index}")
+    return REPEATS / (time.perf_counter() - started_at)
+
+
+def measure_lookup(mock: Mock) -> float:
+    # what `api_history` does before reading the history of a handler
+    repeats = REPEATS // 10
+    started_at = time.perf_counter()
+    for index in range(repeats):
+        mock._get_handler_by_id(f"id{index}")
+    return repeats / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    mock = Mock()
+    register(mock, 0, HANDLER_COUNT)
+
+    registers = measure_register(mock)
+    deregisters = measure_deregister(mock)
+    lookups = measure_lookup(mock)
+    print(f"{'handlers':>10} {'registers/s':>12} {'deregisters/s':>14} {'lookups/s':>10}")
+    print(f"{HANDLER_COUNT:>10} {registers:>12.0f} {deregisters:>14.0f} {lookups:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from multidict import CIMultiDict
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, HeaderMatcher, PathMatcher, RegexMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNTS = (10, 100, 1_000, 10_000)
+REPEATS = 50
+
+
+def make_resolver(count: int, combine_regexes: bool) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler,
+                        combine_regexes=combine_regexes)
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            PathMatcher(RegexMatcher(f"^/users/{index}/items/[0-9]+$"), resolver=resolver),
+            HeaderMatcher({"X-Tenant": RegexMatcher(f"^tenant-{index}$")}, resolver=resolver),
+        ], resolver=resolver)(handler)
+    return resolver
+
+
+async def measure(resolver: Resolver, path: str, tenant: str) -> float:
+    request = SimpleNamespace(method="GET", path=path, segments=None,
+                              headers=CIMultiDict({"X-Tenant": tenant}), query={})
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / REPEATS * 1_000_000
+
+
+async def main() -> None:
+    # combine_regexes=False is a plain per-matcher `_compiled.search` per handler
+    print(f"{'handlers':>10} {'per-matcher hit, us':>20} {'combined hit, us':>17} "
+          f"{'per-matcher miss, us':>21} {'combined miss, us':>18}")
+    for count in HANDLER_COUNTS:
+        separate = make_resolver(count, combine_regexes=False)
+        combined = make_resolver(count, combine_regexes=True)
+        separate_hit = await measure(separate, "/users/0/items/1", "tenant-0")
+        combined_hit = await measure(combined, "/users/0/items/1", "tenant-0")
+        separate_miss = await measure(separate, "/unknown", "tenant-0")
+        combined_miss = await measure(combined, "/unknown", "tenant-0")
+        print(f"{count:>10} {separate_hit:>20.1f} {combined_hit:>17.1f} "
+              f"{separate_miss:>21.1f} {combined_miss:>18.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import asyncio
+import gc
+import time
+import tracemalloc
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from undecorated import undecorated
+
+from jj.apps import DefaultApp
+from jj.expiration_policy import ExpireNever
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, MethodMatcher, PathMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNT = 10_000
+REPEATS = 20_000
+
+
+class BaselineRegistry:
+    # The layout before RegistryEntry: nested OrderedDicts per container and name
+    def __init__(self) -> None:
+        self._registry: Any = OrderedDict()
+
+    def add(self, container: Any, name: str, key: Any, value: Any = None) -> None:
+        if container not in self._registry:
+            self._registry[container] = OrderedDict()
+        if name not in self._registry[container]:
+            self._registry[container][name] = OrderedDict()
+        self._registry[container][name][key] = value
+
+    def get(self, container: Any, name: str) -> Any:
+        if (container not in self._registry) or (name not in self._registry[container]):
+            return OrderedDict()
+        return self._registry[container][name]
+
+
+def make_baseline_lookup(registry: BaselineRegistry) -> Callable[[str, Any, Any], Any]:
+    # Attributes were looked up by the unwrapped handler, unwrapped on every lookup
+    def get_attribute(name: str, handler: Any, default: Any) -> Any:
+        try:
+            unwrapped = undecorated(handler)
+        except ValueError:
+            unwrapped = handler
+        unwrapped = handler if (unwrapped is None) else unwrapped
+        return registry.get(unwrapped, "attributes").get(name, default)
+    return get_attribute
+
+
+def register(resolver: Resolver, count: int) -> List[Any]:
+    handlers = []
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            MethodMatcher("GET", resolver=resolver),
+            PathMatcher(f"/users/{index}", resolver=resolver),
+        ], resolver=resolver)(handler)
+        resolver.register_attribute("handler_id", f"id{index}", handler)
+        resolver.register_attribute("expiration_policy", ExpireNever(), handler)
+        handlers.append(handler)
+    return handlers
+
+
+def measure_memory(registry: Any) -> float:
+    # Measured without matchers, so only the registry's own structures are counted
+    handlers = []
+    for index in range(HANDLER_COUNT):
+        async def handler(request):
+            pass
+        handlers.append(handler)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for index, handler in enumerate(handlers):
+        registry.add(handler, "matchers", index)
+        registry.add(handler, "attributes", "handler_id", f"id{index}")
+        registry.add(handler, "attributes", "expiration_policy", None)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / HANDLER_COUNT
+
+
+async def measure_throughput(baseline: bool) -> float:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler)
+    handlers = register(resolver, HANDLER_COUNT)
+    get_attribute = resolver.get_attribute
+    if baseline:
+        # Resolution is the same, only the attribute lookups go through the old layout
+        registry = BaselineRegistry()
+        for index, handler in enumerate(handlers):
+            registry.add(handler, "attributes", "handler_id", f"id{index}")
+            registry.add(handler, "attributes", "expiration_policy", ExpireNever())
+        get_attribute = make_baseline_lookup(registry)
+    request = SimpleNamespace(method="GET", path="/users/0", segments=None)
+
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        # what a request costs: resolving it and looking up the handler's attributes
+        handler = await resolver.resolve(request, DefaultApp())
+        get_attribute("middlewares", handler, [])
+        get_attribute("logger", handler, None)
+        get_attribute("handler_id", handler, None)
+    return REPEATS / (time.perf_counter() - started_at)
+
+
+async def main() -> None:
+    print(f"{'layout':>10} {'handlers':>10} {'requests/s':>12} {'bytes/handler':>14}")
+    for layout, baseline in [("baseline", True), ("current", False)]:
+        throughput = await measure_throughput(baseline)
+        memory = measure_memory(BaselineRegistry() if baseline else Registry())
+        print(f"{layout:>10} {HANDLER_COUNT:>10} {throughput:>12.0f} {memory:>14.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
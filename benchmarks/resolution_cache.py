@@ -0,0 +1,61 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from multidict import CIMultiDict, MultiDict
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, HeaderMatcher, MethodMatcher, PathMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNTS = (10, 100, 1_000, 10_000)
+COMBINATIONS = 200
+REPEATS = 10
+
+
+def make_resolver(count: int, cache_size: int) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler, cache_size=cache_size)
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            MethodMatcher("GET", resolver=resolver),
+            PathMatcher(f"/users/{index}/items/{{id}}", resolver=resolver),
+            HeaderMatcher({"X-Tenant": f"tenant{index % 10}"}, resolver=resolver),
+        ], resolver=resolver)(handler)
+    return resolver
+
+
+def make_requests(count: int):
+    return [
+        SimpleNamespace(method="GET", path=f"/users/{index % count}/items/{index}",
+                        headers=CIMultiDict({"X-Tenant": f"tenant{index % 10}",
+                                             "X-Request-Id": str(index)}),
+                        query=MultiDict(), segments=None)
+        for index in range(COMBINATIONS)
+    ]
+
+
+async def measure(resolver: Resolver, requests) -> float:
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        for request in requests:
+            await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / (REPEATS * len(requests)) * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'handlers':>10} {'uncached, us':>14} {'cached, us':>12} {'hit rate':>10}")
+    for count in HANDLER_COUNTS:
+        requests = make_requests(count)
+        uncached = await measure(make_resolver(count, 0), requests)
+        resolver = make_resolver(count, COMBINATIONS)
+        cached = await measure(resolver, requests)
+        info = resolver.cache_info
+        hit_rate = info.hits / (info.hits + info.misses)
+        print(f"{count:>10} {uncached:>14.1f} {cached:>12.1f} {hit_rate:>10.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, MethodMatcher, PathMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNTS = (10, 100, 1_000, 10_000, 50_000)
+REPEATS = 200
+
+
+SCENARIOS = (
+    # (name, route pattern, path of the oldest handler)
+    ("static", "/users/{index}", "/users/0"),
+    ("dynamic", "/users/{{id}}/items{index}/{{item_id}}", "/users/1/items0/2"),
+)
+
+
+def make_resolver(count: int, pattern: str) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler)
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            MethodMatcher("GET", resolver=resolver),
+            PathMatcher(pattern.format(index=index), resolver=resolver),
+        ], resolver=resolver)(handler)
+    return resolver
+
+
+async def measure(resolver: Resolver, path: str) -> float:
+    request = SimpleNamespace(method="GET", path=path, segments=None)
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / REPEATS * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'routes':>8} {'handlers':>10} {'oldest hit, us':>16} {'miss, us':>10}")
+    for name, pattern, path in SCENARIOS:
+        for count in HANDLER_COUNTS:
+            resolver = make_resolver(count, pattern)
+            oldest_hit = await measure(resolver, path)
+            miss = await measure(resolver, "/unknown")
+            print(f"{name:>8} {count:>10} {oldest_hit:>16.1f} {miss:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
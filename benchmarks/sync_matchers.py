@@ -0,0 +1,59 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Type
+
+from multidict import CIMultiDict, MultiDict
+
+from jj.apps import DefaultApp
+from jj.handlers import default_handler
+from jj.matchers import AllMatcher, EqualMatcher, HeaderMatcher, ParamMatcher
+from jj.resolvers import Registry, Resolver
+
+HANDLER_COUNTS = (10, 100, 1_000, 10_000)
+REPEATS = 50
+
+
+class AsyncEqualMatcher(EqualMatcher):
+    # Same logic, but always awaited (like matchers loaded with --use-matchers)
+    async def match(self, actual: Any) -> bool:
+        return self.match_sync(actual)
+
+
+def make_resolver(count: int, matcher_class: Type[EqualMatcher],
+                  compile_matchers: bool = False) -> Resolver:
+    resolver = Resolver(Registry(), DefaultApp(), default_handler,
+                        compile_matchers=compile_matchers)
+    for index in range(count):
+        async def handler(request):
+            pass
+        AllMatcher([
+            HeaderMatcher({"X-Tenant": matcher_class("tenant")}, resolver=resolver),
+            ParamMatcher({"page": matcher_class("1")}, resolver=resolver),
+            ParamMatcher({"id": matcher_class(str(index))}, resolver=resolver),
+        ], resolver=resolver)(handler)
+    return resolver
+
+
+async def measure(resolver: Resolver) -> float:
+    request = SimpleNamespace(method="GET", path="/", segments=None,
+                              headers=CIMultiDict({"X-Tenant": "tenant"}),
+                              query=MultiDict({"page": "1", "id": "0"}))
+    started_at = time.perf_counter()
+    for _ in range(REPEATS):
+        await resolver.resolve(request, DefaultApp())
+    return (time.perf_counter() - started_at) / REPEATS * 1_000_000
+
+
+async def main() -> None:
+    # The oldest handler matches, so every handler is evaluated
+    print(f"{'handlers':>10} {'async, us':>12} {'sync, us':>12} {'compiled, us':>14}")
+    for count in HANDLER_COUNTS:
+        awaited = await measure(make_resolver(count, AsyncEqualMatcher))
+        synchronous = await measure(make_resolver(count, EqualMatcher))
+        compiled = await measure(make_resolver(count, EqualMatcher, compile_matchers=True))
+        print(f"{count:>10} {awaited:>12.1f} {synchronous:>12.1f} {compiled:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
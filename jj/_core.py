@@ -140,14 +140,15 @@ def match_param(name: str, value: StrOrAttrMatcher) -> ParamMatcher:
     return ParamMatcher([(name, value)], resolver=resolver)
 
 
-def match_all(matchers: List[ResolvableMatcher]) -> AllMatcher:
+def match_all(matchers: List[ResolvableMatcher], *, reorder: bool = False) -> AllMatcher:
     """
     Match an HTTP request if all provided matchers succeed.
 
     :param matchers: A list of matchers that must all succeed for the request to match.
+    :param reorder: Whether to reorder the matchers by their observed cost and selectivity.
     :return: An `AllMatcher` that will match only if all the matchers succeed.
     """
-    return AllMatcher(matchers, resolver=resolver)
+    return AllMatcher(matchers, resolver=resolver, reorder=reorder)
 
 
 def match_any(matchers: List[ResolvableMatcher]) -> AnyMatcher:
@@ -163,7 +164,10 @@ def match_any(matchers: List[ResolvableMatcher]) -> AnyMatcher:
 def match(method: Optional[StrOrAttrMatcher] = None,
           path: Optional[StrOrAttrMatcher] = None,
           params: Optional[DictOrTupleListOrAttrMatcher] = None,
-          headers: Optional[DictOrTupleListOrAttrMatcher] = None) -> AllMatcher:
+          headers: Optional[DictOrTupleListOrAttrMatcher] = None,
+          *,
+          reorder: bool = False,
+          priority: int = 0) -> AllMatcher:
     """
     Match an HTTP request based on multiple criteria such as method, path,
     query parameters, and headers.
@@ -172,6 +176,10 @@ def match(method: Optional[StrOrAttrMatcher] = None,
     :param path: The request path to match (optional).
     :param params: The query parameters to match (optional).
     :param headers: The headers to match (optional).
+    :param reorder: Whether to reorder the conditions by their observed cost and
+                    selectivity, instead of checking them in the order above.
+    :param priority: The priority of the handler; handlers of a higher priority take
+                     precedence regardless of registration order.
     :return: An `AllMatcher` that matches if all specified conditions are met.
     """
     submatchers: List[ResolvableMatcher] = []
@@ -183,7 +191,7 @@ def match(method: Optional[StrOrAttrMatcher] = None,
         submatchers += [ParamMatcher(params, resolver=resolver)]
     if headers:
         submatchers += [HeaderMatcher(headers, resolver=resolver)]
-    return AllMatcher(submatchers, resolver=resolver)
+    return AllMatcher(submatchers, resolver=resolver, reorder=reorder, priority=priority)
 
 
 def start(app: AbstractApp, *,
@@ -1,9 +1,11 @@
 import argparse
+from functools import partial
 from os import environ as env
 from pathlib import Path
 
 import jj
 from jj.mock import Mock
+from jj.resolvers import Resolver
 
 from ._load_module import load_module
 
@@ -29,6 +31,20 @@ def run() -> None:
         "--use-matchers", type=str, nargs="+",
         help="Path(s) to custom matcher module(s), separated by space."
     )
+    parser.add_argument(
+        "--max-handlers", type=int, default=None,
+        help="Maximum number of registered handlers, least recently used are evicted "
+             "(default: None)"
+    )
+    parser.add_argument(
+        "--idle-ttl", type=float, default=None,
+        help="Seconds after which handlers without hits are evicted (default: None)"
+    )
+    parser.add_argument(
+        "--matcher-concurrency", type=int, default=1,
+        help="Number of async (e.g. custom) matchers of different handlers evaluated "
+             "at the same time (default: 1)"
+    )
     args = parser.parse_args()
 
     if args.use_matchers:
@@ -36,4 +52,7 @@ def run() -> None:
             module_path = Path(module_path_str)
             load_module(module_path)
 
-    jj.serve(Mock(), host=args.host, port=args.port)
+    resolver_factory = partial(Resolver, concurrency=args.matcher_concurrency)
+    mock = Mock(resolver_factory=resolver_factory,
+                max_handlers=args.max_handlers, idle_ttl=args.idle_ttl)
+    jj.serve(mock, host=args.host, port=args.port)
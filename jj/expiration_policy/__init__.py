@@ -1,9 +1,13 @@
 from ._expiration_policy import ExpirationPolicy
 from ._expire_after_requests import ExpireAfterRequests
+from ._expire_after_seconds import ExpireAfterSeconds
+from ._expire_at import ExpireAt
 from ._expire_never import ExpireNever
 
 __all__ = (
     "ExpirationPolicy",
     "ExpireNever",
     "ExpireAfterRequests",
+    "ExpireAfterSeconds",
+    "ExpireAt",
 )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ..requests import Request
 
 __all__ = ("ExpirationPolicy",)
@@ -21,6 +23,31 @@ class ExpirationPolicy:
         """
         raise NotImplementedError()
 
+    def is_permanently_expired(self) -> bool:
+        """
+        Determine whether the policy has reached a terminal expired state.
+
+        Once this returns `True`, it must keep returning `True`, and `is_expired`
+        must return `True` for any request without changing the policy's state.
+        This allows handlers with such a policy to be skipped without matching
+        and removed from resolution altogether.
+
+        :return: `True` if the policy will never be valid again, otherwise `False`.
+        """
+        return False
+
+    def get_deadline(self) -> Optional[float]:
+        """
+        Return the time after which the policy is expired regardless of requests.
+
+        Policies with a deadline are also permanently expired once it has passed,
+        so handlers using them can be removed in bulk when their deadlines come.
+
+        :return: The deadline on the monotonic clock (see `time.monotonic`), or `None`
+                 if there is none.
+        """
+        return None
+
     def __repr__(self) -> str:
         """
         Return a string representation of the ExpirationPolicy instance.
@@ -53,6 +53,14 @@ class ExpireAfterRequests(ExpirationPolicy):
             return False
         return True
 
+    def is_permanently_expired(self) -> bool:
+        """
+        Check if all the allowed requests have been made.
+
+        :return: `True` if the mock will never match again, otherwise `False`.
+        """
+        return self._current_requests_count >= self._max_requests_count
+
     def __repr__(self) -> str:
         """
         Return a string representation of the ExpireAfterRequests instance.
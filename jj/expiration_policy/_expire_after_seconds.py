@@ -0,0 +1,98 @@
+from time import monotonic
+from typing import Any, Dict, Optional
+
+from packed import packable
+
+from ..requests import Request
+from ._expiration_policy import ExpirationPolicy
+
+__all__ = ("ExpireAfterSeconds",)
+
+
+@packable("jj.expiration_policy.ExpireAfterSeconds")
+class ExpireAfterSeconds(ExpirationPolicy):
+    """
+    Represents an expiration policy based on the time passed since its creation.
+
+    This policy expires a mocked response a specified number of seconds after
+    the policy is created. A policy sent to a remote mock is unpacked (and so
+    created) when the handler is registered, so the time is counted from then.
+    The time is measured by the monotonic clock, so setting the system clock
+    doesn't shorten or extend it.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        """
+        Initialize the ExpireAfterSeconds policy with the number of seconds it is valid for.
+
+        :param seconds: The number of seconds after which the mock expires.
+                        Must be greater than 0.
+        :raises AssertionError: If `seconds` is less than or equal to 0.
+        """
+        assert seconds > 0, f"seconds must be more than 0, {seconds} given"
+
+        self._seconds = seconds
+        self._deadline = monotonic() + seconds
+
+    @property
+    def seconds(self) -> float:
+        """
+        Return the number of seconds the policy is valid for.
+
+        :return: The number of seconds.
+        """
+        return self._seconds
+
+    async def is_expired(self, request: Request) -> bool:
+        """
+        Check if the mock has expired based on the time passed since its creation.
+
+        :param request: The current request being evaluated (not used in this policy).
+        :return: `True` if the mock has expired, otherwise `False`.
+        """
+        return monotonic() >= self._deadline
+
+    def is_permanently_expired(self) -> bool:
+        """
+        Check if the deadline of the policy has passed.
+
+        :return: `True` if the mock will never match again, otherwise `False`.
+        """
+        return monotonic() >= self._deadline
+
+    def get_deadline(self) -> Optional[float]:
+        """
+        Return the time of creation plus the number of seconds the policy is valid for.
+
+        :return: The deadline on the monotonic clock.
+        """
+        return self._deadline
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the ExpireAfterSeconds instance.
+
+        :return: A string representation of the instance.
+        """
+        return f"{self.__class__.__qualname__}({self._seconds!r})"
+
+    def __packed__(self) -> Dict[str, Any]:
+        """
+        Serialize the ExpireAfterSeconds instance for packing.
+
+        :return: A dictionary containing the serialized form of the instance.
+        """
+        return {
+            "seconds": self._seconds,
+        }
+
+    @classmethod
+    def __unpacked__(cls, *, seconds: float, **kwargs: Any) -> "ExpireAfterSeconds":
+        """
+        Unpack a serialized ExpireAfterSeconds instance.
+
+        :param seconds: The number of seconds after which the mock expires.
+        :param kwargs: Additional keyword arguments (ignored).
+        :return: A new instance of ExpireAfterSeconds.
+        """
+        return cls(seconds=seconds)
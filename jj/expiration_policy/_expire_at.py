@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from time import monotonic, time
+from typing import Any, Dict, Optional
+
+from packed import packable
+
+from ..requests import Request
+from ._expiration_policy import ExpirationPolicy
+
+__all__ = ("ExpireAt",)
+
+
+@packable("jj.expiration_policy.ExpireAt")
+class ExpireAt(ExpirationPolicy):
+    """
+    Represents an expiration policy based on a point in time.
+
+    This policy expires a mocked response once the specified time has come.
+    Naive datetimes are treated as UTC, the same way they are packed.
+    """
+
+    def __init__(self, expires_at: datetime) -> None:
+        """
+        Initialize the ExpireAt policy with the time the mock expires at.
+
+        :param expires_at: The time after which the mock expires.
+        """
+        self._expires_at = expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        self._deadline = expires_at.timestamp()
+
+    @property
+    def expires_at(self) -> datetime:
+        """
+        Return the time the mock expires at.
+
+        :return: The expiration time.
+        """
+        return self._expires_at
+
+    async def is_expired(self, request: Request) -> bool:
+        """
+        Check if the mock has expired based on the current time.
+
+        :param request: The current request being evaluated (not used in this policy).
+        :return: `True` if the mock has expired, otherwise `False`.
+        """
+        return time() >= self._deadline
+
+    def is_permanently_expired(self) -> bool:
+        """
+        Check if the expiration time has come.
+
+        :return: `True` if the mock will never match again, otherwise `False`.
+        """
+        return time() >= self._deadline
+
+    def get_deadline(self) -> Optional[float]:
+        """
+        Return the expiration time on the monotonic clock, as of the current time.
+
+        The expiration time itself is a point in wall-clock time, so `is_expired` is
+        still checked against the system clock.
+
+        :return: The deadline on the monotonic clock.
+        """
+        return monotonic() + (self._deadline - time())
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the ExpireAt instance.
+
+        :return: A string representation of the instance.
+        """
+        return f"{self.__class__.__qualname__}({self._expires_at!r})"
+
+    def __packed__(self) -> Dict[str, Any]:
+        """
+        Serialize the ExpireAt instance for packing.
+
+        :return: A dictionary containing the serialized form of the instance.
+        """
+        return {
+            "expires_at": self._expires_at,
+        }
+
+    @classmethod
+    def __unpacked__(cls, *, expires_at: datetime, **kwargs: Any) -> "ExpireAt":
+        """
+        Unpack a serialized ExpireAt instance.
+
+        :param expires_at: The time after which the mock expires.
+        :param kwargs: Additional keyword arguments (ignored).
+        :return: A new instance of ExpireAt.
+        """
+        return cls(expires_at=expires_at)
@@ -1,6 +1,9 @@
+from typing import Any, Dict, Hashable, Mapping, Optional, Type
+
 from ..handlers import HandlerFunction
 from ..requests import Request
-from ..resolvers import Resolver
+from ..resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
+from ._structural_key import build_structural_key
 
 __all__ = ("ResolvableMatcher",)
 
@@ -33,6 +36,92 @@ class ResolvableMatcher:
         """
         raise NotImplementedError()
 
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if the incoming HTTP request matches the conditions.
+
+        Callers use it instead of awaiting `match` only if `is_sync` returns `True`,
+        which saves creating a coroutine per matcher.
+
+        :param request: The HTTP request to evaluate against the matcher.
+        :return: `True` if the request matches, otherwise `False`.
+        :raises NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError()
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        Only an exact `True` enables the synchronous path. By default matchers
+        are awaited.
+
+        :return: `True` if `match_sync` can be called instead of awaiting `match`.
+        """
+        return False
+
+    def _is_customized(self, cls: Type["ResolvableMatcher"]) -> bool:
+        """
+        Determine if a subclass of `cls` overrides its matching logic.
+
+        :param cls: The class whose matching logic is expected.
+        :return: `True` if `match` or `match_sync` is overridden, otherwise `False`.
+        """
+        return (type(self).match is not cls.match) or \
+               (type(self).match_sync is not cls.match_sync)
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Describe the literal request values this matcher can possibly accept.
+
+        The resolver uses these keys to skip handlers that can't match a request
+        without evaluating their matchers. By default no constraints are reported,
+        so the matcher is always evaluated.
+
+        :return: The dispatch keys of this matcher.
+        """
+        return DispatchKeys()
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Describe the request attributes the result of this matcher depends on.
+
+        The resolver caches resolutions of requests with the same values of these
+        attributes, if enabled. Custom matchers may depend on anything (e.g. the body),
+        so by default the matcher is reported as not cacheable.
+
+        :return: The fingerprint fields, or `None` if the result can't be cached.
+        """
+        return None
+
+    async def get_segments(self, request: Request,
+                           results: Optional[Mapping[Hashable, Any]] = None
+                           ) -> Optional[Dict[str, str]]:
+        """
+        Extract the path segments of a request this matcher has matched.
+
+        The resolver calls it only for the handler it picks, so matchers don't set
+        request attributes while handlers are compared. It's called only if the matcher
+        has matched the request. By default there are no segments.
+
+        :param request: The HTTP request to extract the segments from.
+        :param results: Results kept while matching the request (see `MatcherCompiler`).
+        :return: The segments, or `None` if this matcher doesn't provide any.
+        """
+        return None
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as a Python expression evaluated against `request`.
+
+        The resolver compiles the expressions of a handler's matchers into a single
+        function. By default the expression just calls this matcher.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        return compiler.call(self, "request")
+
     def __call__(self, handler: HandlerFunction) -> HandlerFunction:
         """
         Register a handler function to be executed when a request matches.
@@ -43,6 +132,44 @@ class ResolvableMatcher:
         self._resolver.register_matcher(self.match, handler)
         return handler
 
+    def get_structural_key(self) -> Optional[Hashable]:
+        """
+        Return the key this matcher is compared and hashed by, built once from its packed form.
+
+        :return: The key, or `None` if the matcher is compared by identity.
+        """
+        try:
+            return self.__dict__["_structural_key"]  # type: ignore
+        except KeyError:
+            key = self.__dict__["_structural_key"] = build_structural_key(self)
+            return key
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Determine if the other matcher is structurally equal to this one.
+
+        Matchers of the same class with equal packed forms are equal, so identical
+        conditions of different handlers can share their results.
+
+        :param other: The object to compare with.
+        :return: `True` if the matchers are equal, otherwise `False`.
+        """
+        if self is other:
+            return True
+        if not isinstance(other, ResolvableMatcher):
+            return NotImplemented
+        key = self.get_structural_key()
+        return (key is not None) and (key == other.get_structural_key())
+
+    def __hash__(self) -> int:
+        """
+        Return the hash of the matcher's structural key.
+
+        :return: The hash value.
+        """
+        key = self.get_structural_key()
+        return hash(key) if (key is not None) else id(self)
+
     def __repr__(self) -> str:
         """
         Return a string representation of the ResolvableMatcher instance.
@@ -0,0 +1,31 @@
+from typing import Any, Hashable, Optional
+
+__all__ = ("build_structural_key",)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze(val) for val in value))
+    hash(value)  # raises TypeError for unhashable values
+    # The type is kept, so that e.g. EqualMatcher(1) and EqualMatcher("1") differ
+    return (type(value), value)
+
+
+def build_structural_key(matcher: Any) -> Optional[Hashable]:
+    """
+    Build a key that is equal for matchers of the same class and packed form.
+
+    Nested matchers are part of the key as is, so they are compared by their own keys.
+
+    :param matcher: The matcher to build the key for.
+    :return: The key, or `None` if the matcher can't be packed into hashable values.
+    """
+    packed = getattr(matcher, "__packed__", None)
+    if packed is None:
+        return None
+    try:
+        return (type(matcher), _freeze(packed()))
+    except TypeError:
+        return None
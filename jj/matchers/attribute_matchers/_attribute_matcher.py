@@ -1,4 +1,7 @@
-from typing import Any
+from typing import Any, FrozenSet, Hashable, Optional, Type
+
+from ...resolvers import MatcherCompiler
+from .._structural_key import build_structural_key
 
 __all__ = ("AttributeMatcher",)
 
@@ -15,12 +18,124 @@ class AttributeMatcher:
         """
         Determine if the actual value matches the criteria defined by the matcher.
 
+        By default, this delegates to `match_sync`. Matchers that need to await
+        something override this method instead.
+
+        :param actual: The value to be matched against.
+        :return: `True` if the value matches the criteria, otherwise `False`.
+        :raises NotImplementedError: If neither `match` nor `match_sync` is implemented.
+        """
+        return self.match_sync(actual)
+
+    def match_sync(self, actual: Any) -> bool:
+        """
+        Determine synchronously if the actual value matches the criteria.
+
+        Callers use it instead of awaiting `match` only if `is_sync` returns `True`.
+
         :param actual: The value to be matched against.
         :return: `True` if the value matches the criteria, otherwise `False`.
         :raises NotImplementedError: This method must be implemented in subclasses.
         """
         raise NotImplementedError()
 
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        That is the case for matchers implementing `match_sync` only; a matcher
+        that overrides `match` is always awaited.
+
+        :return: `True` if `match_sync` can be called instead of awaiting `match`.
+        """
+        cls = type(self)
+        return (cls.match is AttributeMatcher.match) and \
+               (cls.match_sync is not AttributeMatcher.match_sync)
+
+    def is_pure(self) -> bool:
+        """
+        Determine if the result depends on the matched value only.
+
+        That is the case for the built-in matchers; matchers with custom
+        matching logic have to declare it by overriding this method.
+
+        :return: `True` if equal values are always matched the same way, otherwise `False`.
+        """
+        cls, package = type(self), f"{__package__}."
+        return (cls.match_sync is not AttributeMatcher.match_sync) and \
+            cls.match.__module__.startswith(package) and \
+            cls.match_sync.__module__.startswith(package)
+
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe this matcher as a Python expression evaluated against `actual`.
+
+        By default the expression just calls this matcher.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        return compiler.call(self, actual)
+
+    def get_literals(self) -> Optional[FrozenSet[Any]]:
+        """
+        Return the finite set of values this matcher accepts, if there is one.
+
+        Request matchers use the literals to build dispatch keys for the resolver.
+
+        :return: A set of accepted values, or `None` if the accepted values can't be enumerated.
+        """
+        return None
+
+    def _is_customized(self, cls: Type["AttributeMatcher"]) -> bool:
+        """
+        Determine if a subclass of `cls` overrides its matching logic.
+
+        :param cls: The class whose matching logic is expected.
+        :return: `True` if `match` or `match_sync` is overridden, otherwise `False`.
+        """
+        return (type(self).match is not cls.match) or \
+               (type(self).match_sync is not cls.match_sync)
+
+    def get_structural_key(self) -> Optional[Hashable]:
+        """
+        Return the key this matcher is compared and hashed by, built once from its packed form.
+
+        :return: The key, or `None` if the matcher is compared by identity.
+        """
+        try:
+            return self.__dict__["_structural_key"]  # type: ignore
+        except KeyError:
+            key = self.__dict__["_structural_key"] = build_structural_key(self)
+            return key
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Determine if the other matcher is structurally equal to this one.
+
+        Matchers of the same class with equal packed forms are equal, so identical
+        conditions of different handlers can share their results.
+
+        :param other: The object to compare with.
+        :return: `True` if the matchers are equal, otherwise `False`.
+        """
+        if self is other:
+            return True
+        if not isinstance(other, AttributeMatcher):
+            return NotImplemented
+        key = self.get_structural_key()
+        return (key is not None) and (key == other.get_structural_key())
+
+    def __hash__(self) -> int:
+        """
+        Return the hash of the matcher's structural key.
+
+        :return: The hash value.
+        """
+        key = self.get_structural_key()
+        return hash(key) if (key is not None) else id(self)
+
     def __repr__(self) -> str:
         """
         Return a string representation of the AttributeMatcher instance.
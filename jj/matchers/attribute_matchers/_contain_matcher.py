@@ -2,6 +2,7 @@ from typing import Any, Dict
 
 from packed import packable
 
+from ...resolvers import MatcherCompiler
 from ._attribute_matcher import AttributeMatcher
 
 __all__ = ("ContainMatcher", "NotContainMatcher",)
@@ -32,7 +33,7 @@ class ContainMatcher(AttributeMatcher):
         """
         return self._expected
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Determine if the actual value contains the expected value.
 
@@ -41,6 +42,18 @@ class ContainMatcher(AttributeMatcher):
         """
         return self._expected in actual
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the containment check as a Python expression, with the expected value inlined.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(ContainMatcher):
+            return super().compile(compiler, actual)
+        return f"({compiler.add_constant(self._expected)} in {actual})"
+
     def __repr__(self) -> str:
         """
         Return a string representation of the ContainMatcher instance.
@@ -77,7 +90,7 @@ class NotContainMatcher(ContainMatcher):
     This matcher checks if the expected value is not present in the actual value.
     """
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Determine if the actual value does not contain the expected value.
 
@@ -86,6 +99,18 @@ class NotContainMatcher(ContainMatcher):
         """
         return self._expected not in actual
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the containment check as a Python expression, with the expected value inlined.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(NotContainMatcher):
+            return super().compile(compiler, actual)
+        return f"({compiler.add_constant(self._expected)} not in {actual})"
+
     def __packed__(self) -> Dict[str, Any]:
         """
         Pack the NotContainMatcher instance for serialization.
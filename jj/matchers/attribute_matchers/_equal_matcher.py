@@ -1,7 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet, Optional
 
 from packed import packable
 
+from ...resolvers import MatcherCompiler
 from ._attribute_matcher import AttributeMatcher
 
 __all__ = ("EqualMatcher", "NotEqualMatcher",)
@@ -33,7 +34,7 @@ class EqualMatcher(AttributeMatcher):
         """
         return self._expected
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Determine if the actual value matches the expected value.
 
@@ -42,6 +43,33 @@ class EqualMatcher(AttributeMatcher):
         """
         return bool(self._expected == actual)
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the comparison as a Python expression, with the expected value inlined.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(EqualMatcher):
+            return super().compile(compiler, actual)
+        return f"({compiler.add_constant(self._expected)} == {actual})"
+
+    def get_literals(self) -> Optional[FrozenSet[Any]]:
+        """
+        Return the expected value as the only accepted literal.
+
+        Only string values are reported, as their equality and hashing agree. Subclasses
+        that override `match` or `match_sync` (e.g. `NotEqualMatcher`) don't report any literals.
+
+        :return: A set with the expected value, or `None` if it can't be used as a literal.
+        """
+        if self._is_customized(EqualMatcher):
+            return None
+        if not isinstance(self._expected, str):
+            return None
+        return frozenset([self._expected])
+
     def __repr__(self) -> str:
         """
         Return a string representation of the EqualMatcher instance.
@@ -79,7 +107,7 @@ class NotEqualMatcher(EqualMatcher):
     match the predefined expected value.
     """
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Determine if the actual value does not match the expected value.
 
@@ -88,6 +116,18 @@ class NotEqualMatcher(EqualMatcher):
         """
         return bool(self._expected != actual)
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the comparison as a Python expression, with the expected value inlined.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(NotEqualMatcher):
+            return super().compile(compiler, actual)
+        return f"({compiler.add_constant(self._expected)} != {actual})"
+
     def __packed__(self) -> Dict[str, Any]:
         """
         Pack the NotEqualMatcher instance for serialization.
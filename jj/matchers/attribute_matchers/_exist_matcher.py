@@ -2,6 +2,7 @@ from typing import Any, Dict
 
 from packed import packable
 
+from ...resolvers import MatcherCompiler
 from ._attribute_matcher import AttributeMatcher
 
 __all__ = ("ExistMatcher", "NotExistMatcher",)
@@ -16,7 +17,7 @@ class ExistMatcher(AttributeMatcher):
     regardless of its actual content.
     """
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Always return `True`, as this matcher matches any request.
 
@@ -25,6 +26,18 @@ class ExistMatcher(AttributeMatcher):
         """
         return True
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe this matcher as a Python expression, which is always true.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(ExistMatcher):
+            return super().compile(compiler, actual)
+        return "True"
+
     def __packed__(self) -> Dict[str, Any]:
         """
         Pack the ExistMatcher instance for serialization.
@@ -53,7 +66,7 @@ class NotExistMatcher(AttributeMatcher):
     If the attribute exists, the matcher does not match.
     """
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Return `False` if the attribute exists in the request.
 
@@ -65,6 +78,18 @@ class NotExistMatcher(AttributeMatcher):
         """
         return False
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe this matcher as a Python expression, which is always false.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(NotExistMatcher):
+            return super().compile(compiler, actual)
+        return "False"
+
     def __packed__(self) -> Dict[str, Any]:
         """
         Pack the NotExistMatcher instance for serialization.
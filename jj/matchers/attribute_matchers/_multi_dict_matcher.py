@@ -1,14 +1,17 @@
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
 
 from multidict import MultiDict, MultiMapping
 from packed import packable
 
+from ...resolvers import MatcherCompiler, RegexPattern
 from ._attribute_matcher import AttributeMatcher
 from ._equal_matcher import EqualMatcher
 from ._exist_matcher import NotExistMatcher
+from ._regex_matcher import RegexMatcher
 
 __all__ = ("MultiDictMatcher", "StrOrAttrMatcher", "DictOrTupleList",)
 
+
 StrOrAttrMatcher = Union[str, AttributeMatcher]
 DictOrTupleList = Union[
     Dict[str, StrOrAttrMatcher],
@@ -16,6 +19,12 @@ DictOrTupleList = Union[
 ]
 
 
+def _check_multi_mapping(actual: Any) -> bool:
+    if not isinstance(actual, MultiMapping):
+        raise TypeError(f"Expected MultiMapping, got '{type(actual).__name__}'")
+    return True
+
+
 @packable("jj.matchers.MultiDictMatcher")
 class MultiDictMatcher(AttributeMatcher):
     """
@@ -52,11 +61,28 @@ class MultiDictMatcher(AttributeMatcher):
         :param values: A list of values to be evaluated.
         :return: `True` if any value matches the submatcher, otherwise `False`.
         """
+        if len(values) == 0:
+            return False
+        if submatcher.is_sync() is True:
+            return self._match_any_sync(submatcher, values)
         for value in values:
             if await submatcher.match(value):
                 return True
         return False
 
+    def _match_any_sync(self, submatcher: AttributeMatcher, values: List[Any]) -> bool:
+        """
+        Determine synchronously if any value in the list matches the given submatcher.
+
+        :param submatcher: The synchronous matcher to evaluate each value.
+        :param values: A list of values to be evaluated.
+        :return: `True` if any value matches the submatcher, otherwise `False`.
+        """
+        for value in values:
+            if submatcher.match_sync(value):
+                return True
+        return False
+
     async def match(self, actual: MultiMapping[str]) -> bool:
         """
         Determine if the actual request data satisfies the expected key-value conditions.
@@ -65,8 +91,7 @@ class MultiDictMatcher(AttributeMatcher):
                        query parameters).
         :return: `True` if all expected conditions are met, otherwise `False`.
         """
-        if not isinstance(actual, MultiMapping):
-            raise TypeError(f"Expected MultiMapping, got '{type(actual).__name__}'")
+        _check_multi_mapping(actual)
 
         for key, val in self._expected.items():
             # 1) Special case: key must NOT exist
@@ -86,6 +111,132 @@ class MultiDictMatcher(AttributeMatcher):
         # All expected conditions are satisfied
         return True
 
+    def match_sync(self, actual: MultiMapping[str]) -> bool:
+        """
+        Determine synchronously if the actual request data satisfies the expected conditions.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param actual: A MultiMapping representing request attributes (e.g., headers or
+                       query parameters).
+        :return: `True` if all expected conditions are met, otherwise `False`.
+        """
+        _check_multi_mapping(actual)
+
+        for key, val in self._expected.items():
+            if isinstance(val, NotExistMatcher):
+                if key in actual:
+                    return False
+                continue
+
+            submatcher = val if isinstance(val, AttributeMatcher) else EqualMatcher(val)
+            values: List[Any] = actual.getall(key, [])
+            if not self._match_any_sync(submatcher, values):
+                return False
+
+        return True
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if every expected value is matched synchronously, otherwise `False`.
+        """
+        if self._is_customized(MultiDictMatcher):
+            return False
+        for val in self._expected.values():
+            if isinstance(val, AttributeMatcher) and (val.is_sync() is not True):
+                return False
+        return True
+
+    def is_pure(self) -> bool:
+        """
+        Determine if the result depends on the matched value only.
+
+        :return: `True` if matching isn't customized and every expected value is
+                 matched by a pure submatcher, otherwise `False`.
+        """
+        if not super().is_pure():
+            return False
+        for val in self._expected.values():
+            if isinstance(val, AttributeMatcher) and (val.is_pure() is not True):
+                return False
+        return True
+
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the conditions as a Python expression, one check per expected key.
+
+        Literal values are looked up with "in", values of other synchronous
+        submatchers are looped over inline; anything else is matched by awaiting
+        `_match_any`.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(MultiDictMatcher):
+            return super().compile(compiler, actual)
+
+        conditions = [f"{compiler.add_constant(_check_multi_mapping)}({actual})"]
+        for key, val in self._expected.items():
+            if isinstance(val, NotExistMatcher):
+                conditions.append(f"({compiler.add_constant(key)} not in {actual})")
+                continue
+            submatcher = val if isinstance(val, AttributeMatcher) else EqualMatcher(val)
+            values = f"{actual}.getall({compiler.add_constant(key)}, ())"
+            literals = submatcher.get_literals()
+            if (literals is not None) and (len(literals) == 1):
+                literal, = literals
+                conditions.append(f"({compiler.add_constant(literal)} in {values})")
+            elif submatcher.is_sync() is True:
+                value = compiler.get_variable()
+                condition = compiler.compile_attribute(submatcher, value)
+                if condition == "True":  # any value will do
+                    conditions.append(f"({compiler.add_constant(key)} in {actual})")
+                else:
+                    conditions.append(f"any({condition} for {value} in {values})")
+            else:
+                match_any = compiler.add_constant(self._match_any)
+                submatcher_name = compiler.add_constant(submatcher)
+                conditions.append(compiler.await_(f"{match_any}({submatcher_name}, {values})"))
+        return "(" + " and ".join(conditions) + ")"
+
+    def get_key_literals(self) -> List[Tuple[str, FrozenSet[Any]]]:
+        """
+        Return the finite sets of values that values of the expected keys must be in.
+
+        Plain string values (and other submatchers with literals) are reported,
+        so exact-value conditions can be used as dispatch keys.
+
+        :return: A list of (key, literals) pairs; empty if the matcher's logic is customized.
+        """
+        if self._is_customized(MultiDictMatcher):
+            return []
+        key_literals = []
+        for key, val in self._expected.items():
+            submatcher = val if isinstance(val, AttributeMatcher) else EqualMatcher(val)
+            literals = submatcher.get_literals()
+            if literals is not None:
+                key_literals.append((key, literals))
+        return key_literals
+
+    def get_regexes(self) -> List[Tuple[str, RegexPattern]]:
+        """
+        Return the regex patterns that values of the expected keys must match.
+
+        :return: A list of (key, pattern) pairs; empty if the matcher's logic is customized.
+        """
+        if self._is_customized(MultiDictMatcher):
+            return []
+        regexes = []
+        for key, val in self._expected.items():
+            if isinstance(val, RegexMatcher):
+                regex = val.get_regex()
+                if regex is not None:
+                    regexes.append((key, regex))
+        return regexes
+
     def __repr__(self) -> str:
         """
         Return a string representation of the MultiDictMatcher instance.
@@ -1,8 +1,9 @@
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from packed import packable
 
+from ...resolvers import MatcherCompiler, RegexPattern
 from ._attribute_matcher import AttributeMatcher
 
 __all__ = ("RegexMatcher",)
@@ -46,7 +47,7 @@ class RegexMatcher(AttributeMatcher):
         """
         return self._flags
 
-    async def match(self, actual: Any) -> bool:
+    def match_sync(self, actual: Any) -> bool:
         """
         Determine if the actual value matches the regular expression pattern.
 
@@ -55,6 +56,29 @@ class RegexMatcher(AttributeMatcher):
         """
         return self._compiled.search(actual) is not None
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the search as a Python expression calling the compiled pattern directly.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(RegexMatcher):
+            return super().compile(compiler, actual)
+        search = compiler.add_constant(self._compiled.search)
+        return f"({search}({actual}) is not None)"
+
+    def get_regex(self) -> Optional[RegexPattern]:
+        """
+        Return the pattern to search for together with other handlers' patterns.
+
+        :return: The regex pattern, or `None` if the matcher's logic is customized.
+        """
+        if self._is_customized(RegexMatcher):
+            return None
+        return RegexPattern(self._pattern, self._flags)
+
     def __repr__(self) -> str:
         """
         Return a string representation of the RegexMatcher instance.
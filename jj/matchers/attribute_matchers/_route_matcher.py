@@ -1,8 +1,9 @@
-from typing import Any, Dict, Union
+from typing import Any, Dict, FrozenSet, Optional, Union
 
 from aiohttp.web_urldispatcher import DynamicResource
 from packed import packable
 
+from ...resolvers import MatcherCompiler, RoutePattern
 from ._attribute_matcher import AttributeMatcher
 
 __all__ = ("RouteMatcher",)
@@ -43,6 +44,7 @@ class RouteMatcher(AttributeMatcher):
         """
         self._path = path
         self._resource = _Resource(path)
+        self._route: Optional[RoutePattern] = None
 
     @property
     def path(self) -> str:
@@ -60,9 +62,19 @@ class RouteMatcher(AttributeMatcher):
         :param path: The URL path to extract segments from.
         :return: A dictionary of matched segments.
         """
-        return self._resource.match(path) or {}
+        return self.match_segments(path) or {}
 
-    async def match(self, path: str) -> bool:
+    def match_segments(self, path: str) -> Optional[Dict[str, str]]:
+        """
+        Match the given path and return its segments with a single regex match.
+
+        :param path: The URL path to match.
+        :return: A dictionary of matched segments if the path matches the route pattern,
+                 otherwise `None`.
+        """
+        return self._resource.match(path)
+
+    def match_sync(self, path: str) -> bool:
         """
         Determine if the actual path matches the expected route pattern.
 
@@ -71,6 +83,44 @@ class RouteMatcher(AttributeMatcher):
         """
         return self._resource.match(path) is not None
 
+    def compile(self, compiler: MatcherCompiler, actual: str) -> str:
+        """
+        Describe the route match as a Python expression calling the resource directly.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :param actual: The source of the expression for the value to be matched.
+        :return: The source of the expression.
+        """
+        if self._is_customized(RouteMatcher):
+            return super().compile(compiler, actual)
+        match = compiler.add_constant(self._resource.match)
+        return f"({match}({actual}) is not None)"
+
+    def get_literals(self) -> Optional[FrozenSet[Any]]:
+        """
+        Return the route path as the only accepted literal if the route is static.
+
+        :return: A set with the route path, or `None` if the route has dynamic segments.
+        """
+        if self._is_customized(RouteMatcher):
+            return None
+        # Static routes compile to an escaped literal, unless the path needed requoting
+        if self._resource.canonical != self._path or ("{" in self._path):
+            return None
+        return frozenset([self._path])
+
+    def get_route(self) -> Optional[RoutePattern]:
+        """
+        Return the route pattern to index the matcher by in the resolver's route tree.
+
+        :return: The route pattern, or `None` if the matcher's logic is customized.
+        """
+        if self._is_customized(RouteMatcher):
+            return None
+        if self._route is None:
+            self._route = RoutePattern(self._path)
+        return self._route
+
     def __repr__(self) -> str:
         """
         Return a string representation of the RouteMatcher instance.
@@ -1,13 +1,38 @@
-from typing import Any, Dict, List
+from time import perf_counter
+from typing import Any, Dict, Hashable, List, Mapping, Optional
 
 from packed import packable
 
+from ...handlers import HandlerFunction
 from ...requests import Request
-from ...resolvers import Resolver
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
 from .._resolvable_matcher import ResolvableMatcher
 from ._logical_matcher import LogicalMatcher
 
-__all__ = ("AllMatcher",)
+__all__ = ("AllMatcher", "has_priority",)
+
+
+class _MatcherStats:
+    __slots__ = ("cost", "rejections")
+
+    def __init__(self) -> None:
+        self.cost = 0.0
+        self.rejections = 0.0
+
+    def get_rank(self) -> float:
+        # Evaluating the cheapest matcher per rejection first minimizes the expected cost
+        # of a conjunction; a matcher that never rejects is evaluated last
+        return (self.cost / self.rejections) if self.rejections else float("inf")
+
+    def decay(self) -> None:
+        self.cost /= 2
+        self.rejections /= 2
+
+
+def has_priority(matchers: List[ResolvableMatcher]) -> bool:
+    # Only the matcher a handler is registered to sets its priority
+    return any(isinstance(matcher, AllMatcher) and (matcher.priority != 0)
+               for matcher in matchers)
 
 
 @packable("jj.matchers.AllMatcher")
@@ -18,20 +43,68 @@ class AllMatcher(LogicalMatcher):
     This matcher combines multiple `ResolvableMatcher` instances, and it
     returns `True` only if every matcher in the list successfully matches
     the incoming HTTP request.
+
+    With `reorder` enabled, the matcher measures how long each sub-matcher
+    takes and how often it rejects a request, and every `reorder_interval`
+    evaluations reorders them so the cheapest and most selective ones run first.
+
+    Handlers registered with a non-zero `priority` take precedence over handlers
+    of a lower priority regardless of registration order. The priority belongs to
+    the handler, so only the outermost matcher of a handler can have one.
     """
 
-    def __init__(self, matchers: List[ResolvableMatcher], *, resolver: Resolver) -> None:
+    reorder_interval = 100
+
+    def __init__(self, matchers: List[ResolvableMatcher], *, resolver: Resolver,
+                 reorder: bool = False, priority: int = 0) -> None:
         """
         Initialize an AllMatcher with a list of matchers and a resolver.
 
         :param matchers: A list of matchers to evaluate. Matching succeeds only if
                          every matcher in this list returns `True`.
         :param resolver: The resolver responsible for registering this matcher.
-        :raises AssertionError: If the matchers list is empty.
+        :param reorder: Whether to reorder the matchers by their observed cost and
+                        selectivity (the declared order is kept otherwise).
+        :param priority: The priority of the handlers this matcher is registered to.
+        :raises AssertionError: If the matchers list is empty or any of them has a priority.
         """
         super().__init__(resolver=resolver)
         assert len(matchers) > 0
+        assert not has_priority(matchers), \
+            "Priority of a nested matcher is ignored, set it on the outermost matcher"
         self._matchers = matchers
+        self._reorder = reorder
+        self._priority = priority
+        self._order = list(range(len(matchers)))
+        self._stats = [_MatcherStats() for _ in matchers]
+        self._evaluations = 0
+
+    @property
+    def reorder(self) -> bool:
+        """
+        Return whether the matchers are reordered by their cost and selectivity.
+
+        :return: `True` if reordering is enabled, otherwise `False`.
+        """
+        return self._reorder
+
+    @property
+    def priority(self) -> int:
+        """
+        Return the priority of the handlers this matcher is registered to.
+
+        :return: The priority, `0` by default.
+        """
+        return self._priority
+
+    @property
+    def evaluation_order(self) -> List[ResolvableMatcher]:
+        """
+        Return the matchers in the order they are currently evaluated.
+
+        :return: A list of matchers; the declared order unless reordering is enabled.
+        """
+        return [self._matchers[position] for position in self._order]
 
     @property
     def sub_matchers(self) -> List[ResolvableMatcher]:
@@ -49,39 +122,215 @@ class AllMatcher(LogicalMatcher):
         :param request: The HTTP request to evaluate.
         :return: `True` only if every matcher in the list returns `True`, otherwise `False`.
         """
+        if self._reorder:
+            return await self._match_reordering(request)
         for matcher in self._matchers:
-            if not await matcher.match(request):
+            # Synchronous sub-matchers are evaluated without creating a coroutine
+            if matcher.is_sync() is True:
+                if not matcher.match_sync(request):
+                    return False
+            elif not await matcher.match(request):
                 return False
         return True
 
+    async def _match_reordering(self, request: Request) -> bool:
+        """
+        Determine if all matchers match the given request, collecting their statistics.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` only if every matcher in the list returns `True`, otherwise `False`.
+        """
+        self._count_evaluation()
+        for position in self._order:
+            matcher, stats = self._matchers[position], self._stats[position]
+            started_at = perf_counter()
+            if matcher.is_sync() is True:
+                matched = matcher.match_sync(request)
+            else:
+                matched = await matcher.match(request)
+            stats.cost += perf_counter() - started_at
+            if not matched:
+                stats.rejections += 1
+                return False
+        return True
+
+    def _match_sync_reordering(self, request: Request) -> bool:
+        """
+        Determine synchronously if all matchers match the given request, collecting
+        their statistics.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` only if every matcher in the list returns `True`, otherwise `False`.
+        """
+        self._count_evaluation()
+        for position in self._order:
+            matcher, stats = self._matchers[position], self._stats[position]
+            started_at = perf_counter()
+            matched = matcher.match_sync(request)
+            stats.cost += perf_counter() - started_at
+            if not matched:
+                stats.rejections += 1
+                return False
+        return True
+
+    def _count_evaluation(self) -> None:
+        """
+        Count an evaluation and reorder the matchers once every `reorder_interval` ones.
+
+        Matchers are sorted by the time they took per request they rejected. Sorting is
+        stable, so matchers without statistics keep their relative order, and the
+        statistics decay so the order follows changes in the traffic.
+        """
+        self._evaluations += 1
+        if self._evaluations % self.reorder_interval != 0:
+            return
+        self._order = sorted(self._order, key=lambda position: self._stats[position].get_rank())
+        for stats in self._stats:
+            stats.decay()
+
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if all matchers in the list match the given request.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` only if every matcher in the list returns `True`, otherwise `False`.
+        """
+        if self._reorder:
+            return self._match_sync_reordering(request)
+        for matcher in self._matchers:
+            if not matcher.match_sync(request):
+                return False
+        return True
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if every sub-matcher is synchronous, otherwise `False`.
+        """
+        if self._is_customized(AllMatcher):
+            return False
+        return all(matcher.is_sync() is True for matcher in self._matchers)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expressions of its sub-matchers joined with "and".
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        # The order of a compiled expression is fixed, so reordering matchers are called
+        if self._is_customized(AllMatcher) or self._reorder:
+            return super().compile(compiler)
+        expressions = [compiler.compile_matcher(matcher) for matcher in self._matchers]
+        return "(" + " and ".join(expressions) + ")"
+
+    async def get_segments(self, request: Request,
+                           results: Optional[Mapping[Hashable, Any]] = None
+                           ) -> Optional[Dict[str, str]]:
+        """
+        Extract the path segments provided by the sub-matchers.
+
+        It's called only if this matcher has matched (`AnyMatcher` checks its branches
+        first), so every sub-matcher has matched, and the segments of the last one
+        providing any are returned, as if it was the last to set them.
+
+        :param request: The HTTP request to extract the segments from.
+        :param results: Results kept while matching the request (see `MatcherCompiler`).
+        :return: The segments, or `None` if no sub-matcher provides any.
+        """
+        segments = None
+        for matcher in self._matchers:
+            matcher_segments = await matcher.get_segments(request, results)
+            if matcher_segments is not None:
+                segments = matcher_segments
+        return segments
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Combine the dispatch keys of the sub-matchers.
+
+        Since every sub-matcher has to succeed, a constraint of any of them
+        applies to the whole matcher.
+
+        :return: The dispatch keys of this matcher.
+        """
+        keys = self._matchers[0].get_dispatch_keys()
+        for matcher in self._matchers[1:]:
+            keys &= matcher.get_dispatch_keys()
+        return keys
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Combine the fingerprint fields of the sub-matchers.
+
+        :return: The request attributes any of the sub-matchers depends on, or `None`
+                 if the result of any of them (or the matching logic) can't be cached.
+        """
+        if self._is_customized(AllMatcher):
+            return None
+        fields = FingerprintFields()
+        for matcher in self._matchers:
+            matcher_fields = matcher.get_fingerprint_fields()
+            if matcher_fields is None:
+                return None
+            fields |= matcher_fields
+        return fields
+
+    def __call__(self, handler: HandlerFunction) -> HandlerFunction:
+        """
+        Register a handler function, along with its priority if it is not the default.
+
+        :param handler: The function that will handle requests matching this matcher.
+        :return: The handler function, which is registered to the resolver.
+        """
+        handler = super().__call__(handler)
+        if self._priority != 0:
+            self._resolver.register_attribute("priority", self._priority, handler)
+        return handler
+
     def __repr__(self) -> str:
         """
         Return a string representation of the AllMatcher instance.
 
         :return: A string describing the class, matchers, and resolver.
         """
+        reorder = ", reorder=True" if self._reorder else ""
+        priority = f", priority={self._priority!r}" if self._priority else ""
         return (f"{self.__class__.__qualname__}"
-                f"({self._matchers!r}, resolver={self._resolver!r})")
+                f"({self._matchers!r}, resolver={self._resolver!r}{reorder}{priority})")
 
     def __packed__(self) -> Dict[str, Any]:
         """
         Pack the AllMatcher instance for serialization.
 
-        :return: A dictionary containing the serialized matchers.
+        :return: A dictionary containing the serialized matchers (and the reorder
+                 flag and priority, if not the defaults).
         """
-        return {"matchers": self._matchers}
+        packed: Dict[str, Any] = {"matchers": self._matchers}
+        if self._reorder:
+            packed["reorder"] = True
+        if self._priority != 0:
+            packed["priority"] = self._priority
+        return packed
 
     @classmethod
     def __unpacked__(cls, *,
                      matchers: List[ResolvableMatcher],
                      resolver: Resolver,
+                     reorder: bool = False,
+                     priority: int = 0,
                      **kwargs: Any) -> "AllMatcher":
         """
         Unpack an AllMatcher instance from its serialized form.
 
         :param matchers: The list of matchers to use for this instance.
         :param resolver: The resolver to bind this matcher to.
+        :param reorder: Whether to reorder the matchers by their cost and selectivity.
+        :param priority: The priority of the handlers this matcher is registered to.
         :param kwargs: Additional keyword arguments (ignored).
         :return: A new instance of AllMatcher.
         """
-        return cls(matchers, resolver=resolver)
+        return cls(matchers, resolver=resolver, reorder=reorder, priority=priority)
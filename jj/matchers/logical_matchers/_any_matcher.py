@@ -1,10 +1,11 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, List, Mapping, Optional
 
 from packed import packable
 
 from ...requests import Request
-from ...resolvers import Resolver
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
 from .._resolvable_matcher import ResolvableMatcher
+from ._all_matcher import has_priority
 from ._logical_matcher import LogicalMatcher
 
 __all__ = ("AnyMatcher",)
@@ -27,10 +28,13 @@ class AnyMatcher(LogicalMatcher):
         :param matchers: A list of matchers to evaluate. Matching succeeds if at least
                          one matcher in this list returns `True`.
         :param resolver: The resolver responsible for registering this matcher.
-        :raises AssertionError: If the matchers list is empty.
+        :raises AssertionError: If the matchers list is empty or any of them has a priority
+                                (the priority of a handler is set by its outermost matcher).
         """
         super().__init__(resolver=resolver)
         assert len(matchers) > 0
+        assert not has_priority(matchers), \
+            "Priority of a nested matcher is ignored, set it on the outermost matcher"
         self._matchers = matchers
 
     @property
@@ -50,10 +54,105 @@ class AnyMatcher(LogicalMatcher):
         :return: `True` if any of the matchers in the list returns `True`, otherwise `False`.
         """
         for matcher in self._matchers:
-            if await matcher.match(request):
+            # Synchronous sub-matchers are evaluated without creating a coroutine
+            if matcher.is_sync() is True:
+                if matcher.match_sync(request):
+                    return True
+            elif await matcher.match(request):
                 return True
         return False
 
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if any matcher in the list matches the given request.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` if any of the matchers in the list returns `True`, otherwise `False`.
+        """
+        for matcher in self._matchers:
+            if matcher.match_sync(request):
+                return True
+        return False
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if every sub-matcher is synchronous, otherwise `False`.
+        """
+        if self._is_customized(AnyMatcher):
+            return False
+        return all(matcher.is_sync() is True for matcher in self._matchers)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expressions of its sub-matchers joined with "or".
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(AnyMatcher):
+            return super().compile(compiler)
+        expressions = [compiler.compile_matcher(matcher) for matcher in self._matchers]
+        return "(" + " or ".join(expressions) + ")"
+
+    async def get_segments(self, request: Request,
+                           results: Optional[Mapping[Hashable, Any]] = None
+                           ) -> Optional[Dict[str, str]]:
+        """
+        Extract the path segments provided by the sub-matcher that matched.
+
+        Sub-matchers are checked in the same order as `match` does, and the segments
+        of the first one that matches the request are returned, so failed branches
+        never provide segments. Only synchronous sub-matchers are evaluated again, as
+        they have no side effects; if an asynchronous one (e.g. a custom matcher reading
+        the body) is reached first, the branch that matched isn't known.
+
+        :param request: The HTTP request to extract the segments from.
+        :param results: Results kept while matching the request (see `MatcherCompiler`).
+        :return: The segments, or `None` if the matching sub-matcher doesn't provide any
+                 (or it isn't known).
+        """
+        for matcher in self._matchers:
+            if matcher.is_sync() is not True:
+                return None
+            if matcher.match_sync(request):
+                return await matcher.get_segments(request, results)
+        return None
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Combine the dispatch keys of the sub-matchers.
+
+        Since any sub-matcher may succeed, only constraints shared by all of them
+        apply to the whole matcher.
+
+        :return: The dispatch keys of this matcher.
+        """
+        keys = self._matchers[0].get_dispatch_keys()
+        for matcher in self._matchers[1:]:
+            keys |= matcher.get_dispatch_keys()
+        return keys
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Combine the fingerprint fields of the sub-matchers.
+
+        :return: The request attributes any of the sub-matchers depends on, or `None`
+                 if the result of any of them (or the matching logic) can't be cached.
+        """
+        if self._is_customized(AnyMatcher):
+            return None
+        fields = FingerprintFields()
+        for matcher in self._matchers:
+            matcher_fields = matcher.get_fingerprint_fields()
+            if matcher_fields is None:
+                return None
+            fields |= matcher_fields
+        return fields
+
     def __repr__(self) -> str:
         """
         Return a string representation of the AnyMatcher instance.
@@ -1,9 +1,9 @@
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from packed import packable
 
 from ...requests import Request
-from ...resolvers import Resolver
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
 from ..attribute_matchers import AttributeMatcher, DictOrTupleList, MultiDictMatcher
 from ._request_matcher import RequestMatcher
 
@@ -54,6 +54,65 @@ class HeaderMatcher(RequestMatcher):
         """
         return await self._matcher.match(request.headers)
 
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if the request headers match the expected headers.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` if the request matches, otherwise `False`.
+        """
+        return self._matcher.match_sync(request.headers)
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if the sub-matcher is synchronous and matching isn't customized.
+        """
+        return (not self._is_customized(HeaderMatcher)) and (self._matcher.is_sync() is True)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expression of its sub-matcher for the request headers.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(HeaderMatcher):
+            return super().compile(compiler)
+        return compiler.compile_attribute(self._matcher, compiler.get_attribute("headers"))
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Describe the header values this matcher can accept.
+        Header names are case-insensitive, so they are lowercased.
+
+        :return: Dispatch keys constraining a ("header", name) dimension per exact value
+                 or regex the header must match, or no constraints.
+        """
+        keys = DispatchKeys()
+        if isinstance(self._matcher, MultiDictMatcher):
+            for name, literals in self._matcher.get_key_literals():
+                keys &= DispatchKeys({("header", name.lower()): literals})
+            for name, regex in self._matcher.get_regexes():
+                keys &= DispatchKeys({("header", name.lower()): frozenset([regex])})
+        return keys
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Describe the request attributes the result of this matcher depends on.
+
+        :return: The headers with the expected names (all of them, if the names aren't
+                 known), or `None` if the matching logic is customized.
+        """
+        if self._is_customized(HeaderMatcher) or (self._matcher.is_pure() is not True):
+            return None
+        if isinstance(self._matcher, MultiDictMatcher):
+            return FingerprintFields({"headers": frozenset(self._matcher.expected.keys())})
+        return FingerprintFields({"headers": None})
+
     def __repr__(self) -> str:
         """
         Return a string representation of the HeaderMatcher instance.
@@ -1,9 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from packed import packable
 
 from ...requests import Request
-from ...resolvers import Resolver
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
 from ..attribute_matchers import AttributeMatcher, EqualMatcher, StrOrAttrMatcher
 from ._request_matcher import RequestMatcher
 
@@ -52,6 +52,61 @@ class MethodMatcher(RequestMatcher):
         """
         return await self._matcher.match("*") or await self._matcher.match(request.method)
 
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if the request method matches the expected method.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` if the request matches, otherwise `False`.
+        """
+        return self._matcher.match_sync("*") or self._matcher.match_sync(request.method)
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if the sub-matcher is synchronous and matching isn't customized.
+        """
+        return (not self._is_customized(MethodMatcher)) and (self._matcher.is_sync() is True)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expressions of its sub-matcher for the wildcard
+        and for the request method.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(MethodMatcher):
+            return super().compile(compiler)
+        wildcard = compiler.compile_attribute(self._matcher, compiler.add_constant("*"))
+        method = compiler.compile_attribute(self._matcher, compiler.get_attribute("method"))
+        return f"({wildcard} or {method})"
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Describe the request methods this matcher can accept.
+
+        :return: Dispatch keys constraining the "method" dimension, or no constraints
+                 if the method is a wildcard or can't be enumerated.
+        """
+        methods = self._matcher.get_literals()
+        if (methods is None) or ("*" in methods):
+            return DispatchKeys()
+        return DispatchKeys({"method": methods})
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Describe the request attributes the result of this matcher depends on.
+
+        :return: The request method, or `None` if the matching logic is customized.
+        """
+        if self._is_customized(MethodMatcher) or (self._matcher.is_pure() is not True):
+            return None
+        return FingerprintFields({"method": None})
+
     def __repr__(self) -> str:
         """
         Return a string representation of the MethodMatcher instance.
@@ -1,9 +1,9 @@
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from packed import packable
 
 from ...requests import Request
-from ...resolvers import Resolver
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
 from ..attribute_matchers import AttributeMatcher, DictOrTupleList, MultiDictMatcher
 from ._request_matcher import RequestMatcher
 
@@ -54,6 +54,64 @@ class ParamMatcher(RequestMatcher):
         """
         return await self._matcher.match(request.query)
 
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if the request query parameters match the expected parameters.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` if the request matches, otherwise `False`.
+        """
+        return self._matcher.match_sync(request.query)
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if the sub-matcher is synchronous and matching isn't customized.
+        """
+        return (not self._is_customized(ParamMatcher)) and (self._matcher.is_sync() is True)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expression of its sub-matcher for the query parameters.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(ParamMatcher):
+            return super().compile(compiler)
+        return compiler.compile_attribute(self._matcher, compiler.get_attribute("query"))
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Describe the query parameter values this matcher can accept.
+
+        :return: Dispatch keys constraining a ("param", name) dimension per exact value
+                 or regex the query parameter must match, or no constraints.
+        """
+        keys = DispatchKeys()
+        if isinstance(self._matcher, MultiDictMatcher):
+            for name, literals in self._matcher.get_key_literals():
+                keys &= DispatchKeys({("param", name): literals})
+            for name, regex in self._matcher.get_regexes():
+                keys &= DispatchKeys({("param", name): frozenset([regex])})
+        return keys
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Describe the request attributes the result of this matcher depends on.
+
+        :return: The query parameters with the expected names (all of them, if the names aren't
+                 known), or `None` if the matching logic is customized.
+        """
+        if self._is_customized(ParamMatcher) or (self._matcher.is_pure() is not True):
+            return None
+        if isinstance(self._matcher, MultiDictMatcher):
+            return FingerprintFields({"query": frozenset(self._matcher.expected.keys())})
+        return FingerprintFields({"query": None})
+
     def __repr__(self) -> str:
         """
         Return a string representation of the ParamMatcher instance.
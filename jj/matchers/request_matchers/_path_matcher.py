@@ -1,10 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, Mapping, Optional, cast
 
 from packed import packable
 
 from ...requests import Request
-from ...resolvers import Resolver
-from ..attribute_matchers import AttributeMatcher, RouteMatcher, StrOrAttrMatcher
+from ...resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, Resolver
+from ..attribute_matchers import AttributeMatcher, RegexMatcher, RouteMatcher, StrOrAttrMatcher
 from ._request_matcher import RequestMatcher
 
 __all__ = ("PathMatcher",)
@@ -16,7 +16,7 @@ class PathMatcher(RequestMatcher):
     Matches HTTP requests based on the URL path.
 
     This matcher checks if the incoming request's URL path matches a specific
-    string or pattern, and can extract segments from the path if needed.
+    string or pattern. Segments of a route are extracted on demand (see `get_segments`).
     """
 
     def __init__(self, path: StrOrAttrMatcher, *, resolver: Resolver) -> None:
@@ -50,12 +50,98 @@ class PathMatcher(RequestMatcher):
         :return: `True` if the request path matches the expected path or pattern,
                  otherwise `False`.
         """
-        matched = await self._matcher.match(request.path)
-        if matched and isinstance(self._matcher, RouteMatcher):
-            request.segments = self._matcher.get_segments(request.path)
-        else:
-            request.segments = None  # type: ignore
-        return matched
+        return await self._matcher.match(request.path)
+
+    def match_sync(self, request: Request) -> bool:
+        """
+        Determine synchronously if the request path matches the expected path or pattern.
+
+        Used instead of awaiting `match` if `is_sync` returns `True`.
+
+        :param request: The HTTP request to evaluate.
+        :return: `True` if the request matches, otherwise `False`.
+        """
+        return self._matcher.match_sync(request.path)
+
+    def is_sync(self) -> bool:
+        """
+        Determine if the matcher can be evaluated with `match_sync`.
+
+        :return: `True` if the sub-matcher is synchronous and matching isn't customized.
+        """
+        return (not self._is_customized(PathMatcher)) and (self._matcher.is_sync() is True)
+
+    def compile(self, compiler: MatcherCompiler) -> str:
+        """
+        Describe this matcher as the expression of its sub-matcher for the request path.
+
+        :param compiler: The compiler that collects constants and request attributes.
+        :return: The source of the expression.
+        """
+        if self._is_customized(PathMatcher):
+            return super().compile(compiler)
+        path = compiler.get_attribute("path")
+        if isinstance(self._matcher, RouteMatcher):
+            route = self._matcher.get_route()
+            if route is not None:
+                # Segments are kept by route, so routes already matched by the resolver's
+                # route tree (or for another handler) aren't matched again
+                match = compiler.add_constant(self._matcher.match_segments)
+                return f"({compiler.memoize(route, f'{match}({path})')} is not None)"
+        return compiler.compile_attribute(self._matcher, path)
+
+    async def get_segments(self, request: Request,
+                           results: Optional[Mapping[Hashable, Any]] = None
+                           ) -> Optional[Dict[str, str]]:
+        """
+        Extract the path segments of a request matched by a route.
+
+        Matching has no side effects, so the resolver extracts segments only for
+        the handler it picks.
+
+        :param request: The HTTP request to extract the segments from.
+        :param results: Results kept while matching the request (see `compile`), so
+                        the segments of a route matched already are reused.
+        :return: The segments if the path matches the route, otherwise `None`
+                 (also if the path isn't matched by a route).
+        """
+        if not isinstance(self._matcher, RouteMatcher):
+            return None
+        route = self._matcher.get_route()
+        if (results is not None) and (route is not None) and (route in results):
+            return cast(Optional[Dict[str, str]], results[route])
+        return self._matcher.match_segments(request.path)
+
+    def get_dispatch_keys(self) -> DispatchKeys:
+        """
+        Describe the request paths this matcher can accept.
+
+        :return: Dispatch keys constraining the "path" dimension (literal paths,
+                 a route or a regex pattern), or no constraints if the paths can't
+                 be described.
+        """
+        paths = self._matcher.get_literals()
+        if paths is not None:
+            return DispatchKeys({"path": paths})
+
+        pattern: Optional[Hashable] = None
+        if isinstance(self._matcher, RouteMatcher):
+            pattern = self._matcher.get_route()
+        elif isinstance(self._matcher, RegexMatcher):
+            pattern = self._matcher.get_regex()
+        if pattern is None:
+            return DispatchKeys()
+        return DispatchKeys({"path": frozenset([pattern])})
+
+    def get_fingerprint_fields(self) -> Optional[FingerprintFields]:
+        """
+        Describe the request attributes the result of this matcher depends on.
+
+        :return: The request path, or `None` if the matching logic is customized.
+        """
+        if self._is_customized(PathMatcher) or (self._matcher.is_pure() is not True):
+            return None
+        return FingerprintFields({"path": None})
 
     def __repr__(self) -> str:
         """
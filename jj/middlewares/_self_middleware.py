@@ -1,5 +1,3 @@
-from inspect import signature
-
 from ..apps import AbstractApp
 from ..handlers import HandlerFunction
 from ..requests import Request
@@ -12,9 +10,7 @@ __all__ = ("SelfMiddleware",)
 class SelfMiddleware(RootMiddleware):
     async def do(self, request: Request, handler: HandlerFunction,
                  app: AbstractApp) -> StreamResponse:
-        unwrapped = self._resolver.unwrap(handler)
-        sig = signature(unwrapped)
-        if len(sig.parameters) == 2:
+        if self._resolver.get_arity(handler) == 2:
             response = await handler(app, request)
         else:
             response = await handler(request)
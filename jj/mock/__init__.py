@@ -3,6 +3,7 @@ import os
 from jj.logs import SystemLogFilter  # backward compatibility
 
 from ._create_remote_handler import create_remote_handler
+from ._handler_evictor import EvictionInfo
 from ._history import (
     HistoryAdapterType,
     HistoryFormatter,
@@ -27,7 +28,7 @@ __all__ = ("mocked", "stacked", "Mock", "Mocked", "create_remote_handler", "Remo
            "HistoryItem", "HistoryFormatter", "PrettyHistoryFormatter", "RemoteResponseType",
            "HistoryAdapterType", "SystemLogFilter", "default_history_adapter",
            "REMOTE_MOCK_URL", "REMOTE_MOCK_DISPOSABLE",
-           "get_remote_mock_url", "get_remote_mock_disposable",)
+           "get_remote_mock_url", "get_remote_mock_disposable", "EvictionInfo",)
 
 
 # Deprecated: Use getter methods instead to avoid race conditions with runtime env loading
@@ -17,7 +17,8 @@ def create_remote_handler(matcher: Union[RequestMatcher, LogicalMatcher],
                           expiration_policy: Optional[ExpirationPolicy] = None,
                           *,
                           mock_url: Optional[str] = None,
-                          history_adapter: Optional[HistoryAdapterType] = default_history_adapter
+                          history_adapter: Optional[HistoryAdapterType] = default_history_adapter,
+                          pinned: bool = False
                           ) -> RemoteHandler:
     """
     Create a remote handler for mocking HTTP requests.
@@ -36,9 +37,11 @@ def create_remote_handler(matcher: Union[RequestMatcher, LogicalMatcher],
                      "http://localhost:8080".
     :param history_adapter: Optional adapter for handling request/response history.
                             Defaults to `default_history_adapter`.
+    :param pinned: Whether the mock server must never evict the handler when it limits
+                   the number of handlers or their idle time.
     :return: A `RemoteHandler` instance configured with the specified parameters.
     """
     if mock_url is None:
         mock_url = get_remote_mock_url()
     return RemoteMock(mock_url).create_handler(matcher, response, expiration_policy,
-                                               history_adapter=history_adapter)
+                                               history_adapter=history_adapter, pinned=pinned)
@@ -0,0 +1,85 @@
+import heapq
+from asyncio import TimerHandle, get_running_loop
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+__all__ = ("ExpirationScheduler",)
+
+
+ExpiredHandlers = List[Tuple[str, Any]]
+
+
+class ExpirationScheduler:
+    """
+    Keeps the deadlines of handlers with time-based expiration policies in a
+    heap (on the monotonic clock, see ExpirationPolicy.get_deadline). A single
+    timer on the running loop fires at the earliest deadline and passes every
+    handler whose deadline has come to `on_expired` at once.
+
+    Discarded handlers are only marked as removed and are dropped from the heap
+    when they reach its top.
+    """
+
+    def __init__(self, on_expired: Callable[[ExpiredHandlers], None]) -> None:
+        self._on_expired = on_expired
+        self._heap: List[List[Any]] = []
+        self._entries: Dict[Any, List[Any]] = {}
+        self._seq = 0
+        self._timer: Optional[TimerHandle] = None
+        self._timer_deadline: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, handler_id: str, handler: Any, deadline: float) -> None:
+        self.discard(handler)
+        entry = [deadline, self._seq, handler_id, handler]
+        self._seq += 1
+        self._entries[handler] = entry
+        heapq.heappush(self._heap, entry)
+        self._schedule()
+
+    def discard(self, handler: Any) -> None:
+        entry = self._entries.pop(handler, None)
+        if entry is not None:
+            entry[-1] = None
+
+    def expire(self, now: Optional[float] = None) -> ExpiredHandlers:
+        now = monotonic() if (now is None) else now
+        expired = []
+        while self._heap and (self._heap[0][0] <= now):
+            _, _, handler_id, handler = heapq.heappop(self._heap)
+            if handler is not None:
+                del self._entries[handler]
+                expired.append((handler_id, handler))
+        return expired
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._timer_deadline = None
+
+    def _schedule(self) -> None:
+        while self._heap and (self._heap[0][-1] is None):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self.close()
+            return
+
+        deadline = self._heap[0][0]
+        if (self._timer is not None) and (self._timer_deadline == deadline):
+            return
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            return  # no loop to expire on, policies still expire on their own
+        self.close()
+        self._timer = loop.call_later(max(deadline - monotonic(), 0), self._fire)
+        self._timer_deadline = deadline
+
+    def _fire(self) -> None:
+        self._timer = self._timer_deadline = None
+        expired = self.expire()
+        if expired:
+            self._on_expired(expired)
+        self._schedule()
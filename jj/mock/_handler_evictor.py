@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import List, NamedTuple, Optional, Set
+
+__all__ = ("HandlerEvictor", "EvictionInfo",)
+
+
+class EvictionInfo(NamedTuple):
+    capacity: int
+    idle: int
+
+
+class HandlerEvictor:
+    """
+    Decides which registered handlers to evict once there are more than
+    `max_handlers` of them or they have been idle for `idle_ttl` seconds.
+
+    Handlers are kept in an OrderedDict from the least to the most recently
+    used (hit or registered), so both checks only look at its head. Pinned
+    handlers are never evicted and don't count towards `max_handlers` (unless
+    they are unpinned, e.g. once they expire).
+    """
+
+    def __init__(self, *,
+                 max_handlers: Optional[int] = None,
+                 idle_ttl: Optional[float] = None) -> None:
+        assert (max_handlers is None) or (max_handlers > 0), \
+            f"max_handlers must be more than 0, {max_handlers} given"
+        assert (idle_ttl is None) or (idle_ttl > 0), \
+            f"idle_ttl must be more than 0, {idle_ttl} given"
+        self._max_handlers = max_handlers
+        self._idle_ttl = idle_ttl
+        self._used_at: OrderedDict[str, float] = OrderedDict()
+        self._pinned: Set[str] = set()
+        self._evicted_over_capacity = 0
+        self._evicted_idle = 0
+
+    @property
+    def max_handlers(self) -> Optional[int]:
+        return self._max_handlers
+
+    @property
+    def idle_ttl(self) -> Optional[float]:
+        return self._idle_ttl
+
+    @property
+    def info(self) -> EvictionInfo:
+        return EvictionInfo(self._evicted_over_capacity, self._evicted_idle)
+
+    def __len__(self) -> int:
+        return len(self._used_at)
+
+    def add(self, handler_id: str, *, pinned: bool = False) -> None:
+        self.discard(handler_id)
+        if pinned:
+            self._pinned.add(handler_id)
+        else:
+            self._used_at[handler_id] = monotonic()
+
+    def touch(self, handler_id: str) -> None:
+        if handler_id in self._used_at:
+            self._used_at[handler_id] = monotonic()
+            self._used_at.move_to_end(handler_id)
+
+    def unpin(self, handler_id: str) -> None:
+        if handler_id in self._pinned:
+            self._pinned.discard(handler_id)
+            self._used_at[handler_id] = monotonic()
+
+    def discard(self, handler_id: str) -> None:
+        self._used_at.pop(handler_id, None)
+        self._pinned.discard(handler_id)
+
+    def evict(self, now: Optional[float] = None) -> List[str]:
+        evicted = []
+        if self._idle_ttl is not None:
+            idle_since = (monotonic() if (now is None) else now) - self._idle_ttl
+            while self._used_at:
+                handler_id, used_at = next(iter(self._used_at.items()))
+                if used_at > idle_since:
+                    break
+                del self._used_at[handler_id]
+                evicted.append(handler_id)
+            self._evicted_idle += len(evicted)
+
+        if self._max_handlers is not None:
+            while self._used_at and (len(self) > self._max_handlers):
+                handler_id, _ = self._used_at.popitem(last=False)
+                evicted.append(handler_id)
+                self._evicted_over_capacity += 1
+        return evicted
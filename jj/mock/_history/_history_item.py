@@ -12,3 +12,4 @@ class HistoryItem(TypedDict):
     response: HistoryResponse
     tags: List[str]
     created_at: datetime
+    seq: int
@@ -1,5 +1,6 @@
+from asyncio import Event, TimeoutError, get_running_loop, wait_for
 from datetime import datetime
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Set
 
 from ...requests import Request
 from ...responses import StreamResponse
@@ -7,12 +8,26 @@ from ._history_item import HistoryItem
 from ._history_request import HistoryRequest
 from ._history_response import HistoryResponse
 
-__all__ = ("HistoryRepository",)
+__all__ = ("HistoryRepository", "HistoryPredicate",)
+
+HistoryPredicate = Callable[[HistoryItem], Awaitable[bool]]
+
+
+class _Waiter:
+    __slots__ = ("event", "deleted")
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.deleted = False
 
 
 class HistoryRepository:
     def __init__(self) -> None:
         self._storage: List[HistoryItem] = []
+        # Sequence number of the last added item, items are kept newest first
+        self._seq = 0
+        # Waiters of `wait_by_tag`, woken only by changes of their tag
+        self._waiters: Dict[str, Set[_Waiter]] = {}
 
     async def add(self,
                   request: Request,
@@ -21,18 +36,89 @@ class HistoryRepository:
                   created_at: Optional[datetime] = None) -> None:
         req = await HistoryRequest.from_request(request)
         res = await HistoryResponse.from_response(response)
+        self._seq += 1
         self._storage.insert(0, {
             "request": req,
             "response": res,
             "tags": tags or [],
             "created_at": created_at or datetime.utcnow(),
+            "seq": self._seq,
         })
+        for tag in tags or []:
+            self._wake(tag)
 
     async def delete_by_tag(self, tag: str) -> None:
         self._storage = [x for x in self._storage if tag not in x["tags"]]
+        self._wake(tag, deleted=True)
+
+    async def get_by_tag(self, tag: str, *,
+                         since: Optional[int] = None,
+                         limit: Optional[int] = None) -> List[HistoryItem]:
+        # Items added after the `since` sequence number (the oldest `limit` of them),
+        # newer items are at the front, so older ones aren't scanned
+        if since is None:
+            history = [x for x in self._storage if tag in x["tags"]]
+        else:
+            history = []
+            for item in self._storage:
+                if item["seq"] <= since:
+                    break
+                if tag in item["tags"]:
+                    history.append(item)
+        if (limit is not None) and (len(history) > limit):
+            history = history[len(history) - limit:]
+        return history
+
+    async def wait_by_tag(self, tag: str, *,
+                          min_count: int,
+                          timeout: float,
+                          predicate: Optional[HistoryPredicate] = None,
+                          since: Optional[int] = None,
+                          limit: Optional[int] = None) -> List[HistoryItem]:
+        # Waits until at least `min_count` items (matching `predicate`, if any) are added
+        # after `since`, the history of the tag is deleted, or `timeout` seconds pass,
+        # and returns the items either way
+        loop = get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = _Waiter()
+        waiters = self._waiters.setdefault(tag, set())
+        waiters.add(waiter)
+        try:
+            # Only items added since the last wake up are scanned
+            count, scanned = 0, since
+            while True:
+                waiter.event.clear()
+                history = await self.get_by_tag(tag, since=scanned)
+                if len(history) > 0:
+                    scanned = history[0]["seq"]
+                count += await self._count(history, predicate)
+                if (count >= min_count) or waiter.deleted:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await wait_for(waiter.event.wait(), remaining)
+                except TimeoutError:
+                    break
+        finally:
+            waiters.discard(waiter)
+            if (len(waiters) == 0) and (self._waiters.get(tag) is waiters):
+                del self._waiters[tag]
+        return await self.get_by_tag(tag, since=since, limit=limit)
+
+    def _wake(self, tag: str, *, deleted: bool = False) -> None:
+        for waiter in self._waiters.get(tag, ()):
+            waiter.deleted = waiter.deleted or deleted
+            waiter.event.set()
 
-    async def get_by_tag(self, tag: str) -> List[HistoryItem]:
-        return [x for x in self._storage if tag in x["tags"]]
+    async def _count(self, history: List[HistoryItem],
+                     predicate: Optional[HistoryPredicate]) -> int:
+        if predicate is None:
+            return len(history)
+        return sum([1 for item in history if await predicate(item)])
 
     async def clear(self) -> None:
         self._storage.clear()
+        for tag in list(self._waiters):
+            self._wake(tag, deleted=True)
@@ -43,6 +43,11 @@ class HistoryRequest:
     def params(self) -> "MultiMapping[str]":
         return self._params
 
+    @property
+    def query(self) -> "MultiMapping[str]":
+        # the name request matchers (see ParamMatcher) look params up by
+        return self._params
+
     @property
     def headers(self) -> "MultiMapping[str]":
         return self._headers
@@ -48,6 +48,7 @@ class JsonRenderer:
                 "request": self._pack(item["request"]),
                 "response": self._pack(item["response"]),
                 "created_at": self._pack(item["created_at"]),
+                "seq": item["seq"],
             })
         return self._to_json(result)
 
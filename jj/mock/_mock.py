@@ -1,5 +1,8 @@
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+from functools import partial
+from math import inf
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+from weakref import WeakValueDictionary
 
 from packed import pack, unpack
 from yarl import URL
@@ -11,13 +14,16 @@ from jj.expiration_policy import ExpirationPolicy
 from jj.http.codes import BAD_REQUEST, OK
 from jj.http.headers import CONTENT_TYPE
 from jj.http.methods import ANY, DELETE, GET, POST
-from jj.matchers import LogicalMatcher, RequestMatcher, ResolvableMatcher, exists
+from jj.matchers import LogicalMatcher, RequestMatcher, ResolvableMatcher
+from jj.matchers.attribute_matchers import RouteMatcher
 from jj.requests import Request
 from jj.resolvers import Registry, Resolver
 from jj.responses import Response, StreamResponse, TemplateResponse
 
 from ..handlers import HandlerFunction
-from ._history import HistoryRepository
+from ._expiration_scheduler import ExpirationScheduler
+from ._handler_evictor import EvictionInfo, HandlerEvictor
+from ._history import HistoryItem, HistoryRepository
 from ._json_renderer import JsonRenderer
 from ._remote_response import REMOTE_RESPONSES, RemoteResponseType
 
@@ -25,6 +31,10 @@ __all__ = ("Mock",)
 
 
 MatcherType = Union[RequestMatcher, LogicalMatcher]
+AdminHandler = Callable[[Request], Awaitable[Response]]
+
+ADMIN_PREFIX = "/__jj__"
+REMOTE_MOCK_HEADER = "x-jj-remote-mock"
 
 
 class _DecodeError(Exception):
@@ -34,22 +44,85 @@ class _DecodeError(Exception):
 class Mock(jj.App):
     def __init__(self,
                  app_factory: Callable[..., BaseApp] = create_app,
-                 resolver_factory: Callable[..., Resolver] = Resolver) -> None:
+                 resolver_factory: Callable[..., Resolver] = Resolver,
+                 *,
+                 max_handlers: Optional[int] = None,
+                 idle_ttl: Optional[float] = None) -> None:
         self._resolver = resolver_factory(Registry(), default_app, default_handler)
         self._app = app_factory(resolver=self._resolver)
         self._repo = HistoryRepository()
         self._renderer = JsonRenderer()
+        # Structurally equal matchers of different handlers are decoded into the same
+        # instance, so the resolver shares their results
+        self._matchers: WeakValueDictionary[Hashable, ResolvableMatcher] = WeakValueDictionary()
+        # Handlers taking part in resolution, by id (in registration order)
+        self._handlers: Dict[str, HandlerFunction] = {}
+        # Permanently expired handlers, removed from resolution but kept until deregistered
+        self._expired_handlers: Dict[str, HandlerFunction] = {}
+        # Handlers with time-based policies are pruned in bulk once their deadlines pass
+        self._expiration_scheduler = ExpirationScheduler(self._prune_handlers)
+        # Leaked handlers (e.g. of crashed test runs) are evicted once they are over
+        # the limit or idle for too long
+        self._evictor: Optional[HandlerEvictor] = None
+        if (max_handlers is not None) or (idle_ttl is not None):
+            self._evictor = HandlerEvictor(max_handlers=max_handlers, idle_ttl=idle_ttl)
+
+        # The admin API is routed by `_get_admin_handler` before any mocked handler is
+        # resolved, so mocked traffic doesn't fail through the admin routes first
+        self._remote_routes: Dict[Tuple[str, str], AdminHandler] = {
+            (POST, f"{ADMIN_PREFIX}/reset"): self.reset,
+            (POST, f"{ADMIN_PREFIX}/register"): self.register,
+            (DELETE, f"{ADMIN_PREFIX}/deregister"): self.deregister,
+            (GET, f"{ADMIN_PREFIX}/history"): self.history,
+            (POST, f"{ADMIN_PREFIX}/batch"): self.batch,
+        }
+        # backward compatibility: remote mock requests to any path
+        self._remote_fallbacks: Dict[str, AdminHandler] = {
+            POST: self.register,
+            DELETE: self.deregister,
+            GET: self.history,
+        }
+        self._api_routes: Dict[str, AdminHandler] = {
+            ADMIN_PREFIX: self.api_index,
+            f"{ADMIN_PREFIX}/": self.api_index,
+            f"{ADMIN_PREFIX}/handlers": self.api_handlers,
+            f"{ADMIN_PREFIX}/evictions": self.api_evictions,
+        }
+        self._api_history_route = RouteMatcher(f"{ADMIN_PREFIX}/handlers/{{handler_id}}/history")
+        # Remote mock requests that only need the handler id take it from the path,
+        # so the matcher and response (which can be large) aren't sent and decoded
+        self._remote_id_routes: Dict[str, Tuple[RouteMatcher, AdminHandler]] = {
+            DELETE: (RouteMatcher(f"{ADMIN_PREFIX}/handlers/{{handler_id}}"),
+                     self.deregister_by_id),
+            GET: (self._api_history_route, self.history_by_id),
+        }
+        # Older servers route these paths to the handlers above that decode the whole
+        # handler, so responses tell the server version to tell errors from missing routes
+        self._versioned_handlers = {self.batch, self.deregister_by_id, self.history_by_id}
 
-    def _decode(self, payload: bytes) -> Tuple[str, MatcherType, RemoteResponseType,
-                                               Optional[ExpirationPolicy]]:
+    @property
+    def eviction_info(self) -> EvictionInfo:
+        if self._evictor is None:
+            return EvictionInfo(capacity=0, idle=0)
+        return self._evictor.info
+
+    def _unpack(self, payload: bytes) -> Any:
         def resolver(cls: Any, **kwargs: Any) -> Any:
-            return cls.__unpacked__(**kwargs, resolver=self._resolver)
+            matcher = cls.__unpacked__(**kwargs, resolver=self._resolver)
+            key = matcher.get_structural_key()
+            if key is None:
+                return matcher
+            return self._matchers.setdefault(key, matcher)
 
         try:
-            decoded = unpack(payload, {ResolvableMatcher: resolver})
+            return unpack(payload, {ResolvableMatcher: resolver})
         except Exception as e:
             raise _DecodeError(f"Decode Error: can't unpack message ({e})")
 
+    def _decode(self, payload: bytes) -> Tuple[str, MatcherType, RemoteResponseType,
+                                               Optional[ExpirationPolicy], bool]:
+        decoded = self._unpack(payload)
+
         errors = []
 
         handler_id = decoded.get("id")
@@ -68,15 +141,21 @@ class Mock(jj.App):
         if not isinstance(expiration_policy, (ExpirationPolicy, type(None))):
             errors.append(f"Decode Error: invalid expiration policy ({expiration_policy!r})")
 
+        pinned = decoded.get("pinned", False)
+        if not isinstance(pinned, bool):
+            errors.append(f"Decode Error: invalid pinned field ({pinned!r})")
+
         if len(errors) > 0:
             raise _DecodeError("\n".join(errors))
 
-        return handler_id, matcher, response, expiration_policy
+        return handler_id, matcher, response, expiration_policy, pinned
 
     def _register_handler(self, handler_id: str,
                           matcher: MatcherType,
                           response: RemoteResponseType,
-                          expiration_policy: Optional[ExpirationPolicy]) -> None:
+                          expiration_policy: Optional[ExpirationPolicy],
+                          *,
+                          pinned: bool = False) -> None:
         async def handler(req: Request) -> RemoteResponseType:
             if isinstance(response, TemplateResponse):
                 # Required to populate request body for template rendering
@@ -86,65 +165,102 @@ class Mock(jj.App):
             await res._prepare_hook(req)
             return res
 
+        # A handler registered with the same id is replaced, its history is kept
+        self._deregister_handler(handler_id)
+
         self._save_handler_info(handler, handler_id, matcher, response, expiration_policy)
 
-        setattr(self._app.__class__, handler_id, matcher(handler))
+        self._resolver.register_handler(matcher(handler), self._app.__class__)
+        self._handlers[handler_id] = handler
+
+        deadline = expiration_policy.get_deadline() if expiration_policy else None
+        if deadline is not None:
+            self._expiration_scheduler.add(handler_id, handler, deadline)
+        if self._evictor is not None:
+            self._evictor.add(handler_id, pinned=pinned)
 
     def _deregister_handler(self, handler_id: str) -> None:
-        handler = getattr(self._app.__class__, handler_id, None)
+        if self._evictor is not None:
+            self._evictor.discard(handler_id)
+
+        expired_handler = self._expired_handlers.pop(handler_id, None)
+        if expired_handler is not None:
+            self._expiration_scheduler.discard(expired_handler)
+            self._remove_handler_info(expired_handler)
+
+        handler = self._handlers.pop(handler_id, None)
         if handler is None:
             return
+        self._expiration_scheduler.discard(handler)
 
-        try:
-            delattr(self._app.__class__, handler_id)
-        except AttributeError:
-            pass
+        self._resolver.deregister_handler(handler, self._app.__class__)
+        self._deregister_matchers(handler)
+        self._remove_handler_info(handler)
 
+    def _prune_handler(self, handler_id: str, handler: HandlerFunction) -> None:
+        # The handler only leaves resolution: its info and history are still
+        # reachable by id until it is deregistered or evicted (it's never hit again,
+        # so it's evicted once idle or over the limit, even if pinned)
+        if self._handlers.get(handler_id) is not handler:
+            return
+        if self._evictor is not None:
+            self._evictor.unpin(handler_id)
+        del self._handlers[handler_id]
+        self._resolver.deregister_handler(handler, self._app.__class__)
+        self._deregister_matchers(handler)
+        self._expired_handlers[handler_id] = handler
+
+    def _prune_handlers(self, handlers: List[Tuple[str, HandlerFunction]]) -> None:
+        for handler_id, handler in handlers:
+            # Deadlines of points in time (see ExpireAt) move if the system clock is set
+            expiration_policy = self._resolver.get_attribute("expiration_policy", handler, None)
+            if (expiration_policy is not None) and not expiration_policy.is_permanently_expired():
+                deadline = expiration_policy.get_deadline()
+                if deadline is not None:
+                    self._expiration_scheduler.add(handler_id, handler, deadline)
+                    continue
+            self._prune_handler(handler_id, handler)
+
+    async def _evict_handlers(self, evictor: HandlerEvictor) -> None:
+        for handler_id in evictor.evict():
+            self._deregister_handler(handler_id)
+            await self._repo.delete_by_tag(handler_id)
+
+    def _deregister_matchers(self, handler: HandlerFunction) -> None:
         matchers = self._resolver.get_matchers(handler)
         for matcher in matchers:
             self._resolver.deregister_matcher(matcher, handler)
 
+    def _remove_handler_info(self, handler: HandlerFunction) -> None:
         attributes = self._resolver.get_attributes(handler)
         for attribute in attributes:
             self._resolver.deregister_attribute(attribute, handler)
 
         self._resolver._registry.remove_container(handler)
 
-    @jj.match(POST, "/__jj__/reset", headers={"x-jj-remote-mock": exists})
     async def reset(self, request: Request) -> Response:
         await request.read()
 
-        handlers = self._resolver.get_handlers(self._app.__class__)
-        for handler in handlers:
-            handler_id = self._resolver.get_attribute("handler_id", handler, None)
-            if handler_id:
-                self._deregister_handler(handler_id)
+        for handler_id in list(self._handlers) + list(self._expired_handlers):
+            self._deregister_handler(handler_id)
 
         await self._repo.clear()
 
         return Response(status=OK, json={"status": OK})
 
-    @jj.match_any([
-        jj.match(POST, "/__jj__/register", headers={"x-jj-remote-mock": exists}),
-        # backward compatibility
-        jj.match(POST, headers={"x-jj-remote-mock": exists})
-    ])
     async def register(self, request: Request) -> Response:
         payload = await request.read()
         try:
-            handler_id, matcher, response, expiration_policy = self._decode(payload)
+            handler_id, matcher, response, expiration_policy, pinned = self._decode(payload)
         except Exception as e:
             return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
 
-        self._register_handler(handler_id, matcher, response, expiration_policy)
+        self._register_handler(handler_id, matcher, response, expiration_policy, pinned=pinned)
+        if self._evictor is not None:
+            await self._evict_handlers(self._evictor)
 
         return Response(status=OK, json={"status": OK})
 
-    @jj.match_any([
-        jj.match(DELETE, "/__jj__/deregister", headers={"x-jj-remote-mock": exists}),
-        # backward compatibility
-        jj.match(DELETE, headers={"x-jj-remote-mock": exists})
-    ])
     async def deregister(self, request: Request) -> Response:
         payload = await request.read()
         try:
@@ -152,16 +268,17 @@ class Mock(jj.App):
         except Exception as e:
             return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
 
+        return await self._deregister(handler_id)
+
+    async def deregister_by_id(self, request: Request) -> Response:
+        return await self._deregister(request.segments["handler_id"])
+
+    async def _deregister(self, handler_id: str) -> Response:
         self._deregister_handler(handler_id)
         await self._repo.delete_by_tag(handler_id)  # delete history
 
         return Response(status=OK, json={"status": OK})
 
-    @jj.match_any([
-        jj.match(GET, "/__jj__/history", headers={"x-jj-remote-mock": exists}),
-        # backward compatibility
-        jj.match(GET, headers={"x-jj-remote-mock": exists})
-    ])
     async def history(self, request: Request) -> Response:
         payload = await request.read()
         try:
@@ -169,10 +286,124 @@ class Mock(jj.App):
         except Exception as e:
             return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
 
-        history = await self._repo.get_by_tag(handler_id)
+        return await self._history(handler_id)
+
+    async def history_by_id(self, request: Request) -> Response:
+        handler_id = request.segments["handler_id"]
+        try:
+            since, limit = self._decode_cursor_params(request.query)
+        except Exception as e:
+            return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
+        if ("min_count" not in request.query) and ("timeout" not in request.query):
+            return await self._history(handler_id, since=since, limit=limit)
+
+        # Long polling: the response is held until the history has enough items
+        payload = await request.read()
+        try:
+            min_count, timeout = self._decode_wait_params(request)
+            predicate = self._decode_predicate(payload)
+        except Exception as e:
+            return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
+
+        matches = partial(self._match_history_item, predicate) if predicate else None
+        history = await self._repo.wait_by_tag(handler_id, min_count=min_count, timeout=timeout,
+                                               predicate=matches, since=since, limit=limit)
+        return Response(status=OK, body=pack(history))
+
+    async def _match_history_item(self, predicate: ResolvableMatcher, item: HistoryItem) -> bool:
+        # History requests have the attributes request matchers look up
+        return await predicate.match(item["request"])  # type: ignore
+
+    def _decode_wait_params(self, request: Request) -> Tuple[int, float]:
+        try:
+            min_count = int(request.query.get("min_count", "1"))
+            timeout = float(request.query.get("timeout", "0"))
+        except ValueError as e:
+            raise _DecodeError(f"Decode Error: invalid wait params ({e})")
+        if (min_count < 0) or not (0 <= timeout < inf):
+            raise _DecodeError(f"Decode Error: invalid wait params ({min_count!r}, {timeout!r})")
+        return min_count, timeout
+
+    def _decode_cursor_params(self, params: Mapping[str, Any]
+                              ) -> Tuple[Optional[int], Optional[int]]:
+        # `since` is the sequence number of the last item seen, `limit` caps the items returned
+        cursor: List[Optional[int]] = []
+        for name in ("since", "limit"):
+            value = params.get(name)
+            try:
+                number = None if (value is None) else int(value)
+            except (TypeError, ValueError) as e:
+                raise _DecodeError(f"Decode Error: invalid {name} ({e})")
+            if (number is not None) and (number < 0):
+                raise _DecodeError(f"Decode Error: invalid {name} ({number!r})")
+            cursor.append(number)
+        since, limit = cursor
+        return since, limit
+
+    def _decode_predicate(self, payload: bytes) -> Optional[ResolvableMatcher]:
+        if len(payload) == 0:
+            return None
+        predicate = self._unpack(payload)
+        if not isinstance(predicate, ResolvableMatcher):
+            raise _DecodeError(f"Decode Error: invalid predicate ({predicate!r})")
+        return predicate
+
+    async def _history(self, handler_id: str, *,
+                       since: Optional[int] = None,
+                       limit: Optional[int] = None) -> Response:
+        history = await self._repo.get_by_tag(handler_id, since=since, limit=limit)
         packed = pack(history)
         return Response(status=OK, body=packed)
 
+    async def batch(self, request: Request) -> Response:
+        payload = await request.read()
+        try:
+            operations = unpack(payload)
+        except Exception as e:
+            error = f"Decode Error: can't unpack message ({e})"
+            return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": error})
+        if not isinstance(operations, list):
+            error = f"Decode Error: invalid operations ({operations!r})"
+            return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": error})
+
+        # Operations are run in order, each one gets its own result
+        results = [await self._run_operation(operation) for operation in operations]
+        if self._evictor is not None:
+            await self._evict_handlers(self._evictor)
+
+        return Response(status=OK, body=pack(results))
+
+    async def _run_operation(self, operation: Any) -> Dict[str, Any]:
+        op = operation.get("op") if isinstance(operation, dict) else None
+        if op == "register":
+            try:
+                handler_id, matcher, response, expiration_policy, pinned = \
+                    self._decode(operation["payload"])
+            except Exception as e:
+                return {"status": BAD_REQUEST, "error": str(e)}
+            self._register_handler(handler_id, matcher, response, expiration_policy,
+                                   pinned=pinned)
+            return {"status": OK}
+
+        if op not in ("deregister", "history"):
+            return {"status": BAD_REQUEST, "error": f"Decode Error: invalid operation ({op!r})"}
+        handler_id = operation.get("id")
+        if not isinstance(handler_id, str):
+            error = f"Decode Error: invalid handler id ({handler_id!r})"
+            return {"status": BAD_REQUEST, "error": error}
+
+        if op == "deregister":
+            self._deregister_handler(handler_id)
+            await self._repo.delete_by_tag(handler_id)  # delete history
+            return {"status": OK}
+
+        try:
+            since, limit = self._decode_cursor_params(operation)
+        except Exception as e:
+            return {"status": BAD_REQUEST, "error": str(e)}
+        history = await self._repo.get_by_tag(handler_id, since=since, limit=limit)
+        return {"status": OK, "history": history}
+
     def _get_base_url(self, request_url: URL) -> str:
         base_url = f"{request_url.scheme}://{request_url.host}"
         if request_url.port not in (80, 443):
@@ -200,26 +431,18 @@ class Mock(jj.App):
         }
 
     def _get_handler_by_id(self, handler_id: str) -> Union[HandlerFunction, None]:
-        for handler in self._resolver.get_handlers(self._app.__class__):
-            if self._resolver.get_attribute("handler_id", handler) == handler_id:
-                return handler
-        return None
-
-    @jj.match_any([
-        jj.match(GET, "/__jj__"),
-        jj.match(GET, "/__jj__/")
-    ])
+        handler = self._handlers.get(handler_id)
+        return self._expired_handlers.get(handler_id) if (handler is None) else handler
+
     async def api_index(self, request: Request) -> Response:
         base_url = self._get_base_url(request.url)
         handlers_url = f"{base_url}/__jj__/handlers"
         return jj.Response(status=OK, json={"handlers": {"url": handlers_url}})
 
-    @jj.match(GET, "/__jj__/handlers")
     async def api_handlers(self, request: Request) -> Response:
         base_url = self._get_base_url(request.url)
-        handler_list = self._resolver.get_handlers(self._app.__class__)
         handlers = []
-        for handler in reversed(handler_list):
+        for handler in reversed(self._handlers.values()):
             handler_info = self._get_handler_info(handler)
             handler_info.update({
                 "history_url": f"{base_url}/__jj__/handlers/{handler_info['id']}/history"
@@ -228,23 +451,81 @@ class Mock(jj.App):
         body = self._renderer.render_handlers(handlers)  # type: ignore
         return Response(status=OK, body=body, headers={CONTENT_TYPE: "application/json"})
 
-    @jj.match(GET, "/__jj__/handlers/{handler_id}/history")
     async def api_history(self, request: Request) -> Response:
         handler_id = request.segments["handler_id"]
         if not self._get_handler_by_id(handler_id):
             return Response(status=BAD_REQUEST,
                             json={"status": BAD_REQUEST, "error": "Handler not found"})
-        history = await self._repo.get_by_tag(handler_id)
+        try:
+            since, limit = self._decode_cursor_params(request.query)
+        except Exception as e:
+            return Response(status=BAD_REQUEST, json={"status": BAD_REQUEST, "error": str(e)})
+        history = await self._repo.get_by_tag(handler_id, since=since, limit=limit)
         body = self._renderer.render_history(history)
         return Response(status=OK, body=body, headers={CONTENT_TYPE: "application/json"})
 
+    async def api_evictions(self, request: Request) -> Response:
+        eviction_info = self.eviction_info
+        return Response(status=OK, json={
+            "max_handlers": self._evictor.max_handlers if self._evictor else None,
+            "idle_ttl": self._evictor.idle_ttl if self._evictor else None,
+            "capacity": eviction_info.capacity,
+            "idle": eviction_info.idle,
+        })
+
+    def _get_remote_id_handler(self, request: Request) -> Optional[AdminHandler]:
+        id_route = self._remote_id_routes.get(request.method)
+        if (id_route is None) or not request.path.startswith(ADMIN_PREFIX):
+            return None
+        route, handler = id_route
+        segments = route.match_segments(request.path)
+        if segments is None:
+            return None
+        request.segments = segments
+        return handler
+
+    def _get_admin_handler(self, request: Request) -> Optional[AdminHandler]:
+        method, path = request.method, request.path
+        if REMOTE_MOCK_HEADER in request.headers:
+            handler = self._remote_routes.get((method, path))
+            if handler is None:
+                handler = self._get_remote_id_handler(request)
+            return self._remote_fallbacks.get(method) if (handler is None) else handler
+
+        if (method != GET) or not path.startswith(ADMIN_PREFIX):
+            return None
+        handler = self._api_routes.get(path)
+        if handler is None:
+            segments = self._api_history_route.match_segments(path)
+            if segments is None:
+                return None
+            request.segments = segments
+            handler = self.api_history
+        return handler
+
     @jj.match(ANY)
     async def resolve(self, request: Request) -> StreamResponse:
+        admin_handler = self._get_admin_handler(request)
+        if admin_handler is not None:
+            admin_response = await admin_handler(request)
+            if admin_handler in self._versioned_handlers:
+                admin_response.headers[REMOTE_MOCK_HEADER] = f"v{jj.version}"
+            return admin_response
+
+        if self._evictor is not None:
+            await self._evict_handlers(self._evictor)
+
         handler = await self._resolver.resolve(request, self._app)
         response = await handler(request)
 
         handler_id = self._resolver.get_attribute("handler_id", handler, default=None)
         if handler_id:
+            if self._evictor is not None:
+                self._evictor.touch(handler_id)
             await self._repo.add(request, response, tags=[handler_id])
 
+            expiration_policy = self._resolver.get_attribute("expiration_policy", handler, None)
+            if (expiration_policy is not None) and expiration_policy.is_permanently_expired():
+                self._prune_handler(handler_id, handler)
+
         return response
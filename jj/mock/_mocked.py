@@ -1,4 +1,4 @@
-from asyncio import iscoroutinefunction
+from asyncio import get_running_loop, iscoroutinefunction
 from functools import wraps
 from types import TracebackType
 from typing import Any, Callable, Generator, List, Optional, Type, TypeVar, Union, cast
@@ -14,6 +14,10 @@ __all__ = ("Mocked",)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Seconds the server holds a history request if `wait_for_requests` has no timeout
+# (nor a limit of attempts)
+LONG_POLL_TIMEOUT = 30.0
+
 
 class Mocked:
     """
@@ -94,8 +98,25 @@ class Mocked:
 
         :return: List of history items containing request/response pairs.
         """
-        self._history = await self._handler.fetch_history()
-        return self._history
+        history = await self._handler.fetch_history()
+        self.set_history(history)
+        return history
+
+    def set_history(self, history: List[HistoryItem]) -> None:
+        """
+        Store the request/response history fetched for this mock.
+
+        Called once the history is fetched, including in batches (see `stacked`).
+
+        :param history: List of history items containing request/response pairs.
+        """
+        self._history = history
+
+    def reset_history(self) -> None:
+        """
+        Forget the fetched history, as done when the mock is registered on entering a context.
+        """
+        self._history = None
 
     async def wait_for_requests(self, count: int = 1, *,
                                 timeout: TimeoutValue = 0,
@@ -105,9 +126,12 @@ class Mocked:
         """
         Wait for a specified number of requests to be received by the mock.
 
-        This method polls the history until the expected number of requests have been
-        received or a timeout/retry limit is reached. Useful for testing async code
-        that makes HTTP requests.
+        This method long-polls the history: the server responds as soon as the expected
+        number of requests have been received (or the timeout passes), and the history is
+        fetched again until a retry limit is reached. Servers that don't support long
+        polling respond right away, so the history is polled. Without a timeout, a limited
+        number of attempts is polled as well, so it isn't stretched by long polls. Useful
+        for testing async code that makes HTTP requests.
 
         :param count: The minimum number of requests to wait for. Defaults to 1.
         :param timeout: Maximum time to wait in seconds. 0 means no timeout.
@@ -115,12 +139,29 @@ class Mocked:
         :param delay: Delay between retry attempts. Can be a fixed value or callable.
         :param logger: Optional logger callable for retry attempts.
         """
+        loop = get_running_loop()
+        deadline = loop.time() + timeout
+
+        async def wait_for_history() -> List[HistoryItem]:
+            if timeout:
+                poll_timeout = max(deadline - loop.time(), 0)
+            else:
+                poll_timeout = LONG_POLL_TIMEOUT if (attempts is None) else 0
+            history = await self._handler.wait_for_history(count, timeout=poll_timeout)
+            self.set_history(history)
+            return history
+
+        def is_waiting(history: List[HistoryItem]) -> bool:
+            return (len(history) < count) and ((not timeout) or (loop.time() < deadline))
+
+        # The server responds by the deadline, so the timeout isn't enforced by cancelling
+        # a request (which would leave the history unset)
         try:
-            await retry(until=lambda x: len(x) < count,
+            await retry(until=is_waiting,
                         attempts=attempts,
-                        timeout=timeout,
+                        timeout=0,
                         delay=delay,
-                        logger=logger)(self.fetch_history)()
+                        logger=logger)(wait_for_history)()
         except CancelledError:
             pass
 
@@ -205,7 +246,7 @@ class Mocked:
 
         :return: The Mocked instance.
         """
-        self._history = None
+        self.reset_history()
         await self._handler.register()
         return self
 
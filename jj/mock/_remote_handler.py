@@ -1,9 +1,11 @@
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, List, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 from uuid import UUID, uuid4
 
+from packed import pack
+
 from jj.expiration_policy import ExpirationPolicy
-from jj.matchers import LogicalMatcher, RequestMatcher
+from jj.matchers import LogicalMatcher, RequestMatcher, ResolvableMatcher
 
 if TYPE_CHECKING:
     from ._remote_mock import RemoteMock
@@ -24,18 +26,28 @@ class RemoteHandler:
                  response: RemoteResponseType,
                  expiration_policy: Optional[ExpirationPolicy] = None,
                  *,
-                 history_adapter: Optional[HistoryAdapterType] = default_history_adapter) -> None:
+                 history_adapter: Optional[HistoryAdapterType] = default_history_adapter,
+                 pinned: bool = False) -> None:
         self._id = uuid4()
         self._mock = mock
         self._matcher = matcher
         self._response = response
         self._history_adapter = history_adapter
         self._expiration_policy = expiration_policy
+        self._pinned = pinned
+        self._payload: Optional[bytes] = None
+        # Adapted history, newest first, and the sequence number of its newest item
+        self._history: List[HistoryItem] = []
+        self._history_seq: Optional[int] = None
 
     @property
     def id(self) -> UUID:
         return self._id
 
+    @property
+    def mock(self) -> MockType:
+        return self._mock
+
     @property
     def matcher(self) -> Union[RequestMatcher, LogicalMatcher]:
         return self._matcher
@@ -48,6 +60,32 @@ class RemoteHandler:
     def expiration_policy(self) -> Optional[ExpirationPolicy]:
         return self._expiration_policy
 
+    @property
+    def pinned(self) -> bool:
+        return self._pinned
+
+    def pack_payload(self) -> bytes:
+        # Packed once: the response can be large, and it's sent on every register
+        if self._payload is not None:
+            return self._payload
+        payload: Dict[str, Any] = {
+            "id": str(self._id),
+            "request": self._matcher,
+            "response": self._response,
+            "expiration_policy": self._expiration_policy,
+        }
+        if self._pinned:
+            payload["pinned"] = True
+        try:
+            self._payload = pack(payload)
+        except Exception as e:
+            error_message = (
+                f"Error while packing payload: {e}. "
+                "Make sure your payload is packable https://pypi.org/project/packed"
+            )
+            raise ValueError(error_message) from e
+        return self._payload
+
     async def register(self) -> None:
         await self._mock.register(self)
 
@@ -55,7 +93,43 @@ class RemoteHandler:
         await self._mock.deregister(self)
 
     async def fetch_history(self) -> List[HistoryItem]:
-        history = await self._mock.fetch_history(self)
+        # Only items added since the last fetch are transferred
+        since = self._history_seq
+        history = await self._mock.fetch_history(self, since=since)
+        return self._update_history(history, since)
+
+    async def wait_for_history(self, min_count: int, *,
+                               timeout: float,
+                               predicate: Optional[ResolvableMatcher] = None
+                               ) -> List[HistoryItem]:
+        history = await self._mock.wait_for_history(self, min_count,
+                                                    timeout=timeout, predicate=predicate)
+        return self._update_history(history, since=None)
+
+    def _update_history(self, history: List[HistoryItem],
+                        since: Optional[int]) -> List[HistoryItem]:
+        # Items of older servers have no sequence numbers, and servers that ignore `since`
+        # (e.g. on legacy routes) return items seen before, so their history replaces the cache
+        numbered = all("seq" in item for item in history)
+        is_delta = (since is not None) and numbered and \
+            all(item["seq"] > since for item in history)
+        seq = history[0]["seq"] if (numbered and len(history) > 0) else None
+
+        adapted = self.adapt_history(history)
+        if is_delta:
+            self._history = adapted + self._history
+            self._history_seq = self._history_seq if (seq is None) else seq
+        else:
+            self._history = adapted
+            self._history_seq = seq
+        return self._history[:]
+
+    def reset_history(self) -> None:
+        # The server deletes the history on deregister and reset, the next fetch is in full
+        self._history = []
+        self._history_seq = None
+
+    def adapt_history(self, history: List[HistoryItem]) -> List[HistoryItem]:
         if self._history_adapter:
             return [self._history_adapter(x) for x in history]
         return history
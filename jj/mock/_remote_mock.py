@@ -1,20 +1,25 @@
-from typing import List, Optional, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
+from urllib.parse import urlencode
+from weakref import WeakSet
 
 from aiohttp import ClientSession
+from multidict import CIMultiDictProxy
 from packed import pack, unpack
 
 from jj import version
 from jj.expiration_policy import ExpirationPolicy
-from jj.http.codes import OK
+from jj.http.codes import BAD_REQUEST, OK
 from jj.http.methods import DELETE, GET, POST
-from jj.matchers import LogicalMatcher, RequestMatcher
+from jj.matchers import LogicalMatcher, RequestMatcher, ResolvableMatcher
 
 from ._history import HistoryAdapterType, HistoryItem, default_history_adapter
 from ._remote_handler import RemoteHandler
-from ._remote_response import RemoteResponseType
+from ._remote_response import REMOTE_RESPONSES, RemoteResponseType
 
 __all__ = ("RemoteMock",)
 
+REMOTE_MOCK_HEADER = "x-jj-remote-mock"
+
 
 class _RemoteMockError(Exception):
     pass
@@ -22,14 +27,19 @@ class _RemoteMockError(Exception):
 
 class RemoteMock:
     def __init__(self, url: str) -> None:
-        self._url = url
+        # Admin routes are matched by exact path, so "http://host/" has to become "http://host"
+        self._url = str(url).rstrip("/")
+        self._legacy_routes = False
+        # Registered handlers, so their cached history is dropped once the mock is reset
+        self._handlers: "WeakSet[RemoteHandler]" = WeakSet()
 
     def create_handler(self,
                        matcher: Union[RequestMatcher, LogicalMatcher],
                        response: RemoteResponseType,
                        expiration_policy: Optional[ExpirationPolicy] = None,
                        *,
-                       history_adapter: Optional[HistoryAdapterType] = default_history_adapter
+                       history_adapter: Optional[HistoryAdapterType] = default_history_adapter,
+                       pinned: bool = False
                        ) -> RemoteHandler:
         return RemoteHandler(
             self,
@@ -37,56 +47,163 @@ class RemoteMock:
             response,
             expiration_policy=expiration_policy,
             history_adapter=history_adapter,
+            pinned=pinned,
         )
 
     async def _do_request(self, method: str, url: str,
                           data: Optional[bytes] = None) -> Tuple[int, bytes]:
-        headers = {"x-jj-remote-mock": f"v{version}"}
+        status, body, _ = await self._send(method, url, data)
+        return status, body
+
+    async def _send(self, method: str, url: str,
+                    data: Optional[bytes] = None) -> Tuple[int, bytes, "CIMultiDictProxy[str]"]:
+        headers = {REMOTE_MOCK_HEADER: f"v{version}"}
         async with ClientSession() as session:
             async with session.request(method, url, data=data, headers=headers) as response:
                 body = await response.read()
-                return response.status, body
+                return response.status, body, response.headers
+
+    def _is_legacy_response(self, status: int, headers: "CIMultiDictProxy[str]") -> bool:
+        # Older servers route unknown admin paths to the handlers decoding the whole handler,
+        # which fail on an empty payload. Newer ones tell their version on the routes they add,
+        # so their errors aren't mistaken for missing routes
+        return (status == BAD_REQUEST) and (REMOTE_MOCK_HEADER not in headers)
 
     def _pack_payload(self, handler: RemoteHandler) -> bytes:
-        payload = {
-            "id": str(handler.id),
-            "request": handler.matcher,
-            "response": handler.response,
-            "expiration_policy": handler.expiration_policy,
-        }
-        try:
-            return pack(payload)
-        except Exception as e:
-            error_message = (
-                f"Error while packing payload: {e}. "
-                "Make sure your payload is packable https://pypi.org/project/packed"
-            )
-            raise ValueError(error_message) from e
+        return handler.pack_payload()
 
     async def register(self, handler: RemoteHandler) -> "RemoteMock":
         url = f"{self._url}/__jj__/register"
         status, body = await self._do_request(POST, url, self._pack_payload(handler))
         if status != OK:
             raise _RemoteMockError(f"Can't register mock ({body!r})")
+        self._handlers.add(handler)
         return self
 
+    async def _do_handler_request(self, method: str, handler: RemoteHandler,
+                                  url: str, legacy_url: str,
+                                  data: Optional[bytes] = None) -> Tuple[int, bytes]:
+        # The handler id is passed in the url, older servers only accept the whole
+        # handler (they fail to decode an empty payload)
+        self._check_handler(handler)
+        if not self._legacy_routes:
+            status, body, headers = await self._send(method, url, data)
+            if not self._is_legacy_response(status, headers):
+                return status, body
+            self._legacy_routes = True
+        return await self._do_request(method, legacy_url, self._pack_payload(handler))
+
+    def _check_handler(self, handler: RemoteHandler) -> None:
+        # Id routes don't decode the handler, so it's checked as the legacy routes do
+        errors: List[str] = []
+        if not isinstance(handler.matcher, (RequestMatcher, LogicalMatcher)):
+            errors.append(f"invalid request field ({handler.matcher!r})")
+        if not isinstance(handler.response, REMOTE_RESPONSES):
+            errors.append(f"invalid response field ({handler.response!r})")
+        if len(errors) > 0:
+            raise _RemoteMockError(f"Invalid handler ({errors!r})")
+
     async def deregister(self, handler: RemoteHandler) -> "RemoteMock":
-        url = f"{self._url}/__jj__/deregister"
-        status, body = await self._do_request(DELETE, url, self._pack_payload(handler))
+        url = f"{self._url}/__jj__/handlers/{handler.id}"
+        legacy_url = f"{self._url}/__jj__/deregister"
+        status, body = await self._do_handler_request(DELETE, handler, url, legacy_url)
         if status != OK:
             raise _RemoteMockError(f"Can't deregister mock ({body!r})")
+        handler.reset_history()  # the server deletes it
         return self
 
-    async def fetch_history(self, handler: RemoteHandler) -> List[HistoryItem]:
-        url = f"{self._url}/__jj__/history"
-        status, body = await self._do_request(GET, url, self._pack_payload(handler))
+    async def fetch_history(self, handler: RemoteHandler, *,
+                            since: Optional[int] = None,
+                            limit: Optional[int] = None) -> List[HistoryItem]:
+        # Older servers ignore `since` and `limit` and respond with the whole history
+        params = {name: value for name, value in (("since", since), ("limit", limit))
+                  if value is not None}
+        url = f"{self._url}/__jj__/handlers/{handler.id}/history"
+        if params:
+            url += f"?{urlencode(params)}"
+        legacy_url = f"{self._url}/__jj__/history"
+        status, body = await self._do_handler_request(GET, handler, url, legacy_url)
+        if status != OK:
+            raise _RemoteMockError(f"Can't retrieve mock history ({body!r})")
+        return cast(List[HistoryItem], unpack(body))
+
+    async def wait_for_history(self, handler: RemoteHandler, min_count: int, *,
+                               timeout: float,
+                               predicate: Optional[ResolvableMatcher] = None
+                               ) -> List[HistoryItem]:
+        assert min_count >= 0, f"min_count must be at least 0, {min_count} given"
+        assert timeout >= 0, f"timeout must be at least 0, {timeout} given"
+        # The server responds once the history has `min_count` items (matching `predicate`),
+        # or `timeout` seconds pass. Older servers respond with the history right away
+        url = (f"{self._url}/__jj__/handlers/{handler.id}/history"
+               f"?min_count={min_count}&timeout={timeout}")
+        legacy_url = f"{self._url}/__jj__/history"
+        data = None if (predicate is None) else pack(predicate)
+        status, body = await self._do_handler_request(GET, handler, url, legacy_url, data)
         if status != OK:
             raise _RemoteMockError(f"Can't retrieve mock history ({body!r})")
         return cast(List[HistoryItem], unpack(body))
 
+    async def _batch(self, operations: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        # Returns `None` if the server doesn't support batches
+        if len(operations) == 0:
+            return []
+        if self._legacy_routes:
+            return None
+        url = f"{self._url}/__jj__/batch"
+        status, body, headers = await self._send(POST, url, pack(operations))
+        if self._is_legacy_response(status, headers):
+            self._legacy_routes = True
+            return None
+        if status != OK:
+            raise _RemoteMockError(f"Can't run batch ({body!r})")
+        return cast(List[Dict[str, Any]], unpack(body))
+
+    def _check_results(self, results: List[Dict[str, Any]], message: str) -> None:
+        errors = [result.get("error") for result in results if result.get("status") != OK]
+        if len(errors) > 0:
+            raise _RemoteMockError(f"{message} ({errors!r})")
+
+    async def register_many(self, handlers: Sequence[RemoteHandler]) -> "RemoteMock":
+        operations = [{"op": "register", "payload": self._pack_payload(handler)}
+                      for handler in handlers]
+        results = await self._batch(operations)
+        if results is None:
+            for handler in handlers:
+                await self.register(handler)
+            return self
+        self._check_results(results, "Can't register mocks")
+        for handler in handlers:
+            # Handlers of other remote mocks with the same URL may be registered in a batch
+            handler.mock._handlers.add(handler)
+        return self
+
+    async def deregister_many(self, handlers: Sequence[RemoteHandler]) -> "RemoteMock":
+        operations = [{"op": "deregister", "id": str(handler.id)} for handler in handlers]
+        results = await self._batch(operations)
+        if results is None:
+            for handler in handlers:
+                await self.deregister(handler)
+            return self
+        self._check_results(results, "Can't deregister mocks")
+        for handler in handlers:
+            handler.reset_history()
+        return self
+
+    async def fetch_history_many(self, handlers: Sequence[RemoteHandler]
+                                 ) -> List[List[HistoryItem]]:
+        operations = [{"op": "history", "id": str(handler.id)} for handler in handlers]
+        results = await self._batch(operations)
+        if results is None:
+            return [await self.fetch_history(handler) for handler in handlers]
+        self._check_results(results, "Can't retrieve mock history")
+        return [cast(List[HistoryItem], result["history"]) for result in results]
+
     async def reset(self) -> "RemoteMock":
         url = f"{self._url}/__jj__/reset"
         status, body = await self._do_request(POST, url)
         if status != OK:
             raise _RemoteMockError(f"Can't reset mock ({body!r})")
+        for handler in self._handlers:
+            handler.reset_history()
         return self
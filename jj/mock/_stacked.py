@@ -1,5 +1,5 @@
 from contextlib import AsyncExitStack, asynccontextmanager
-from typing import AsyncGenerator, Dict, List, TypeVar
+from typing import Any, AsyncGenerator, Dict, List, TypeVar
 
 from ._mocked import Mocked
 
@@ -8,6 +8,54 @@ __all__ = ("stacked",)
 MockedType = TypeVar("MockedType", List[Mocked], Dict[str, Mocked])
 
 
+def _group_by_remote_mock(mocks: List[Mocked]) -> Dict[Any, List[Mocked]]:
+    # `mocked()` creates a remote mock per handler, so mocks are grouped by the server URL
+    # and each batch is sent through the remote mock of the first one
+    groups: Dict[str, List[Mocked]] = {}
+    for mock in mocks:
+        groups.setdefault(mock.handler.mock._url, []).append(mock)
+    return {group[0].handler.mock: group for group in groups.values()}
+
+
+def _overrides_context(mock: Mocked) -> bool:
+    # Batching bypasses `__aenter__`/`__aexit__`, so mocks that override them are entered
+    # one by one
+    cls = type(mock)
+    return (cls.__aenter__ is not Mocked.__aenter__) or (cls.__aexit__ is not Mocked.__aexit__)
+
+
+async def _enter(mocks: List[Mocked]) -> None:
+    entered: List[Mocked] = []
+    for remote_mock, group in _group_by_remote_mock(mocks).items():
+        for mock in group:
+            mock.reset_history()
+        entered.extend(group)
+        try:
+            await remote_mock.register_many([mock.handler for mock in group])
+        except BaseException:
+            # Handlers of a failed batch may be registered in part
+            await _exit(entered)
+            raise
+
+
+async def _exit_group(remote_mock: Any, group: List[Mocked]) -> None:
+    try:
+        prefetching = [mock for mock in group if mock.prefetch_history]
+        histories = await remote_mock.fetch_history_many([mock.handler for mock in prefetching])
+        for mock, history in zip(prefetching, histories):
+            mock.set_history(mock.handler.adapt_history(history))
+    finally:
+        disposable = [mock for mock in group if mock.disposable]
+        await remote_mock.deregister_many([mock.handler for mock in disposable])
+
+
+async def _exit(mocks: List[Mocked]) -> None:
+    # Every group is exited even if another one fails (callbacks are run in reverse)
+    async with AsyncExitStack() as stack:
+        for remote_mock, group in reversed(list(_group_by_remote_mock(mocks).items())):
+            stack.push_async_callback(_exit_group, remote_mock, group)
+
+
 @asynccontextmanager
 async def stacked(mocks: MockedType) -> AsyncGenerator[MockedType, None]:
     """
@@ -17,6 +65,10 @@ async def stacked(mocks: MockedType) -> AsyncGenerator[MockedType, None]:
     into a single context, ensuring they are all activated upon entering and deactivated
     upon exiting. It simplifies the process of managing multiple mocks simultaneously.
 
+    Mocks of the same remote mock are registered, deregistered and have their history
+    fetched in batches, one round trip each. Mocks of classes overriding `__aenter__` or
+    `__aexit__` are entered and exited on their own.
+
     :param mocks: A list or dictionary of `Mocked` objects to be activated in the context.
                   If a list is provided, the mocks are returned as a list; if a dictionary is
                   provided, they are returned as a dictionary with the same keys.
@@ -25,10 +77,18 @@ async def stacked(mocks: MockedType) -> AsyncGenerator[MockedType, None]:
              keyed by the same names.
     :raises TypeError: If the `mocks` parameter is not a list or a dictionary.
     """
+    if isinstance(mocks, list):
+        mocked = list(mocks)
+    elif isinstance(mocks, dict):
+        mocked = list(mocks.values())
+    else:
+        raise TypeError(f"Unsupported type: {type(mocks)}")
+
+    batched = [mock for mock in mocked if not _overrides_context(mock)]
     async with AsyncExitStack() as stack:
-        if isinstance(mocks, list):
-            yield [await stack.enter_async_context(mock) for mock in mocks]
-        elif isinstance(mocks, dict):
-            yield {name: await stack.enter_async_context(mock) for name, mock in mocks.items()}
-        else:
-            raise TypeError(f"Unsupported type: {type(mocks)}")
+        await _enter(batched)
+        stack.push_async_callback(_exit, batched)
+        for mock in mocked:
+            if _overrides_context(mock):
+                await stack.enter_async_context(mock)
+        yield mocks.copy()
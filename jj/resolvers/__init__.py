@@ -1,6 +1,17 @@
+from ._dispatch_index import DispatchIndex
+from ._dispatch_keys import DispatchKeys
+from ._fingerprint_fields import FingerprintFields
+from ._handler_record import HandlerRecord
+from ._matcher_compiler import CompiledMatcher, MatcherCompiler
 from ._matcher_function import MatcherFunction
-from ._registry import Registry
+from ._regex_scanner import RegexPattern, RegexScanner
+from ._registry import Registry, RegistryEntry
+from ._resolution_cache import CacheInfo, ResolutionCache, ResolutionChain
 from ._resolver import Resolver
 from ._reversed_resolver import ReversedResolver
+from ._route_tree import RoutePattern, RouteTree
 
-__all__ = ("MatcherFunction", "Registry", "Resolver", "ReversedResolver",)
+__all__ = ("CacheInfo", "CompiledMatcher", "DispatchIndex", "DispatchKeys", "FingerprintFields",
+           "HandlerRecord", "MatcherCompiler", "MatcherFunction", "RegexPattern", "RegexScanner",
+           "Registry", "RegistryEntry", "ResolutionCache", "ResolutionChain", "Resolver",
+           "ReversedResolver", "RoutePattern", "RouteTree",)
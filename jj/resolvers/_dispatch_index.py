@@ -0,0 +1,269 @@
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+from ..requests import Request
+from ._dispatch_keys import DispatchKeys
+from ._fingerprint_fields import FingerprintFields
+from ._handler_record import HandlerRecord
+from ._regex_scanner import RegexPattern, RegexScanner
+from ._route_tree import RoutePattern, RouteTree
+
+__all__ = ("DispatchIndex",)
+
+
+def _get_request_values(request: Request, dimension: Hashable) -> Tuple[Hashable, ...]:
+    if dimension == "method":
+        return (request.method,)
+    if dimension == "path":
+        return (request.path,)
+    assert isinstance(dimension, tuple)
+    kind, name = dimension
+    if kind == "header":
+        return tuple(request.headers.getall(name, ()))
+    return tuple(request.query.getall(name, ()))
+
+
+class _Entry:
+    __slots__ = ("seq", "owner", "keys", "record", "fields", "constraints")
+
+    def __init__(self, seq: int, owner: Any, keys: Optional[DispatchKeys],
+                 record: HandlerRecord, fields: Optional[FingerprintFields]) -> None:
+        self.seq = seq
+        self.owner = owner
+        self.keys = keys
+        self.record = record
+        self.fields = fields
+        self.constraints: Dict[Hashable, FrozenSet[Hashable]] = {}
+
+
+class DispatchIndex:
+    """
+    Maps literal request values (method, path, ("header", name), ("param", name))
+    to the handlers of a single app that can possibly match them. Handlers whose
+    matchers don't constrain a dimension are kept in a per-dimension fallback set,
+    so lookups never miss a handler that could match.
+
+    Paths may also be RoutePatterns, looked up with a single walk of a RouteTree.
+    The segments of the routes it matches can be collected in a `results` dict
+    (see MatcherCompiler), so candidates don't match those routes again.
+    With `combine_regexes`, any dimension may be constrained by RegexPatterns,
+    which are searched together by a per-dimension RegexScanner.
+
+    Each handler is stored with its HandlerRecord, so candidates come back
+    ready to be evaluated.
+
+    The index also collects the FingerprintFields of its handlers (`None` for
+    a handler that can't be cached). Fields of removed handlers are kept, as
+    they only make fingerprints more specific.
+    """
+
+    dimensions = ("method", "path", "header", "param")
+
+    def __init__(self, *, combine_regexes: bool = False) -> None:
+        self._combine_regexes = combine_regexes
+        self._seq = 0
+        self._entries: Dict[Any, _Entry] = {}
+        self._owners: Dict[Any, Set[Any]] = {}
+        self._linked: Set[Any] = set()
+        self._postings: Dict[Hashable, Dict[Hashable, Set[Any]]] = {}
+        self._unconstrained: Dict[Hashable, Set[Any]] = {}
+        self._constrained_count: Dict[Hashable, int] = {}
+        self._routes = RouteTree()
+        self._scanners: Dict[Hashable, RegexScanner] = {}
+        self._fields = FingerprintFields()
+        self._uncacheable = 0
+
+    def __contains__(self, handler: Any) -> bool:
+        return handler in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def has_owner(self, owner: Any) -> bool:
+        return owner in self._owners
+
+    @property
+    def fingerprint_fields(self) -> Optional[FingerprintFields]:
+        return self._fields if (self._uncacheable == 0) else None
+
+    def add(self, record: HandlerRecord, owner: Any, keys: Optional[DispatchKeys],
+            fields: Optional[FingerprintFields] = None) -> None:
+        handler = record.handler
+        entry = self._entries.get(handler)
+        if entry is not None:
+            self._unlink(handler, entry)
+            entry.keys = keys
+            entry.record = record
+            entry.fields = fields
+            self._link(handler, entry)
+            return
+
+        entry = _Entry(self._seq, owner, keys, record, fields)
+        self._seq += 1
+        self._entries[handler] = entry
+        self._owners.setdefault(owner, set()).add(handler)
+        self._link(handler, entry)
+
+    def update(self, owner: Any, keys: Optional[DispatchKeys], record: HandlerRecord,
+               fields: Optional[FingerprintFields] = None) -> None:
+        # Handlers of the same owner share everything but the handler itself
+        for handler in self._owners.get(owner, ()):
+            entry = self._entries[handler]
+            self._unlink(handler, entry)
+            entry.keys = keys
+            entry.record = record._replace(handler=handler)
+            entry.fields = fields
+            self._link(handler, entry)
+
+    def remove(self, handler: Any) -> None:
+        entry = self._entries.pop(handler, None)
+        if entry is None:
+            return
+        self._unlink(handler, entry)
+        owned = self._owners[entry.owner]
+        owned.discard(handler)
+        if len(owned) == 0:
+            del self._owners[entry.owner]
+
+    def _get_constraints(self, keys: DispatchKeys) -> Dict[Hashable, FrozenSet[Hashable]]:
+        constraints: Dict[Hashable, FrozenSet[Hashable]] = {}
+        for dimension in keys.dimensions:
+            kind = dimension[0] if isinstance(dimension, tuple) else dimension
+            if kind not in self.dimensions:
+                continue
+            values = keys.get(dimension)
+            assert values is not None
+            if not self._combine_regexes:
+                if any(isinstance(value, RegexPattern) for value in values):
+                    continue
+            constraints[dimension] = values
+        return constraints
+
+    def _add_pattern(self, dimension: Hashable, value: Hashable) -> None:
+        if isinstance(value, RoutePattern):
+            self._routes.add(value)
+        elif isinstance(value, RegexPattern):
+            self._scanners.setdefault(dimension, RegexScanner()).add(value)
+
+    def _remove_pattern(self, dimension: Hashable, value: Hashable) -> None:
+        if isinstance(value, RoutePattern):
+            self._routes.remove(value)
+        elif isinstance(value, RegexPattern):
+            scanner = self._scanners[dimension]
+            scanner.remove(value)
+            if len(scanner) == 0:
+                del self._scanners[dimension]
+
+    def _link(self, handler: Any, entry: _Entry) -> None:
+        if entry.keys is None:
+            return  # handler without matchers never matches
+        constraints = entry.constraints = self._get_constraints(entry.keys)
+
+        if entry.fields is None:
+            self._uncacheable += 1
+        else:
+            self._fields |= entry.fields
+
+        for dimension in constraints:
+            if dimension not in self._unconstrained:
+                self._unconstrained[dimension] = set(self._linked)
+                self._postings[dimension] = {}
+                self._constrained_count[dimension] = 0
+
+        for dimension, unconstrained in self._unconstrained.items():
+            if dimension not in constraints:
+                unconstrained.add(handler)
+                continue
+            postings = self._postings[dimension]
+            for value in constraints[dimension]:
+                if value not in postings:
+                    postings[value] = set()
+                    self._add_pattern(dimension, value)
+                postings[value].add(handler)
+            self._constrained_count[dimension] += 1
+
+        self._linked.add(handler)
+
+    def _unlink(self, handler: Any, entry: _Entry) -> None:
+        if handler not in self._linked:
+            return
+        self._linked.discard(handler)
+        constraints = entry.constraints
+        if entry.fields is None:
+            self._uncacheable -= 1
+
+        for dimension in list(self._unconstrained):
+            if dimension not in constraints:
+                self._unconstrained[dimension].discard(handler)
+                continue
+            postings = self._postings[dimension]
+            for value in constraints[dimension]:
+                handlers = postings[value]
+                handlers.discard(handler)
+                if len(handlers) == 0:
+                    del postings[value]
+                    self._remove_pattern(dimension, value)
+            self._constrained_count[dimension] -= 1
+            if self._constrained_count[dimension] == 0:
+                del self._unconstrained[dimension]
+                del self._postings[dimension]
+                del self._constrained_count[dimension]
+
+    def _get_request_values(self, request: Request, dimension: Hashable,
+                            results: Optional[Dict[Hashable, Any]] = None
+                            ) -> Tuple[Hashable, ...]:
+        values = _get_request_values(request, dimension)
+        patterns: Tuple[Hashable, ...] = ()
+        if (dimension == "path") and (len(self._routes) > 0):
+            routes = self._routes.match(request.path)
+            if results is not None:
+                for route, segments in routes.items():
+                    results[route] = segments
+            patterns += tuple(routes)
+        scanner = self._scanners.get(dimension)
+        if scanner is not None:
+            patterns += tuple(scanner.search(values))
+        return values + patterns if patterns else values
+
+    def _accepts(self, entry: _Entry,
+                 request_values: Dict[Hashable, Tuple[Hashable, ...]]) -> bool:
+        for dimension, values in request_values.items():
+            accepted = entry.constraints.get(dimension)
+            if accepted is None:
+                continue
+            if not any(value in accepted for value in values):
+                return False
+        return True
+
+    def get_record(self, handler: Any) -> Optional[HandlerRecord]:
+        entry = self._entries.get(handler)
+        return entry.record if (entry is not None) else None
+
+    def get_records(self) -> List[HandlerRecord]:
+        # entries are kept in registration order
+        return [entry.record for entry in self._entries.values()]
+
+    def get_candidates(self, request: Request,
+                       results: Optional[Dict[Hashable, Any]] = None
+                       ) -> Optional[List[HandlerRecord]]:
+        request_values: Dict[Hashable, Tuple[Hashable, ...]] = {}
+        narrowest: Iterable[Any] = self._linked
+        narrowest_size = len(self._linked)
+
+        for dimension, unconstrained in self._unconstrained.items():
+            values = self._get_request_values(request, dimension, results)
+            request_values[dimension] = values
+
+            postings = self._postings[dimension]
+            matched = [postings[value] for value in values if value in postings]
+            size = len(unconstrained) + sum(len(handlers) for handlers in matched)
+            if size < narrowest_size:
+                narrowest_size = size
+                narrowest = set(unconstrained).union(*matched) if matched else unconstrained
+
+        if narrowest is self._linked:
+            return None  # nothing to rule out, every handler is a candidate
+
+        entries = [self._entries[handler] for handler in narrowest]
+        candidates = [entry for entry in entries if self._accepts(entry, request_values)]
+        candidates.sort(key=lambda entry: entry.seq)
+        return [entry.record for entry in candidates]
@@ -0,0 +1,47 @@
+from typing import Dict, FrozenSet, Hashable, Mapping, Optional
+
+__all__ = ("DispatchKeys",)
+
+
+class DispatchKeys:
+    """
+    Literal request values a matcher can possibly accept, per dimension
+    (e.g. "method" or "path"). A missing dimension is unconstrained.
+
+    Keys are only used to rule handlers out, so they may over-approximate
+    what the matcher accepts, but never under-approximate it.
+    """
+
+    def __init__(self, keys: Optional[Mapping[Hashable, FrozenSet[Hashable]]] = None) -> None:
+        self._keys: Dict[Hashable, FrozenSet[Hashable]] = dict(keys or {})
+
+    @property
+    def dimensions(self) -> FrozenSet[Hashable]:
+        return frozenset(self._keys)
+
+    def get(self, dimension: Hashable) -> Optional[FrozenSet[Hashable]]:
+        return self._keys.get(dimension)
+
+    def __and__(self, other: "DispatchKeys") -> "DispatchKeys":
+        # Keeping either side of a conjunction is always safe (unlike intersecting,
+        # which is wrong for multi-valued attributes), so keep the narrower one
+        keys = dict(self._keys)
+        for dimension, values in other._keys.items():
+            if (dimension not in keys) or (len(values) < len(keys[dimension])):
+                keys[dimension] = values
+        return DispatchKeys(keys)
+
+    def __or__(self, other: "DispatchKeys") -> "DispatchKeys":
+        keys = {}
+        for dimension, values in self._keys.items():
+            if dimension in other._keys:
+                keys[dimension] = values | other._keys[dimension]
+        return DispatchKeys(keys)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DispatchKeys):
+            return NotImplemented
+        return self._keys == other._keys
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._keys!r})"
@@ -0,0 +1,60 @@
+from typing import Any, Dict, FrozenSet, Hashable, Mapping, Optional
+
+from multidict import MultiMapping
+
+from ..requests import Request
+
+__all__ = ("FingerprintFields",)
+
+
+class FingerprintFields:
+    """
+    Request attributes (e.g. "method" or "headers") a matcher's result depends on.
+    For multi-valued attributes only some keys (e.g. header names) may matter;
+    `None` means the whole attribute does.
+
+    Requests with equal fingerprints are matched the same way, so their
+    resolution can be cached.
+    """
+
+    def __init__(self, fields: Optional[Mapping[str, Optional[FrozenSet[str]]]] = None) -> None:
+        self._fields: Dict[str, Optional[FrozenSet[str]]] = dict(fields or {})
+
+    @property
+    def attributes(self) -> FrozenSet[str]:
+        return frozenset(self._fields)
+
+    def get(self, attribute: str) -> Optional[FrozenSet[str]]:
+        return self._fields.get(attribute)
+
+    def get_fingerprint(self, request: Request) -> Hashable:
+        fingerprint = []
+        for attribute, keys in sorted(self._fields.items()):
+            value: Any = getattr(request, attribute)
+            if isinstance(value, MultiMapping):
+                if keys is None:
+                    value = tuple(value.items())
+                else:
+                    value = tuple(tuple(value.getall(key, ())) for key in sorted(keys))
+            fingerprint.append(value)
+        return tuple(fingerprint)
+
+    def __or__(self, other: "FingerprintFields") -> "FingerprintFields":
+        # Either side may be evaluated, so both sides' attributes matter
+        fields = dict(self._fields)
+        for attribute, keys in other._fields.items():
+            if attribute not in fields:
+                fields[attribute] = keys
+            elif (fields[attribute] is None) or (keys is None):
+                fields[attribute] = None
+            else:
+                fields[attribute] = fields[attribute] | keys  # type: ignore
+        return FingerprintFields(fields)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FingerprintFields):
+            return NotImplemented
+        return self._fields == other._fields
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._fields!r})"
@@ -0,0 +1,19 @@
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from jj.expiration_policy import ExpirationPolicy
+
+from ..handlers import HandlerFunction
+from ._matcher_compiler import CompiledMatcher
+from ._matcher_function import MatcherFunction
+
+__all__ = ("HandlerRecord",)
+
+
+class HandlerRecord(NamedTuple):
+    handler: HandlerFunction
+    matchers: Tuple[MatcherFunction, ...]
+    expiration_policy: Optional[ExpirationPolicy]
+    compiled_matcher: Optional[CompiledMatcher] = None
+    priority: int = 0
+    # Checked before matching, so handlers that never match again are skipped (see Resolver)
+    is_permanently_expired: Optional[Callable[[], bool]] = None
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, Hashable, List, Mapping, NamedTuple, Optional, Sequence
+
+from ..requests import Request
+
+__all__ = ("CompiledMatcher", "MatcherCompiler",)
+
+
+# Values of these types are inlined into the source as literals
+_LITERAL_TYPES = (str, int, bool, type(None))
+
+
+class CompiledMatcher(NamedTuple):
+    function: Callable[[Request, Optional[Dict[Hashable, Any]]], Any]
+    is_async: bool
+    source: str
+
+
+class MatcherCompiler:
+    """
+    Compiles the matchers of a handler into a single function.
+
+    Matchers describe themselves as Python expressions (see `compile` of
+    ResolvableMatcher and AttributeMatcher); the expressions of a handler's
+    matchers are joined with "and", so they are evaluated in the same order
+    and short-circuit the same way as the matchers do. Request attributes are
+    looked up once, at the top of the function.
+
+    Matchers that can't describe themselves are called as is: synchronously
+    if they can be, otherwise awaited (which makes the whole function async).
+
+    Matchers described without such calls are free of side effects. If one of
+    them is in `shared` (matchers used by several handlers, mapped to a slot),
+    its result is stored in the `results` dict passed to the function and
+    reused by every other function that gets the same dict. Matchers may keep
+    other values there too (see `memoize`), e.g. the segments of a route that
+    the resolver's route tree has already matched.
+    """
+
+    def __init__(self, shared: Optional[Mapping[Any, int]] = None) -> None:
+        self._shared = shared or {}
+        self._constants: Dict[str, Any] = {}
+        self._constant_names: Dict[int, str] = {}
+        self._attributes: Dict[str, str] = {}
+        self._variables = 0
+        self._calls = 0
+        self._is_async = False
+        self._uses_results = False
+        self._pure_matchers: List[Any] = []
+
+    @property
+    def pure_matchers(self) -> List[Any]:
+        return self._pure_matchers[:]
+
+    def add_constant(self, value: Any) -> str:
+        if type(value) in _LITERAL_TYPES:
+            return repr(value)
+        name = self._constant_names.get(id(value))
+        if name is None:
+            name = f"_c{len(self._constants)}"
+            self._constant_names[id(value)] = name
+            self._constants[name] = value
+        return name
+
+    def get_attribute(self, attribute: str) -> str:
+        name = self._attributes.get(attribute)
+        if name is None:
+            name = self._attributes[attribute] = f"request_{attribute}"
+        return name
+
+    def get_variable(self) -> str:
+        self._variables += 1
+        return f"_v{self._variables}"
+
+    def await_(self, expression: str) -> str:
+        self._calls += 1
+        self._is_async = True
+        return f"(await {expression})"
+
+    def call(self, matcher: Any, *args: str) -> str:
+        self._calls += 1
+        name = self.add_constant(matcher)
+        arguments = ", ".join(args)
+        is_sync = getattr(matcher, "is_sync", None)
+        if callable(is_sync) and (is_sync() is True):
+            return f"{name}.match_sync({arguments})"
+        return self.await_(f"{name}.match({arguments})")
+
+    def _compile(self, matcher: Any, *args: str) -> Optional[str]:
+        compile_ = getattr(matcher, "compile", None)
+        expression = compile_(self, *args) if callable(compile_) else None
+        return expression if isinstance(expression, str) else None
+
+    def compile_matcher(self, matcher: Any) -> str:
+        calls = self._calls
+        expression = self._compile(matcher)
+        if expression is None:
+            return self.call(matcher, "request")
+        if self._calls != calls:
+            return expression
+
+        self._pure_matchers.append(matcher)
+        slot = self._shared.get(matcher)
+        if slot is None:
+            return expression
+        return self.memoize(slot, expression)
+
+    def memoize(self, key: Hashable, expression: str) -> str:
+        self._uses_results = True
+        name = self.add_constant(key)
+        return (f"(results[{name}] if {name} in results "
+                f"else results.setdefault({name}, {expression}))")
+
+    def compile_attribute(self, matcher: Any, actual: str) -> str:
+        expression = self._compile(matcher, actual)
+        return self.call(matcher, actual) if (expression is None) else expression
+
+    def build(self, expressions: Sequence[str]) -> CompiledMatcher:
+        assert len(expressions) > 0
+        lines = [("async def" if self._is_async else "def") + " match(request, results=None):"]
+        if self._uses_results:
+            lines.append("    if results is None:")
+            lines.append("        results = {}")
+        for attribute, name in self._attributes.items():
+            lines.append(f"    {name} = request.{attribute}")
+        lines.append("    return " + " and ".join(expressions))
+        source = "\n".join(lines)
+
+        namespace = dict(self._constants)
+        exec(compile(source, "<matcher>", "exec"), namespace)
+        return CompiledMatcher(namespace["match"], self._is_async, source)
@@ -0,0 +1,161 @@
+import re
+from typing import Any, Dict, Iterable, Optional, Set
+
+try:
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # pragma: no cover
+    import sre_parse  # Python < 3.11
+
+__all__ = ("RegexPattern", "RegexScanner",)
+
+
+def _get_required_literal(pattern: str, flags: int) -> str:
+    # The longest run of literal characters at the top level of the pattern,
+    # which every match has to contain
+    if flags & re.IGNORECASE:
+        return ""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return ""
+    state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+    if getattr(state, "flags", 0) & re.IGNORECASE:
+        return ""
+
+    literal, run = "", ""
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            run += chr(value)
+            continue
+        literal, run = max(literal, run, key=len), ""
+    return max(literal, run, key=len)
+
+
+class RegexPattern:
+    """
+    A regular expression (as used by `RegexMatcher`) as a dispatch key.
+
+    Patterns are equal if their source and flags are, so handlers sharing a
+    pattern are searched once per request value.
+    """
+
+    __slots__ = ("_pattern", "_flags", "_compiled", "_literal")
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled = re.compile(pattern, flags)
+        self._literal = _get_required_literal(pattern, flags)
+
+    @property
+    def pattern(self) -> str:
+        return self._pattern
+
+    @property
+    def flags(self) -> int:
+        return self._flags
+
+    @property
+    def literal(self) -> str:
+        return self._literal
+
+    def search(self, value: Any) -> bool:
+        return self._compiled.search(value) is not None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RegexPattern):
+            return NotImplemented
+        return (self._pattern, self._flags) == (other._pattern, other._flags)
+
+    def __hash__(self) -> int:
+        return hash((RegexPattern, self._pattern, self._flags))
+
+    def __repr__(self) -> str:
+        if self._flags == 0:
+            return f"{self.__class__.__qualname__}({self._pattern!r})"
+        return f"{self.__class__.__qualname__}({self._pattern!r}, {self._flags!r})"
+
+
+class _Node:
+    __slots__ = ("children", "patterns")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        self.patterns: Set[RegexPattern] = set()
+
+
+class RegexScanner:
+    """
+    Searches a value with many regular expressions at once.
+
+    Required literals of all patterns are kept in a trie, so a single scan of
+    the value finds the patterns that can possibly match it; only those (and
+    the patterns without a literal) are then searched.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._unfiltered: Set[RegexPattern] = set()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: RegexPattern) -> None:
+        if pattern.literal == "":
+            patterns = self._unfiltered
+        else:
+            node = self._root
+            for char in pattern.literal:
+                node = node.children.setdefault(char, _Node())
+            patterns = node.patterns
+
+        if pattern not in patterns:
+            patterns.add(pattern)
+            self._size += 1
+
+    def remove(self, pattern: RegexPattern) -> None:
+        if pattern.literal == "":
+            if pattern in self._unfiltered:
+                self._unfiltered.discard(pattern)
+                self._size -= 1
+            return
+
+        path = [self._root]
+        for char in pattern.literal:
+            node: Optional[_Node] = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        if pattern not in path[-1].patterns:
+            return
+        path[-1].patterns.discard(pattern)
+        self._size -= 1
+
+        # Prune the branch that is left empty
+        for depth in range(len(pattern.literal), 0, -1):
+            if path[depth].children or path[depth].patterns:
+                break
+            del path[depth - 1].children[pattern.literal[depth - 1]]
+
+    def _prefilter(self, value: Any) -> Set[RegexPattern]:
+        found = set(self._unfiltered)
+        children = self._root.children
+        for start in range(len(value)):
+            node = children.get(value[start])
+            position = start + 1
+            while node is not None:
+                found.update(node.patterns)
+                if position == len(value):
+                    break
+                node = node.children.get(value[position])
+                position += 1
+        return found
+
+    def search(self, values: Iterable[Any]) -> Set[RegexPattern]:
+        matched: Set[RegexPattern] = set()
+        for value in values:
+            for pattern in self._prefilter(value):
+                if (pattern not in matched) and pattern.search(value):
+                    matched.add(pattern)
+        return matched
@@ -1,38 +1,92 @@
-from collections import OrderedDict
-from typing import Any, MutableMapping, Type
+from typing import Any, Dict, MutableMapping, Optional, Type
 
-__all__ = ("Registry",)
+__all__ = ("Registry", "RegistryEntry",)
+
+
+class RegistryEntry:
+    """
+    Everything registered for a single container (an app, a handler or `None`).
+
+    Matchers and attributes, which are looked up on every request, are kept
+    in slots; mappings of any other name are kept in `names`. Mappings are
+    only created once something is added to them.
+    """
+
+    __slots__ = ("matchers", "attributes", "names")
+
+    def __init__(self) -> None:
+        self.matchers: Optional[MutableMapping[Any, Any]] = None
+        self.attributes: Optional[MutableMapping[Any, Any]] = None
+        self.names: Optional[Dict[str, MutableMapping[Any, Any]]] = None
+
+    def get(self, name: str) -> Optional[MutableMapping[Any, Any]]:
+        if name == "matchers":
+            return self.matchers
+        if name == "attributes":
+            return self.attributes
+        return self.names.get(name) if (self.names is not None) else None
+
+    def set(self, name: str, mapping: Optional[MutableMapping[Any, Any]]) -> None:
+        if name == "matchers":
+            self.matchers = mapping
+        elif name == "attributes":
+            self.attributes = mapping
+        elif mapping is not None:
+            if self.names is None:
+                self.names = {}
+            self.names[name] = mapping
+        elif self.names is not None:
+            self.names.pop(name, None)
 
 
 class Registry:
     def __init__(self,
-                 mutable_mapping_factory: Type[MutableMapping[Any, Any]] = OrderedDict) -> None:
+                 mutable_mapping_factory: Type[MutableMapping[Any, Any]] = dict) -> None:
         self._factory = mutable_mapping_factory
-        self._registry = self._factory()
+        self._entries: Dict[Any, RegistryEntry] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get_entry(self, container: Any) -> Optional[RegistryEntry]:
+        return self._entries.get(container)
 
     def add(self, container: Any, name: str, key: Any, value: Any = None) -> None:
-        if container not in self._registry:
-            self._registry[container] = self._factory()
-        if name not in self._registry[container]:
-            self._registry[container][name] = self._factory()
-        self._registry[container][name][key] = value
+        entry = self._entries.get(container)
+        if entry is None:
+            entry = self._entries[container] = RegistryEntry()
+        mapping = entry.get(name)
+        if mapping is None:
+            mapping = self._factory()
+            entry.set(name, mapping)
+        mapping[key] = value
+        self._version += 1
 
     def get(self, container: Any, name: str) -> Any:
-        if (container not in self._registry) or (name not in self._registry[container]):
-            return self._factory()
-        return self._registry[container][name]
+        entry = self._entries.get(container)
+        mapping = entry.get(name) if (entry is not None) else None
+        return self._factory() if (mapping is None) else mapping
 
     def remove(self, container: Any, name: str, key: Any) -> None:
         # backward compatibility
         return self.remove_key(container, name, key)
 
     def remove_key(self, container: Any, name: str, key: Any) -> None:
-        if (container in self._registry) and (name in self._registry[container]):
-            self._registry[container][name].pop(key, None)
+        entry = self._entries.get(container)
+        mapping = entry.get(name) if (entry is not None) else None
+        if (mapping is not None) and (key in mapping):
+            del mapping[key]
+            self._version += 1
 
     def remove_name(self, container: Any, name: str) -> None:
-        if container in self._registry:
-            self._registry[container].pop(name, None)
+        entry = self._entries.get(container)
+        if (entry is not None) and (entry.get(name) is not None):
+            entry.set(name, None)
+            self._version += 1
 
     def remove_container(self, container: Any) -> None:
-        self._registry.pop(container, None)
+        if container in self._entries:
+            del self._entries[container]
+            self._version += 1
@@ -0,0 +1,35 @@
+from typing import Any, Dict
+
+from ..requests import Request
+
+__all__ = ("RequestView",)
+
+
+class RequestView:
+    """
+    A request as seen by one of several matchers evaluated at the same time.
+
+    Attributes are read from the request, but the ones set by the matcher
+    (e.g. segments) are kept in the view, so matchers of different handlers
+    don't overwrite each other's. Only the view of the winning handler is
+    applied to the request.
+    """
+
+    __slots__ = ("_request", "_attributes")
+
+    def __init__(self, request: Request) -> None:
+        object.__setattr__(self, "_request", request)
+        object.__setattr__(self, "_attributes", {})
+
+    def __getattr__(self, name: str) -> Any:
+        attributes: Dict[str, Any] = object.__getattribute__(self, "_attributes")
+        if name in attributes:
+            return attributes[name]
+        return getattr(object.__getattribute__(self, "_request"), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._attributes[name] = value
+
+    def apply(self) -> None:
+        for name, value in self._attributes.items():
+            setattr(self._request, name, value)
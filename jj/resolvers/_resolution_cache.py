@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+from ._handler_record import HandlerRecord
+
+__all__ = ("CacheInfo", "ResolutionCache", "ResolutionChain",)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ResolutionChain(NamedTuple):
+    # Records that matched the request, in precedence order, up to the handler resolved
+    records: Tuple[HandlerRecord, ...]
+    # Whether no other record matches, i.e. all candidates were evaluated
+    complete: bool
+
+
+class ResolutionCache:
+    """
+    A least recently used cache of resolution chains, keyed by request fingerprints.
+
+    The cache is valid for a single registry version; looking it up with
+    another version clears it.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        assert maxsize > 0, f"maxsize must be more than 0, {maxsize} given"
+        self._maxsize = maxsize
+        self._chains: "OrderedDict[Hashable, ResolutionChain]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._chains))
+
+    def get(self, version: int, key: Hashable) -> Optional[ResolutionChain]:
+        if version != self._version:
+            self._chains.clear()
+            self._version = version
+        chain = self._chains.get(key)
+        if chain is None:
+            self._misses += 1
+            return None
+        self._chains.move_to_end(key)
+        self._hits += 1
+        return chain
+
+    def set(self, version: int, key: Hashable, chain: ResolutionChain) -> None:
+        if version != self._version:
+            return
+        self._chains[key] = chain
+        self._chains.move_to_end(key)
+        if len(self._chains) > self._maxsize:
+            self._chains.popitem(last=False)
+
+    def clear(self) -> None:
+        self._chains.clear()
+        self._version = None
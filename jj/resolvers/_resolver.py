@@ -1,7 +1,11 @@
-from inspect import isclass
-from typing import Any, List, Optional, Type, Union
+from asyncio import Task, create_task
+from inspect import isawaitable, isclass, signature
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple, Type, Union
 from unittest.mock import sentinel as nil
+from weakref import WeakKeyDictionary
 
+from aiohttp.web import BaseRequest
 from undecorated import undecorated
 
 from jj.expiration_policy import ExpirationPolicy
@@ -9,8 +13,15 @@ from jj.expiration_policy import ExpirationPolicy
 from ..apps import AbstractApp
 from ..handlers import HandlerFunction
 from ..requests import Request
+from ._dispatch_index import DispatchIndex
+from ._dispatch_keys import DispatchKeys
+from ._fingerprint_fields import FingerprintFields
+from ._handler_record import HandlerRecord
+from ._matcher_compiler import CompiledMatcher, MatcherCompiler
 from ._matcher_function import MatcherFunction
 from ._registry import Registry
+from ._request_view import RequestView
+from ._resolution_cache import CacheInfo, ResolutionCache, ResolutionChain
 
 __all__ = ("Resolver",)
 
@@ -18,20 +29,76 @@ AppOrHandler = Union[Type[AbstractApp], HandlerFunction]
 
 
 class Resolver:
+    # Attributes kept in HandlerRecords
+    _record_attributes = ("expiration_policy", "priority")
+
     def __init__(self, registry: Registry,
                  default_app: AbstractApp,
-                 default_handler: HandlerFunction) -> None:
+                 default_handler: HandlerFunction,
+                 *,
+                 combine_regexes: bool = False,
+                 compile_matchers: bool = True,
+                 cache_size: int = 0,
+                 concurrency: int = 1) -> None:
+        assert concurrency > 0, f"concurrency must be more than 0, {concurrency} given"
         self._registry = registry
         self._default_app = default_app
         self._default_handler = default_handler
-
-    def unwrap(self, fn: Any) -> Any:
+        self._combine_regexes = combine_regexes
+        self._compile_matchers_enabled = compile_matchers
+        # Matchers without side effects (see MatcherCompiler), the handlers using them,
+        # and result slots of the ones used by several handlers
+        self._pure_matchers: Dict[HandlerFunction, Set[Any]] = {}
+        self._matcher_users: Dict[Any, Set[HandlerFunction]] = {}
+        self._shared_matchers: Dict[Any, int] = {}
+        self._next_slot = 0
+        # Compiled matchers of the handlers and the matchers they are compiled from,
+        # so records are rebuilt (e.g. once an attribute changes) without compiling again
+        self._compiled_matchers: Dict[HandlerFunction, Tuple[Tuple[MatcherFunction, ...],
+                                                             Optional[CompiledMatcher]]] = {}
+        self._dispatch_indexes: Dict[Type[AbstractApp], DispatchIndex] = {}
+        self._snapshots: Dict[Type[AbstractApp], Tuple[int, Tuple[HandlerRecord, ...]]] = {}
+        self._cache = ResolutionCache(cache_size) if (cache_size > 0) else None
+        # Number of async matchers of different handlers evaluated at the same time
+        self._concurrency = concurrency
+        # Unwrapping walks closures, so it's done once per handler; handlers that
+        # aren't decorated are mapped to None, so they don't keep themselves alive
+        self._unwrapped: WeakKeyDictionary[Any, Any] = WeakKeyDictionary()
+        self._arities: WeakKeyDictionary[Any, int] = WeakKeyDictionary()
+
+    @property
+    def version(self) -> int:
+        return self._registry.version
+
+    def _unwrap(self, fn: Any) -> Any:
         try:
             unwrapped = undecorated(fn)
         except ValueError:
             return fn
         return fn if (unwrapped is None) else unwrapped
 
+    def unwrap(self, fn: Any) -> Any:
+        try:
+            if self._registry.get_entry(fn) is not None:
+                return fn  # containers are registered unwrapped
+            unwrapped = self._unwrapped.get(fn, nil)
+        except TypeError:  # not hashable or weak referenceable
+            return self._unwrap(fn)
+        if unwrapped is nil:
+            unwrapped = self._unwrap(fn)
+            self._unwrapped[fn] = None if (unwrapped is fn) else unwrapped
+        return fn if (unwrapped is None) else unwrapped
+
+    def get_arity(self, handler: HandlerFunction) -> int:
+        unwrapped = self.unwrap(handler)
+        try:
+            arity = self._arities.get(unwrapped)
+        except TypeError:  # not weak referenceable
+            return len(signature(unwrapped).parameters)
+        if arity is None:
+            arity = self._arities[unwrapped] = len(signature(unwrapped).parameters)
+        return arity
+
     # Apps
 
     def register_app(self, app: Type[AbstractApp]) -> None:
@@ -50,14 +117,43 @@ class Resolver:
 
     def register_handler(self, handler: HandlerFunction, app: Type[AbstractApp]) -> None:
         assert isclass(app)
-        self.deregister_handler(handler, type(self._default_app))
+        self._remove_handler(handler, type(self._default_app))
         self.register_app(app)
         self._registry.add(app, "handlers", handler)
 
+        index = self._dispatch_indexes.get(app)
+        if index is None:
+            index = DispatchIndex(combine_regexes=self._combine_regexes)
+            self._dispatch_indexes[app] = index
+        try:
+            self.get_arity(handler)  # so that requests only look it up
+        except (TypeError, ValueError):
+            pass
+        if handler not in index:
+            keys = self._get_dispatch_keys(handler)
+            record = self._get_record(handler)
+            index.add(record, self.unwrap(handler), keys, self._get_record_fields(record))
+
     def deregister_handler(self, handler: HandlerFunction, app: Type[AbstractApp]) -> None:
         assert isclass(app)
+        self._remove_handler(handler, app)
+
+        unwrapped = self.unwrap(handler)
+        if not self._is_indexed(unwrapped):
+            # Matchers of a handler no app resolves aren't compiled or shared anymore
+            self._compiled_matchers.pop(unwrapped, None)
+            self._share_matchers(unwrapped, [])
+
+    def _remove_handler(self, handler: HandlerFunction, app: Type[AbstractApp]) -> None:
         self._registry.remove(app, "handlers", handler)
 
+        index = self._dispatch_indexes.get(app)
+        if index is not None:
+            index.remove(handler)
+
+    def _is_indexed(self, unwrapped: HandlerFunction) -> bool:
+        return any(index.has_owner(unwrapped) for index in self._dispatch_indexes.values())
+
     def get_handlers(self, app: Type[AbstractApp]) -> List[HandlerFunction]:
         assert isclass(app)
         handlers = self._registry.get(app, "handlers")
@@ -69,6 +165,7 @@ class Resolver:
         unwrapped = self.unwrap(handler)
         self.register_handler(unwrapped, type(self._default_app))
         self._registry.add(unwrapped, "matchers", matcher)
+        self._update_records(unwrapped)
 
     def deregister_matcher(self, matcher: MatcherFunction, handler: HandlerFunction) -> None:
         unwrapped = self.unwrap(handler)
@@ -78,16 +175,150 @@ class Resolver:
         if len(matchers) == 0:
             self._registry.remove_name(unwrapped, "matchers")
 
+        self._update_records(unwrapped)
+
     def get_matchers(self, handler: HandlerFunction) -> List[MatcherFunction]:
+        entry = self._registry.get_entry(self.unwrap(handler))
+        if (entry is None) or (entry.matchers is None):
+            return []
+        return list(entry.matchers.keys())
+
+    # Dispatch
+
+    def _get_dispatch_keys(self, handler: HandlerFunction) -> Optional[DispatchKeys]:
+        matchers = self.get_matchers(handler)
+        if len(matchers) == 0:
+            return None
+
+        keys = DispatchKeys()
+        for matcher in matchers:
+            # Only matchers that can describe themselves (see ResolvableMatcher)
+            # narrow the index, anything else is treated as unconstrained
+            owner = getattr(matcher, "__self__", None)
+            get_dispatch_keys = getattr(owner, "get_dispatch_keys", None)
+            if get_dispatch_keys is None:
+                continue
+            matcher_keys = get_dispatch_keys()
+            if isinstance(matcher_keys, DispatchKeys):
+                keys &= matcher_keys
+        return keys
+
+    def _compile_matchers(self, matchers: Sequence[MatcherFunction]
+                          ) -> Tuple[Optional[CompiledMatcher], List[Any]]:
+        if not self._compile_matchers_enabled or (len(matchers) == 0):
+            return None, []
+
+        compiler = MatcherCompiler(self._shared_matchers)
+        expressions = []
+        for matcher in matchers:
+            # Only matchers that can describe themselves (see ResolvableMatcher.compile)
+            # are compiled, a handler with any other matcher is evaluated as is
+            owner = getattr(matcher, "__self__", None)
+            if not callable(getattr(owner, "compile", None)):
+                return None, []
+            expressions.append(compiler.compile_matcher(owner))
+        return compiler.build(expressions), compiler.pure_matchers
+
+    def _share_matchers(self, unwrapped: HandlerFunction, pure_matchers: List[Any]) -> bool:
+        for matcher in self._pure_matchers.pop(unwrapped, set()):
+            users = self._matcher_users[matcher]
+            users.discard(unwrapped)
+            if len(users) == 0:
+                del self._matcher_users[matcher]
+                self._shared_matchers.pop(matcher, None)
+
+        newly_shared = []
+        for matcher in pure_matchers:
+            users = self._matcher_users.setdefault(matcher, set())
+            users.add(unwrapped)
+            if (len(users) > 1) and (matcher not in self._shared_matchers):
+                self._shared_matchers[matcher] = self._next_slot
+                self._next_slot += 1
+                newly_shared.append(matcher)
+        if len(pure_matchers) > 0:
+            self._pure_matchers[unwrapped] = set(pure_matchers)
+
+        # Handlers compiled before their matchers became shared don't store the results yet
+        for matcher in newly_shared:
+            for user in self._matcher_users[matcher] - {unwrapped}:
+                self._compiled_matchers.pop(user, None)
+                self._update_records(user)
+        return len(newly_shared) > 0
+
+    def _get_compiled_matcher(self, handler: HandlerFunction,
+                              matchers: Tuple[MatcherFunction, ...]) -> Optional[CompiledMatcher]:
         unwrapped = self.unwrap(handler)
-        matchers = self._registry.get(unwrapped, "matchers")
-        return list(matchers.keys())
+        compiled = self._compiled_matchers.get(unwrapped)
+        if (compiled is not None) and (len(compiled[0]) == len(matchers)) and \
+           all(old is new for old, new in zip(compiled[0], matchers)):
+            return compiled[1]
+
+        compiled_matcher, pure_matchers = self._compile_matchers(matchers)
+        if self._share_matchers(unwrapped, pure_matchers):
+            # Slots of the newly shared matchers are assigned once they are compiled
+            compiled_matcher, _ = self._compile_matchers(matchers)
+        self._compiled_matchers[unwrapped] = (matchers, compiled_matcher)
+        return compiled_matcher
+
+    def _get_record(self, handler: HandlerFunction) -> HandlerRecord:
+        matchers = tuple(self.get_matchers(handler))
+        expiration_policy = self.get_attribute("expiration_policy", handler, default=None)
+        compiled_matcher = self._get_compiled_matcher(handler, matchers)
+        priority = self.get_attribute("priority", handler, default=0)
+        is_permanently_expired = self._get_expiration_check(expiration_policy)
+        return HandlerRecord(handler, matchers, expiration_policy, compiled_matcher, priority,
+                             is_permanently_expired)
+
+    def _update_records(self, unwrapped: HandlerFunction) -> None:
+        if not self._is_indexed(unwrapped):
+            return  # the record is built once the handler is registered
+        keys = self._get_dispatch_keys(unwrapped)
+        record = self._get_record(unwrapped)
+        fields = self._get_record_fields(record)
+        for index in self._dispatch_indexes.values():
+            index.update(unwrapped, keys, record, fields)
+
+    def _order_by_priority(self, records: List[HandlerRecord]) -> List[HandlerRecord]:
+        # Handlers of a higher priority win, registration order decides within
+        # a priority (the sort is stable)
+        if any(record.priority != 0 for record in records):
+            records.sort(key=attrgetter("priority"), reverse=True)
+        return records
+
+    def _order_by_precedence(self, records: List[HandlerRecord]) -> List[HandlerRecord]:
+        # the most recently registered handler wins
+        records.reverse()
+        return self._order_by_priority(records)
+
+    def get_records(self, app: Type[AbstractApp]) -> Tuple[HandlerRecord, ...]:
+        assert isclass(app)
+        snapshot = self._snapshots.get(app)
+        if (snapshot is None) or (snapshot[0] != self._registry.version):
+            index = self._dispatch_indexes.get(app)
+            records = self._order_by_precedence(index.get_records()) if index else []
+            snapshot = (self._registry.version, tuple(records))
+            self._snapshots[app] = snapshot
+        return snapshot[1]
+
+    def get_candidates(self, request: Request, app: Type[AbstractApp],
+                       results: Optional[Dict[Hashable, Any]] = None
+                       ) -> Sequence[HandlerRecord]:
+        assert isclass(app)
+        index = self._dispatch_indexes.get(app)
+        if index is None:
+            return ()
+        candidates = index.get_candidates(request, results)
+        if candidates is None:
+            return self.get_records(app)
+        return self._order_by_precedence(candidates)
 
     # Attributes
 
     def register_attribute(self, name: Any, value: Any, handler: AppOrHandler) -> None:
         unwrapped = self.unwrap(handler)
         self._registry.add(unwrapped, "attributes", name, value)
+        if name in self._record_attributes:
+            self._update_records(unwrapped)
 
     def deregister_attribute(self, attribute_name: Any, handler: AppOrHandler) -> None:
         unwrapped = self.unwrap(handler)
@@ -97,28 +328,79 @@ class Resolver:
         if len(attributes) == 0:
             self._registry.remove_name(unwrapped, "attributes")
 
+        if attribute_name in self._record_attributes:
+            self._update_records(unwrapped)
+
     def get_attribute(self, attribute_name: Any,
                       handler: AppOrHandler,
                       default: Any = nil) -> Any:
-        unwrapped = self.unwrap(handler)
-        attributes = self._registry.get(unwrapped, "attributes")
-        return attributes.get(attribute_name, default)
+        # Called on every request, so the entry is looked up directly
+        entry = self._registry.get_entry(self.unwrap(handler))
+        if (entry is None) or (entry.attributes is None):
+            return default
+        return entry.attributes.get(attribute_name, default)
 
     def get_attributes(self, handler: AppOrHandler) -> List[Any]:
-        unwrapped = self.unwrap(handler)
-        attributes = self._registry.get(unwrapped, "attributes")
-        return list(attributes.keys())
+        entry = self._registry.get_entry(self.unwrap(handler))
+        if (entry is None) or (entry.attributes is None):
+            return []
+        return list(entry.attributes.keys())
 
     # Resolve
 
-    async def _match_request(self, request: Request, matchers: List[MatcherFunction]) -> bool:
+    async def _match_request(self, request: Request,
+                             matchers: Sequence[MatcherFunction]) -> bool:
         if len(matchers) == 0:
             return False
         for matcher in matchers:
-            if not await matcher(request):
+            # Matchers that can be evaluated synchronously (see ResolvableMatcher.is_sync)
+            # don't need a coroutine
+            owner = getattr(matcher, "__self__", None)
+            is_sync = getattr(owner, "is_sync", None)
+            if (is_sync is not None) and (is_sync() is True):
+                if not owner.match_sync(request):  # type: ignore
+                    return False
+            elif not await matcher(request):
                 return False
         return True
 
+    # Resolution cache
+
+    @property
+    def cache_info(self) -> CacheInfo:
+        if self._cache is None:
+            return CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+        return self._cache.info
+
+    def _get_record_fields(self, record: HandlerRecord) -> Optional[FingerprintFields]:
+        if self._cache is None:
+            return None
+        fields = FingerprintFields()
+        for matcher in record.matchers:
+            # Only matchers that declare what they depend on (see ResolvableMatcher)
+            # can be cached, any other matcher disables the cache for the whole app
+            owner = getattr(matcher, "__self__", None)
+            get_fingerprint_fields = getattr(owner, "get_fingerprint_fields", None)
+            if get_fingerprint_fields is None:
+                return None
+            matcher_fields = get_fingerprint_fields()
+            if not isinstance(matcher_fields, FingerprintFields):
+                return None
+            fields |= matcher_fields
+        return fields
+
+    def _get_cache_key(self, request: Request, app: Type[AbstractApp]) -> Optional[Hashable]:
+        index = self._dispatch_indexes.get(app)
+        fields = index.fingerprint_fields if (index is not None) else FingerprintFields()
+        if fields is None:
+            return None
+        key = (app, fields.get_fingerprint(request))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     # ExpirationPolicy
 
     async def _is_handler_expired(self, handler: HandlerFunction, request: Request) -> bool:
@@ -130,13 +412,174 @@ class Resolver:
 
         return await expiration_policy.is_expired(request)
 
+    def _get_expiration_check(self, expiration_policy: Optional[ExpirationPolicy]
+                              ) -> Optional[Callable[[], bool]]:
+        if expiration_policy is None:
+            return None
+        # Handlers are removed in bulk once the deadline comes (see ExpirationScheduler),
+        # so the clock isn't read for every request; until then `is_expired` is checked
+        get_deadline = getattr(expiration_policy, "get_deadline", None)
+        if callable(get_deadline) and (get_deadline() is not None):
+            return None
+        # Policies are duck-typed, older ones may not report a terminal state
+        is_permanently_expired = getattr(expiration_policy, "is_permanently_expired", None)
+        return is_permanently_expired if callable(is_permanently_expired) else None
+
+    def _is_permanently_expired(self, record: HandlerRecord) -> bool:
+        is_permanently_expired = record.is_permanently_expired
+        return (is_permanently_expired is not None) and (is_permanently_expired() is True)
+
+    async def _match_record(self, request: Request, record: HandlerRecord,
+                            results: Dict[Hashable, Any]) -> bool:
+        compiled_matcher = record.compiled_matcher
+        if compiled_matcher is None:
+            return await self._match_request(request, record.matchers)
+        elif compiled_matcher.is_async:
+            return bool(await compiled_matcher.function(request, results))
+        else:
+            return bool(compiled_matcher.function(request, results))
+
+    def _is_async_record(self, record: HandlerRecord) -> bool:
+        compiled_matcher = record.compiled_matcher
+        return (compiled_matcher is None) or compiled_matcher.is_async
+
+    async def _set_segments(self, request: Request, record: HandlerRecord,
+                            results: Optional[Dict[Hashable, Any]] = None) -> None:
+        # Matching has no side effects (see ResolvableMatcher.get_segments), so segments
+        # are extracted once, for the winner only, from the results of matching if kept
+        segments = None
+        for matcher in record.matchers:
+            owner = getattr(matcher, "__self__", None)
+            get_segments = getattr(owner, "get_segments", None)
+            if callable(get_segments):
+                matcher_segments = get_segments(request, results)
+                if isawaitable(matcher_segments):
+                    matcher_segments = await matcher_segments
+                if isinstance(matcher_segments, dict):
+                    segments = matcher_segments
+        if segments is not None:
+            request.segments = segments
+
+    async def _resolve(self, request: Request, app: Type[AbstractApp],
+                       expired: Sequence[HandlerRecord] = ()
+                       ) -> Tuple[HandlerFunction, ResolutionChain]:
+        # Results of matchers shared by several handlers and segments of the routes
+        # matched by the dispatch index, see MatcherCompiler
+        results: Dict[Hashable, Any] = {}
+        if self._concurrency > 1:
+            handler, chain = await self._resolve_concurrently(request, app, expired, results)
+        else:
+            handler, chain = await self._resolve_sequentially(
+                request, self.get_candidates(request, app, results), expired, results)
+        if not chain.complete:
+            await self._set_segments(request, chain.records[-1], results)
+        return handler, chain
+
+    async def _resolve_sequentially(self, request: Request, records: Sequence[HandlerRecord],
+                                    expired: Sequence[HandlerRecord] = (),
+                                    results: Optional[Dict[Hashable, Any]] = None
+                                    ) -> Tuple[HandlerFunction, ResolutionChain]:
+        expired_handlers = {record.handler for record in expired}
+        matched = []
+        if results is None:
+            results = {}
+        for record in records:
+            if self._is_permanently_expired(record):
+                continue  # would be matched only to be skipped
+            if not await self._match_record(request, record, results):
+                continue
+            matched.append(record)
+            expiration_policy = record.expiration_policy
+            if expiration_policy is not None:
+                if (record.handler in expired_handlers) or \
+                   await expiration_policy.is_expired(request):
+                    continue
+            return record.handler, ResolutionChain(tuple(matched), complete=False)
+        return self._default_handler, ResolutionChain(tuple(matched), complete=True)
+
+    async def _resolve_concurrently(self, request: Request, app: Type[AbstractApp],
+                                    expired: Sequence[HandlerRecord] = (),
+                                    results: Optional[Dict[Hashable, Any]] = None
+                                    ) -> Tuple[HandlerFunction, ResolutionChain]:
+        if results is None:
+            results = {}
+        records = [record for record in self.get_candidates(request, app, results)
+                   if not self._is_permanently_expired(record)]
+        async_positions = [position for position, record in enumerate(records)
+                           if self._is_async_record(record)]
+        if len(async_positions) < 2:
+            return await self._resolve_sequentially(request, records, expired, results)
+
+        if isinstance(request, BaseRequest):
+            # Matchers reading the body at the same time would split it between them
+            await request.read()
+
+        expired_handlers = {record.handler for record in expired}
+        matched = []
+        # Async matchers are evaluated ahead, in precedence order, by up to `concurrency`
+        # tasks. Results are still consumed in precedence order, so the winner and the
+        # expiration policies checked are the same as in a sequential scan
+        pending: Dict[int, Tuple[RequestView, "Task[bool]"]] = {}
+        started = 0
+        try:
+            for position, record in enumerate(records):
+                while (started < len(async_positions)) and (len(pending) < self._concurrency):
+                    ahead = async_positions[started]
+                    view = RequestView(request)
+                    coro = self._match_record(view, records[ahead], results)  # type: ignore
+                    task = create_task(coro)
+                    pending[ahead] = (view, task)
+                    started += 1
+
+                winner_view = None
+                if position in pending:
+                    winner_view, task = pending.pop(position)
+                    is_matched = await task
+                else:
+                    is_matched = await self._match_record(request, record, results)
+                if not is_matched:
+                    continue
+
+                matched.append(record)
+                expiration_policy = record.expiration_policy
+                if expiration_policy is not None:
+                    if (record.handler in expired_handlers) or \
+                       await expiration_policy.is_expired(request):
+                        continue
+                if winner_view is not None:
+                    winner_view.apply()
+                return record.handler, ResolutionChain(tuple(matched), complete=False)
+            return self._default_handler, ResolutionChain(tuple(matched), complete=True)
+        finally:
+            for _, task in pending.values():
+                if task.done() and not task.cancelled():
+                    task.exception()  # evaluated ahead of the winner, so it doesn't count
+                else:
+                    task.cancel()
+
     async def resolve(self, request: Request, app: AbstractApp) -> HandlerFunction:
         assert not isclass(app)
-        handlers = self.get_handlers(type(app))
-        for handler in reversed(handlers):
-            matchers = self.get_matchers(handler)
-            if await self._match_request(request, matchers):
-                if await self._is_handler_expired(handler, request):
-                    continue
-                return handler
-        return self._default_handler
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._get_cache_key(request, type(app))
+        if (self._cache is None) or (cache_key is None):
+            handler, _ = await self._resolve(request, type(app))
+            return handler
+
+        version = self._registry.version
+        chain = self._cache.get(version, cache_key)
+        if chain is not None:
+            # Expiration policies are stateful, so they are checked in the same order
+            # as they would be without the cache
+            for record in chain.records:
+                expiration_policy = record.expiration_policy
+                if (expiration_policy is None) or not await expiration_policy.is_expired(request):
+                    await self._set_segments(request, record)
+                    return record.handler
+            if chain.complete:
+                return self._default_handler
+
+        handler, chain = await self._resolve(request, type(app),
+                                             chain.records if chain else ())
+        self._cache.set(version, cache_key, chain)
+        return handler
@@ -2,6 +2,7 @@ from typing import List, Type
 
 from ..apps import AbstractApp
 from ..handlers import HandlerFunction
+from ._handler_record import HandlerRecord
 from ._resolver import Resolver
 
 __all__ = ("ReversedResolver",)
@@ -11,3 +12,7 @@ class ReversedResolver(Resolver):
     def get_handlers(self, app: Type[AbstractApp]) -> List[HandlerFunction]:
         handlers = super().get_handlers(app)
         return list(reversed(handlers))
+
+    def _order_by_precedence(self, records: List[HandlerRecord]) -> List[HandlerRecord]:
+        # the first registered handler wins
+        return self._order_by_priority(records)
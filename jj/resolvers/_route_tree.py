@@ -0,0 +1,172 @@
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiohttp.web_urldispatcher import DynamicResource
+
+__all__ = ("RoutePattern", "RouteTree",)
+
+
+# Static segments made of these characters are compared as is; anything else
+# might be requoted by aiohttp, so it's treated like a parameter segment
+_PLAIN_SEGMENT = re.compile(r"[A-Za-z0-9\-._~]*")
+
+
+class RoutePattern:
+    """
+    A route pattern (e.g. "/users/{id}") as a dispatch key of the "path" dimension.
+
+    Matching and segment extraction are done by aiohttp's `DynamicResource`,
+    exactly as `RouteMatcher` does.
+    """
+
+    __slots__ = ("_path", "_resource")
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._resource = DynamicResource(path)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def match(self, path: str) -> Optional[Dict[str, str]]:
+        return self._resource._match(path)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoutePattern):
+            return NotImplemented
+        return self._path == other._path
+
+    def __hash__(self) -> int:
+        return hash((RoutePattern, self._path))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._path!r})"
+
+
+def _split_route(path: str) -> Tuple[List[Optional[str]], bool]:
+    # Returns the route's edges (a static segment, or None for any non-empty segment)
+    # and whether the rest of the path is unknown
+    if not path.startswith("/"):
+        return [], True
+
+    # Custom regexes ({name:re}) may span several segments, so the route is only
+    # walked up to the segment where the first one starts
+    has_tail = False
+    depth, opening = 0, 0
+    for position, char in enumerate(path):
+        if char == "{":
+            if depth == 0:
+                opening = position
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif (char == ":") and (depth > 0):
+            path = path[:path.rfind("/", 0, opening)]
+            has_tail = True
+            break
+
+    edges: List[Optional[str]] = []
+    for segment in path.split("/"):
+        is_static = ("{" not in segment) and ("}" not in segment)
+        if is_static and _PLAIN_SEGMENT.fullmatch(segment):
+            edges.append(segment)
+        else:
+            edges.append(None)
+    return edges, has_tail
+
+
+class _Node:
+    __slots__ = ("static", "param", "routes", "tails")
+
+    def __init__(self) -> None:
+        self.static: Dict[str, _Node] = {}
+        self.param: Optional[_Node] = None
+        self.routes: Set[RoutePattern] = set()
+        self.tails: Set[RoutePattern] = set()
+
+    def is_empty(self) -> bool:
+        return not (self.static or self.param or self.routes or self.tails)
+
+
+class RouteTree:
+    """
+    A radix tree of route patterns split by "/": static segments are exact-match
+    edges, `{name}` segments are parameter edges.
+
+    A single walk finds the routes whose structure fits the path; those are then
+    confirmed by their own regex, which also extracts the segments.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, route: RoutePattern) -> None:
+        edges, has_tail = _split_route(route.path)
+        node = self._root
+        for edge in edges:
+            if edge is None:
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.static.setdefault(edge, _Node())
+
+        routes = node.tails if has_tail else node.routes
+        if route not in routes:
+            routes.add(route)
+            self._size += 1
+
+    def remove(self, route: RoutePattern) -> None:
+        edges, has_tail = _split_route(route.path)
+        path = [self._root]
+        for edge in edges:
+            node = path[-1].param if (edge is None) else path[-1].static.get(edge)
+            if node is None:
+                return
+            path.append(node)
+
+        routes = path[-1].tails if has_tail else path[-1].routes
+        if route not in routes:
+            return
+        routes.discard(route)
+        self._size -= 1
+
+        # Prune the branch that is left empty
+        for depth in range(len(edges), 0, -1):
+            if not path[depth].is_empty():
+                break
+            edge = edges[depth - 1]
+            if edge is None:
+                path[depth - 1].param = None
+            else:
+                del path[depth - 1].static[edge]
+
+    def match(self, path: str) -> Dict[RoutePattern, Dict[str, str]]:
+        segments = path.split("/")
+        found: List[RoutePattern] = []
+
+        stack = [(self._root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            found.extend(node.tails)
+            if depth == len(segments):
+                found.extend(node.routes)
+                continue
+            segment = segments[depth]
+            child = node.static.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1))
+            if (node.param is not None) and segment:
+                stack.append((node.param, depth + 1))
+
+        matched: Dict[RoutePattern, Dict[str, str]] = {}
+        for route in found:
+            route_segments = route.match(path)
+            if route_segments is not None:
+                matched[route] = route_segments
+        return matched
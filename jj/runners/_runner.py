@@ -1,7 +1,7 @@
 from asyncio import AbstractEventLoop
 from collections import OrderedDict
 from functools import partial
-from typing import Any, Iterator, List
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
 
 from aiohttp.http_writer import HttpVersion11
 from aiohttp.web import BaseRunner
@@ -9,6 +9,7 @@ from aiohttp.web import Server as WebServer
 from aiohttp.web_exceptions import HTTPExpectationFailed
 
 from ..apps import AbstractApp
+from ..handlers import HandlerFunction
 from ..middlewares import RootMiddleware
 from ..requests import Request
 from ..resolvers import Resolver
@@ -17,6 +18,9 @@ from ..responses import Response
 __all__ = ("AppRunner",)
 
 
+HandlerChain = Callable[[Request], Awaitable[Response]]
+
+
 class AppRunner(BaseRunner):
     def __init__(self, app: AbstractApp,
                  resolver: Resolver,
@@ -31,6 +35,10 @@ class AppRunner(BaseRunner):
         self._middlewares = middlewares
         self._loop = loop
         self._client_max_size = client_max_size
+        # Handlers wrapped in their middlewares, valid for a single registry version
+        self._chains: Dict[HandlerFunction, HandlerChain] = {}
+        self._chains_resolver: Optional[Resolver] = None
+        self._chains_version = -1
 
     def _merge_middlewares(self, root_middlewares: List[Any],
                            app_middlewares: List[Any],
@@ -65,6 +73,22 @@ class AppRunner(BaseRunner):
             resolver = self._resolver
 
         handler = await resolver.resolve(request, self._app)
+        chain = self._get_chain(resolver, handler)
+        return await chain(request)
+
+    def _get_chain(self, resolver: Resolver, handler: HandlerFunction) -> HandlerChain:
+        # Middlewares are registered as attributes, so any change bumps the version
+        if (resolver is not self._chains_resolver) or (resolver.version != self._chains_version):
+            self._chains.clear()
+            self._chains_resolver = resolver
+            self._chains_version = resolver.version
+
+        chain = self._chains.get(handler)
+        if chain is None:
+            chain = self._chains[handler] = self._build_chain(resolver, handler)
+        return chain
+
+    def _build_chain(self, resolver: Resolver, handler: HandlerFunction) -> HandlerChain:
         unwrapped = resolver.unwrap(handler)
 
         root_middlewares = [middleware(handler) for middleware in self._middlewares]
@@ -73,11 +97,10 @@ class AppRunner(BaseRunner):
 
         middlewares = self._merge_middlewares(root_middlewares,
                                               app_middlewares, handler_middlewares)
+        chain: Any = handler
         for middleware in middlewares:
-            handler = partial(middleware, handler=handler, app=self._app)
-
-        response = await handler(request)
-        return response  # type: ignore
+            chain = partial(middleware, handler=chain, app=self._app)
+        return chain  # type: ignore
 
     def _make_request(self, *args: Any, **kwargs: Any) -> Request:
         return Request(*args, client_max_size=self._client_max_size, loop=self._loop, **kwargs)
@@ -1,7 +1,9 @@
+import asyncio
+
 import pytest
 
 import jj
-from jj.expiration_policy import ExpireAfterRequests, ExpireNever
+from jj.expiration_policy import ExpireAfterRequests, ExpireAfterSeconds, ExpireNever
 from jj.middlewares import SelfMiddleware
 from jj.mock import Mock, RemoteMock
 
@@ -108,3 +110,70 @@ async def test_expire_after_request_without_request_and_deregister():
 
         response_body = await response.read()
         assert response_body == b""
+
+
+@pytest.mark.asyncio
+async def test_expire_after_requests_prunes_handler():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+    policy = ExpireAfterRequests(1)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response, expiration_policy=policy)
+        await handler.register()
+
+        response = await client.get("/")
+        assert response.status == 200
+
+        assert mock._resolver.get_handlers(mock._app.__class__) == []
+
+        history = await handler.fetch_history()
+        assert len(history) == 1
+
+
+@pytest.mark.asyncio
+async def test_expire_after_requests_deregister_pruned_handler():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+    policy = ExpireAfterRequests(1)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response, expiration_policy=policy)
+        await handler.register()
+        await client.get("/")
+
+        await handler.deregister()
+
+        assert mock._expired_handlers == {}
+        history = await handler.fetch_history()
+        assert len(history) == 0
+
+
+@pytest.mark.asyncio
+async def test_expire_after_seconds():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+    policy = ExpireAfterSeconds(0.05)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response, expiration_policy=policy)
+        await handler.register()
+
+        response = await client.get("/")
+        assert response.status == 200
+
+        await asyncio.sleep(0.1)
+
+        assert mock._resolver.get_handlers(mock._app.__class__) == []
+
+        excess_response = await client.get("/")
+        assert excess_response.status == 404
+
+        history = await handler.fetch_history()
+        assert len(history) == 1
@@ -1,4 +1,6 @@
-from jj.expiration_policy import ExpireAfterRequests, ExpireNever
+from datetime import datetime, timezone
+
+from jj.expiration_policy import ExpireAfterRequests, ExpireAfterSeconds, ExpireAt, ExpireNever
 
 from .._test_utils.steps import given, then, when
 
@@ -25,3 +27,30 @@ def test_pack_expire_after_requests():
         assert actual == {
             "max_requests_count": 2,
         }
+
+
+def test_pack_expire_after_seconds():
+    with given:
+        expiration_policy = ExpireAfterSeconds(1.5)
+
+    with when:
+        actual = expiration_policy.__packed__()
+
+    with then:
+        assert actual == {
+            "seconds": 1.5,
+        }
+
+
+def test_pack_expire_at():
+    with given:
+        expires_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        expiration_policy = ExpireAt(expires_at)
+
+    with when:
+        actual = expiration_policy.__packed__()
+
+    with then:
+        assert actual == {
+            "expires_at": expires_at,
+        }
@@ -1,4 +1,6 @@
-from jj.expiration_policy import ExpireAfterRequests, ExpireNever
+from datetime import datetime, timezone
+
+from jj.expiration_policy import ExpireAfterRequests, ExpireAfterSeconds, ExpireAt, ExpireNever
 
 from .._test_utils.steps import given, then, when
 
@@ -25,3 +27,29 @@ def test_unpack_expire_after_requests():
 
     with then:
         assert expiration_policy.__packed__() == packed
+
+
+def test_unpack_expire_after_seconds():
+    with given:
+        packed = {
+            "seconds": 1.5
+        }
+
+    with when:
+        expiration_policy = ExpireAfterSeconds.__unpacked__(**packed)
+
+    with then:
+        assert expiration_policy.__packed__() == packed
+
+
+def test_unpack_expire_at():
+    with given:
+        packed = {
+            "expires_at": datetime(2030, 1, 1, tzinfo=timezone.utc)
+        }
+
+    with when:
+        expiration_policy = ExpireAt.__unpacked__(**packed)
+
+    with then:
+        assert expiration_policy.__packed__() == packed
@@ -51,3 +51,29 @@ async def test_max_requests_count_property():
 
     with then:
         assert max_requests_count == 1
+
+
+@pytest.mark.asyncio
+async def test_not_permanently_expired_after_requests():
+    with given:
+        expiration_policy = ExpireAfterRequests(2)
+        await expiration_policy.is_expired(None)
+
+    with when:
+        is_permanently_expired = expiration_policy.is_permanently_expired()
+
+    with then:
+        assert not is_permanently_expired
+
+
+@pytest.mark.asyncio
+async def test_permanently_expired_after_requests():
+    with given:
+        expiration_policy = ExpireAfterRequests(1)
+        await expiration_policy.is_expired(None)
+
+    with when:
+        is_permanently_expired = expiration_policy.is_permanently_expired()
+
+    with then:
+        assert is_permanently_expired
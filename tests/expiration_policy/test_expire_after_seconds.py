@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+from pytest import raises
+
+from jj.expiration_policy import ExpireAfterSeconds
+
+from .._test_utils.steps import given, then, when
+
+MONOTONIC = "jj.expiration_policy._expire_after_seconds.monotonic"
+
+
+@pytest.mark.asyncio
+async def test_not_expired_after_seconds():
+    with given, patch(MONOTONIC, return_value=100.0):
+        expiration_policy = ExpireAfterSeconds(10)
+
+    with when, patch(MONOTONIC, return_value=109.0):
+        is_expired = await expiration_policy.is_expired(None)
+
+    with then:
+        assert not is_expired
+
+
+@pytest.mark.asyncio
+async def test_expired_after_seconds():
+    with given, patch(MONOTONIC, return_value=100.0):
+        expiration_policy = ExpireAfterSeconds(10)
+
+    with when, patch(MONOTONIC, return_value=110.0):
+        is_expired = await expiration_policy.is_expired(None)
+
+    with then:
+        assert is_expired
+
+
+@pytest.mark.parametrize(("now", "expected"), [
+    (109.0, False),
+    (110.0, True),
+])
+def test_permanently_expired_after_seconds(now: float, expected: bool):
+    with given, patch(MONOTONIC, return_value=100.0):
+        expiration_policy = ExpireAfterSeconds(10)
+
+    with when, patch(MONOTONIC, return_value=now):
+        is_permanently_expired = expiration_policy.is_permanently_expired()
+
+    with then:
+        assert is_permanently_expired is expected
+
+
+def test_deadline_after_seconds():
+    with given, patch(MONOTONIC, return_value=100.0):
+        expiration_policy = ExpireAfterSeconds(10)
+
+    with when:
+        deadline = expiration_policy.get_deadline()
+
+    with then:
+        assert deadline == 110.0
+
+
+@pytest.mark.parametrize("seconds", [0, -1])
+def test_expired_after_seconds_with_invalid_seconds(seconds: float):
+    with when:
+        with raises(Exception) as exception:
+            ExpireAfterSeconds(seconds)
+
+    with then:
+        assert exception.type is AssertionError
+
+
+def test_seconds_property():
+    with given:
+        expiration_policy = ExpireAfterSeconds(1.5)
+
+    with when:
+        seconds = expiration_policy.seconds
+
+    with then:
+        assert seconds == 1.5
+
+
+def test_repr():
+    with given:
+        expiration_policy = ExpireAfterSeconds(1.5)
+
+    with when:
+        representation = repr(expiration_policy)
+
+    with then:
+        assert representation == "ExpireAfterSeconds(1.5)"
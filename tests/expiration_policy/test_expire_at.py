@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from jj.expiration_policy import ExpireAt
+
+from .._test_utils.steps import given, then, when
+
+TIME = "jj.expiration_policy._expire_at.time"
+MONOTONIC = "jj.expiration_policy._expire_at.monotonic"
+EXPIRES_AT = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("delta", "expected"), [
+    (-1.0, False),
+    (0.0, True),
+])
+async def test_expired_at(delta: float, expected: bool):
+    with given:
+        expiration_policy = ExpireAt(EXPIRES_AT)
+
+    with when, patch(TIME, return_value=EXPIRES_AT.timestamp() + delta):
+        is_expired = await expiration_policy.is_expired(None)
+
+    with then:
+        assert is_expired is expected
+
+
+@pytest.mark.parametrize(("delta", "expected"), [
+    (-1.0, False),
+    (0.0, True),
+])
+def test_permanently_expired_at(delta: float, expected: bool):
+    with given:
+        expiration_policy = ExpireAt(EXPIRES_AT)
+
+    with when, patch(TIME, return_value=EXPIRES_AT.timestamp() + delta):
+        is_permanently_expired = expiration_policy.is_permanently_expired()
+
+    with then:
+        assert is_permanently_expired is expected
+
+
+@pytest.mark.parametrize("expires_at", [EXPIRES_AT, datetime(2030, 1, 1)])
+def test_deadline_at(expires_at: datetime):
+    with given:
+        expiration_policy = ExpireAt(expires_at)
+
+    with when, patch(TIME, return_value=EXPIRES_AT.timestamp() - 10.0):
+        with patch(MONOTONIC, return_value=100.0):
+            deadline = expiration_policy.get_deadline()
+
+    with then:
+        assert deadline == 110.0
+
+
+def test_expires_at_property():
+    with given:
+        expiration_policy = ExpireAt(EXPIRES_AT)
+
+    with when:
+        expires_at = expiration_policy.expires_at
+
+    with then:
+        assert expires_at == EXPIRES_AT
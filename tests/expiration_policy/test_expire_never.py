@@ -16,3 +16,16 @@ async def test_expired_never():
 
     with then:
         assert not is_expired
+
+
+@pytest.mark.asyncio
+async def test_never_permanently_expired():
+    with given:
+        expiration_policy = ExpireNever()
+        await expiration_policy.is_expired(None)
+
+    with when:
+        is_permanently_expired = expiration_policy.is_permanently_expired()
+
+    with then:
+        assert not is_permanently_expired
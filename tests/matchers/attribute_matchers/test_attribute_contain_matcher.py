@@ -3,6 +3,7 @@ from unittest.mock import Mock, call, sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, ContainMatcher, NotContainMatcher
+from jj.resolvers import MatcherCompiler
 
 from ..._test_utils.steps import given, then, when
 
@@ -139,3 +140,21 @@ def test_expected_property(matcher_class):
 
     with then:
         assert actual == substr
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (ContainMatcher("1"), ["1", "2"], True),
+    (ContainMatcher("1"), ["2"], False),
+    (NotContainMatcher("1"), ["1", "2"], False),
+    (NotContainMatcher("1"), ["2"], True),
+])
+def test_compile(matcher, actual, res):
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(actual)
+
+    with then:
+        assert bool(actual) is res
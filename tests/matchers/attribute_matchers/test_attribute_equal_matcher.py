@@ -3,6 +3,7 @@ from unittest.mock import Mock, call, sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, EqualMatcher, NotEqualMatcher
+from jj.resolvers import MatcherCompiler
 
 from ..._test_utils.steps import given, then, when
 
@@ -137,3 +138,102 @@ def test_expected_property(matcher_class):
 
     with then:
         assert actual is expected
+
+
+@pytest.mark.parametrize(("matcher", "literals"), [
+    (EqualMatcher("smth"), frozenset({"smth"})),
+    (EqualMatcher(42), None),
+    (EqualMatcher(["smth"]), None),
+    (NotEqualMatcher("smth"), None),
+])
+def test_get_literals(matcher, literals):
+    with when:
+        actual = matcher.get_literals()
+
+    with then:
+        assert actual == literals
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (EqualMatcher("1"), "1", True),
+    (EqualMatcher("1"), "2", False),
+    (NotEqualMatcher("1"), "1", False),
+    (NotEqualMatcher("1"), "2", True),
+])
+def test_match_sync(matcher, actual, res):
+    with given:
+        assert matcher.is_sync() is True
+
+    with when:
+        actual = matcher.match_sync(actual)
+
+    with then:
+        assert actual is res
+
+
+def test_is_sync_with_overridden_match():
+    with given:
+        class AsyncEqualMatcher(EqualMatcher):
+            async def match(self, actual):
+                return True
+
+        matcher = AsyncEqualMatcher("smth")
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is False
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (EqualMatcher("1"), "1", True),
+    (EqualMatcher("1"), "2", False),
+    (EqualMatcher(["1"]), ["1"], True),
+    (NotEqualMatcher("1"), "1", False),
+    (NotEqualMatcher("1"), "2", True),
+])
+def test_compile(matcher, actual, res):
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(actual)
+
+    with then:
+        assert bool(actual) is res
+
+
+@pytest.mark.asyncio
+async def test_compile_with_overridden_match():
+    with given:
+        class AsyncEqualMatcher(EqualMatcher):
+            async def match(self, actual):
+                return actual == "smth"
+
+        compiler = MatcherCompiler()
+        compiled = compiler.build([AsyncEqualMatcher("1").compile(compiler, "request")])
+
+    with when:
+        actual = await compiled.function("smth")
+
+    with then:
+        assert compiled.is_async is True
+        assert actual is True
+
+
+@pytest.mark.parametrize(("matcher1", "matcher2", "res"), [
+    (EqualMatcher("1"), EqualMatcher("1"), True),
+    (EqualMatcher(["1"]), EqualMatcher(["1"]), True),
+    (EqualMatcher("1"), EqualMatcher("2"), False),
+    (EqualMatcher("1"), EqualMatcher(1), False),
+    (EqualMatcher("1"), NotEqualMatcher("1"), False),
+])
+def test_structural_equality(matcher1, matcher2, res):
+    with when:
+        actual = matcher1 == matcher2
+
+    with then:
+        assert actual is res
+        assert (hash(matcher1) == hash(matcher2)) is res
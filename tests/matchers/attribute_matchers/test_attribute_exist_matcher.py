@@ -3,6 +3,7 @@ from unittest.mock import sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, ExistMatcher, NotExistMatcher
+from jj.resolvers import MatcherCompiler
 
 from ..._test_utils.steps import given, then, when
 
@@ -82,3 +83,19 @@ async def test_not_exist_matcher(value):
 
     with then:
         assert actual is False
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (ExistMatcher(), sentinel.value, True),
+    (NotExistMatcher(), sentinel.value, False),
+])
+def test_compile(matcher, actual, res):
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(actual)
+
+    with then:
+        assert bool(actual) is res
@@ -3,7 +3,16 @@ from unittest.mock import sentinel
 import pytest
 from pytest import raises
 
-from jj.matchers import AttributeMatcher
+from jj.matchers import (
+    AttributeMatcher,
+    ContainMatcher,
+    EqualMatcher,
+    ExistMatcher,
+    NotContainMatcher,
+    NotEqualMatcher,
+    NotExistMatcher,
+    RegexMatcher,
+)
 
 from ..._test_utils.steps import given, then, when
 
@@ -29,3 +38,117 @@ def test_repr():
 
     with then:
         assert actual == "AttributeMatcher()"
+
+
+def test_abstract_match_sync_method_raises_exception():
+    with given:
+        matcher = AttributeMatcher()
+
+    with when, raises(Exception) as exception:
+        matcher.match_sync(sentinel.value)
+
+    with then:
+        assert exception.type is NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_match_delegates_to_match_sync():
+    with given:
+        class SyncMatcher(AttributeMatcher):
+            def match_sync(self, actual):
+                return actual is sentinel.value
+
+        matcher = SyncMatcher()
+
+    with when:
+        actual = await matcher.match(sentinel.value)
+
+    with then:
+        assert actual is True
+
+
+def test_is_sync_with_match_sync():
+    with given:
+        class SyncMatcher(AttributeMatcher):
+            def match_sync(self, actual):
+                return True
+
+        matcher = SyncMatcher()
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is True
+
+
+def test_is_sync_without_match_sync():
+    with given:
+        matcher = AttributeMatcher()
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is False
+
+
+def test_is_sync_with_overridden_match():
+    with given:
+        class AsyncMatcher(AttributeMatcher):
+            async def match(self, actual):
+                return True
+
+            def match_sync(self, actual):
+                return True
+
+        matcher = AsyncMatcher()
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is False
+
+
+def test_is_pure_without_match_sync():
+    with given:
+        matcher = AttributeMatcher()
+
+    with when:
+        actual = matcher.is_pure()
+
+    with then:
+        assert actual is False
+
+
+def test_is_pure_with_custom_matcher():
+    with given:
+        class CustomMatcher(AttributeMatcher):
+            def match_sync(self, actual):
+                return True
+
+        matcher = CustomMatcher()
+
+    with when:
+        actual = matcher.is_pure()
+
+    with then:
+        assert actual is False
+
+
+@pytest.mark.parametrize("matcher", [
+    EqualMatcher("1"),
+    NotEqualMatcher("1"),
+    ContainMatcher("1"),
+    NotContainMatcher("1"),
+    ExistMatcher(),
+    NotExistMatcher(),
+    RegexMatcher("^1"),
+])
+def test_is_pure_with_builtin_matcher(matcher):
+    with when:
+        actual = matcher.is_pure()
+
+    with then:
+        assert actual is True
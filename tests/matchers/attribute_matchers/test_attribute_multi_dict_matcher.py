@@ -2,9 +2,18 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 
 import pytest
 from multidict import MultiDict
-
-from jj.matchers import AttributeMatcher, NotExistMatcher
+from pytest import raises
+
+from jj.matchers import (
+    AttributeMatcher,
+    EqualMatcher,
+    ExistMatcher,
+    NotEqualMatcher,
+    NotExistMatcher,
+    RegexMatcher,
+)
 from jj.matchers.attribute_matchers import MultiDictMatcher
+from jj.resolvers import MatcherCompiler, RegexPattern
 
 from ..._test_utils.steps import given, then, when
 
@@ -52,7 +61,7 @@ async def test_multi_dict_matcher_with_value_submatchers_superset():
 
     with then:
         assert actual is False
-        assert submatcher1_.mock_calls == [call.match("1.1")]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match("1.1")]
         assert submatcher2_.mock_calls == []
 
 
@@ -76,8 +85,8 @@ async def test_multi_dict_matcher_with_value_submatchers_subset():
 
     with then:
         assert actual is True
-        assert submatcher1_.mock_calls == [call.match("1")]
-        assert submatcher2_.mock_calls == [call.match("2.1"), call.match("2.2")]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match("1")]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match("2.1"), call.match("2.2")]
 
 
 @pytest.mark.asyncio
@@ -199,3 +208,113 @@ def test_expected_property():
 
     with then:
         assert actual == MultiDict(expected)
+
+
+def test_get_key_literals():
+    with given:
+        matcher = MultiDictMatcher([
+            ("key1", RegexMatcher("^1")),
+            ("key2", "2"),
+            ("key3", NotExistMatcher()),
+            ("key2", EqualMatcher("3")),
+            ("key4", NotEqualMatcher("4")),
+        ])
+
+    with when:
+        actual = matcher.get_key_literals()
+
+    with then:
+        assert actual == [("key2", frozenset({"2"})), ("key2", frozenset({"3"}))]
+
+
+def test_get_regexes():
+    with given:
+        matcher = MultiDictMatcher([
+            ("key1", RegexMatcher("^1")),
+            ("key2", "2"),
+            ("key1", RegexMatcher("1$")),
+            ("key3", NotExistMatcher()),
+        ])
+
+    with when:
+        actual = matcher.get_regexes()
+
+    with then:
+        assert actual == [("key1", RegexPattern("^1")), ("key1", RegexPattern("1$"))]
+
+
+@pytest.mark.parametrize(("expected", "actual", "res"), [
+    ({}, {}, True),
+    ({"key": "1"}, [("key", "2"), ("key", "1")], True),
+    ({"key": "1"}, [("key", "2")], False),
+    ({"key": RegexMatcher("^[0-9]+$")}, {"key": "1"}, True),
+    ({"key": RegexMatcher("^[0-9]+$")}, {"key": "a"}, False),
+    ({"key": RegexMatcher("^[0-9]+$")}, {}, False),
+    ({"key": ExistMatcher()}, {"key": ""}, True),
+    ({"key": ExistMatcher()}, {}, False),
+    ({"key": NotExistMatcher()}, {"key": "1"}, False),
+    ({"key": NotExistMatcher()}, {}, True),
+])
+def test_compile(expected, actual, res):
+    with given:
+        matcher = MultiDictMatcher(expected)
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(MultiDict(actual))
+
+    with then:
+        assert bool(actual) is res
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("ret_val", "res"), [
+    (True, True),
+    (False, False),
+])
+async def test_compile_with_async_submatcher(ret_val, res):
+    with given:
+        submatcher_ = Mock(AttributeMatcher, match=AsyncMock(return_value=ret_val),
+                           get_literals=Mock(return_value=None),
+                           is_sync=Mock(return_value=False))
+        matcher = MultiDictMatcher({"key": submatcher_})
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = await compiled.function(MultiDict({"key": "1"}))
+
+    with then:
+        assert compiled.is_async is True
+        assert bool(actual) is res
+        submatcher_.match.assert_awaited_once_with("1")
+
+
+def test_compile_with_non_multi_mapping():
+    with given:
+        matcher = MultiDictMatcher({})
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when, raises(Exception) as exception:
+        compiled.function({})
+
+    with then:
+        assert exception.type is TypeError
+
+
+@pytest.mark.parametrize(("expected", "res"), [
+    ({"key": "1"}, True),
+    ({"key": RegexMatcher("^1"), "key2": NotExistMatcher()}, True),
+    ({"key": Mock(AttributeMatcher, is_pure=Mock(return_value=False))}, False),
+])
+def test_is_pure(expected, res):
+    with given:
+        matcher = MultiDictMatcher(expected)
+
+    with when:
+        actual = matcher.is_pure()
+
+    with then:
+        assert actual is res
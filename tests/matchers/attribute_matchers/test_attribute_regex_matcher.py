@@ -4,6 +4,7 @@ from unittest.mock import sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, RegexMatcher
+from jj.resolvers import MatcherCompiler, RegexPattern
 
 from ..._test_utils.steps import given, then, when
 
@@ -107,3 +108,46 @@ def test_pattern_property():
     with then:
         assert actual_pattern == pattern
         assert actual_flags == flags
+
+
+def test_get_regex():
+    with given:
+        matcher = RegexMatcher("^/users", re.IGNORECASE)
+
+    with when:
+        actual = matcher.get_regex()
+
+    with then:
+        assert actual == RegexPattern("^/users", re.IGNORECASE)
+
+
+def test_get_regex_with_custom_match():
+    with given:
+        class CustomRegexMatcher(RegexMatcher):
+            async def match(self, actual):
+                return True
+
+        matcher = CustomRegexMatcher("^/users")
+
+    with when:
+        actual = matcher.get_regex()
+
+    with then:
+        assert actual is None
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (RegexMatcher("^/users/[0-9]+$"), "/users/1", True),
+    (RegexMatcher("^/users/[0-9]+$"), "/users/me", False),
+    (RegexMatcher("^/USERS", re.IGNORECASE), "/users", True),
+])
+def test_compile(matcher, actual, res):
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(actual)
+
+    with then:
+        assert bool(actual) is res
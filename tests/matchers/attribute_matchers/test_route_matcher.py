@@ -1,7 +1,10 @@
 from unittest.mock import sentinel
 
+import pytest
+
 from jj.matchers import AttributeMatcher
 from jj.matchers.attribute_matchers import RouteMatcher
+from jj.resolvers import MatcherCompiler, RoutePattern
 
 from ..._test_utils.steps import given, then, when
 
@@ -64,3 +67,94 @@ def test_path_property():
 
     with then:
         assert actual == path
+
+
+@pytest.mark.parametrize(("path", "literals"), [
+    ("/", frozenset({"/"})),
+    ("/users", frozenset({"/users"})),
+    ("/users/{id}", None),
+    ("/{tail:.*}", None),
+    ("/users list", None),
+])
+def test_get_literals(path, literals):
+    with given:
+        matcher = RouteMatcher(path)
+
+    with when:
+        actual = matcher.get_literals()
+
+    with then:
+        assert actual == literals
+
+
+def test_get_route():
+    with given:
+        matcher = RouteMatcher("/users/{id}")
+
+    with when:
+        actual = matcher.get_route()
+
+    with then:
+        assert actual == RoutePattern("/users/{id}")
+
+
+def test_get_route_with_custom_match():
+    with given:
+        class CustomRouteMatcher(RouteMatcher):
+            async def match(self, path):
+                return True
+
+        matcher = CustomRouteMatcher("/users/{id}")
+
+    with when:
+        actual = matcher.get_route()
+
+    with then:
+        assert actual is None
+
+
+@pytest.mark.parametrize(("matcher", "actual", "res"), [
+    (RouteMatcher("/users/{id}"), "/users/1", True),
+    (RouteMatcher("/users/{id}"), "/users", False),
+    (RouteMatcher("/users"), "/users", True),
+])
+def test_compile(matcher, actual, res):
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler, "request")])
+
+    with when:
+        actual = compiled.function(actual)
+
+    with then:
+        assert bool(actual) is res
+
+
+@pytest.mark.parametrize(("path", "res"), [
+    ("/users/1", {"id": "1"}),
+    ("/users", None),
+])
+def test_match_segments(path, res):
+    with given:
+        matcher = RouteMatcher("/users/{id}")
+
+    with when:
+        actual = matcher.match_segments(path)
+
+    with then:
+        assert actual == res
+
+
+@pytest.mark.parametrize(("path", "res"), [
+    ("/users/1", {"id": "1"}),
+    ("/users", {}),
+])
+def test_get_segments(path, res):
+    with given:
+        matcher = RouteMatcher("/users/{id}")
+
+    with when:
+        actual = matcher.get_segments(path)
+
+    with then:
+        assert actual == res
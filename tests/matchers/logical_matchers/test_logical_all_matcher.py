@@ -3,7 +3,8 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 from pytest import raises
 
-from jj.matchers import AllMatcher, LogicalMatcher, ResolvableMatcher
+from jj.matchers import AllMatcher, HeaderMatcher, LogicalMatcher, MethodMatcher, ResolvableMatcher
+from jj.resolvers import DispatchKeys, FingerprintFields, MatcherCompiler
 
 from ..._test_utils.fixtures import request_, resolver_
 from ..._test_utils.steps import given, then, when
@@ -26,7 +27,7 @@ async def test_single_submatcher(ret_val, res, *, resolver_, request_):
 
     with then:
         assert actual is res
-        assert submatcher_.mock_calls == [call.match(request_)]
+        assert submatcher_.mock_calls == [call.is_sync(), call.match(request_)]
 
 
 @pytest.mark.asyncio
@@ -45,8 +46,8 @@ async def test_multiple_truthy_submatchers(ret_val1, ret_val2, res, *, resolver_
 
     with then:
         assert actual is res
-        assert submatcher1_.mock_calls == [call.match(request_)]
-        assert submatcher2_.mock_calls == [call.match(request_)]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match(request_)]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match(request_)]
 
 
 @pytest.mark.asyncio
@@ -65,7 +66,7 @@ async def test_multiple_false_submatchers(ret_val1, ret_val2, res, *, resolver_,
 
     with then:
         assert actual is res
-        assert submatcher1_.mock_calls == [call.match(request_)]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match(request_)]
         assert submatcher2_.mock_calls == []
 
 
@@ -142,3 +143,361 @@ def test_sub_matchers_property(*, resolver_):
 
     with then:
         assert actual == sub_matchers
+
+
+def test_get_dispatch_keys(*, resolver_):
+    with given:
+        keys1 = DispatchKeys({"method": frozenset({"GET"}), "path": frozenset({"/users"})})
+        keys2 = DispatchKeys({"method": frozenset({"GET", "POST"})})
+        submatcher1_ = Mock(ResolvableMatcher, get_dispatch_keys=Mock(return_value=keys1))
+        submatcher2_ = Mock(ResolvableMatcher, get_dispatch_keys=Mock(return_value=keys2))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == keys1
+
+
+@pytest.mark.asyncio
+async def test_sync_submatchers_are_not_awaited(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                            match_sync=Mock(return_value=True))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=False),
+                            match=AsyncMock(return_value=True))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.match(request_)
+
+    with then:
+        assert actual is True
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match_sync(request_)]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match(request_)]
+
+
+@pytest.mark.parametrize(("is_sync1", "is_sync2", "res"), [
+    (True, True, True),
+    (True, False, False),
+    (False, True, False),
+])
+def test_is_sync(is_sync1, is_sync2, res, *, resolver_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=is_sync1))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=is_sync2))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("ret_val1", "ret_val2", "res"), [
+    (True, True, True),
+    (True, False, False),
+    (False, True, False),
+])
+def test_match_sync(ret_val1, ret_val2, res, *, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=ret_val1))
+        submatcher2_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=ret_val2))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.match_sync(request_)
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("ret_val1", "ret_val2", "res"), [
+    (True, True, True),
+    (True, False, False),
+    (False, True, False),
+])
+def test_compile(ret_val1, ret_val2, res, *, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, compile=Mock(return_value=repr(ret_val1)))
+        submatcher2_ = Mock(ResolvableMatcher, compile=Mock(return_value=repr(ret_val2)))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+        compiler = MatcherCompiler()
+
+    with when:
+        compiled = compiler.build([matcher.compile(compiler)])
+
+    with then:
+        assert compiled.function(request_) is res
+        submatcher1_.compile.assert_called_once_with(compiler)
+        submatcher2_.compile.assert_called_once_with(compiler)
+
+
+@pytest.mark.asyncio
+async def test_reorder_evaluates_selective_submatcher_first(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=False),
+                            match=AsyncMock(return_value=True))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=False),
+                            match=AsyncMock(return_value=False))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_, reorder=True)
+        matcher.reorder_interval = 2
+
+    with when:
+        results = [await matcher.match(request_) for _ in range(4)]
+
+    with then:
+        assert results == [False, False, False, False]
+        assert matcher.evaluation_order == [submatcher2_, submatcher1_]
+        assert matcher.sub_matchers == [submatcher1_, submatcher2_]
+        assert submatcher1_.match.await_count == 1
+        assert submatcher2_.match.await_count == 4
+
+
+def test_reorder_sync_evaluates_selective_submatcher_first(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=True))
+        submatcher2_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=True))
+        submatcher3_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=False))
+        matcher = AllMatcher([submatcher1_, submatcher2_, submatcher3_],
+                             resolver=resolver_, reorder=True)
+        matcher.reorder_interval = 2
+
+    with when:
+        results = [matcher.match_sync(request_) for _ in range(3)]
+
+    with then:
+        assert results == [False, False, False]
+        assert matcher.evaluation_order == [submatcher3_, submatcher1_, submatcher2_]
+
+
+def test_evaluation_order_without_reorder(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=True))
+        submatcher2_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=False))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+        matcher.reorder_interval = 1
+
+    with when:
+        for _ in range(3):
+            matcher.match_sync(request_)
+
+    with then:
+        assert matcher.reorder is False
+        assert matcher.evaluation_order == [submatcher1_, submatcher2_]
+
+
+def test_compile_with_reorder(*, resolver_):
+    with given:
+        submatcher_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True))
+        matcher = AllMatcher([submatcher_], resolver=resolver_, reorder=True)
+        compiler = MatcherCompiler()
+
+    with when:
+        actual = matcher.compile(compiler)
+
+    with then:
+        assert actual == "_c0.match_sync(request)"
+        submatcher_.compile.assert_not_called()
+
+
+def test_repr_with_reorder(*, resolver_):
+    with given:
+        resolver_.__repr__ = Mock(return_value="<Resolver>")
+        matcher = AllMatcher(resolver=resolver_, reorder=True, matchers=[
+            Mock(ResolvableMatcher, __repr__=Mock(return_value="<SubMatcher>")),
+        ])
+
+    with when:
+        actual = repr(matcher)
+
+    with then:
+        assert actual == "AllMatcher([<SubMatcher>], resolver=<Resolver>, reorder=True)"
+
+
+def test_pack_with_reorder(*, resolver_):
+    with given:
+        submatchers = [Mock(ResolvableMatcher)]
+        matcher = AllMatcher(submatchers, resolver=resolver_, reorder=True)
+
+    with when:
+        actual = matcher.__packed__()
+
+    with then:
+        assert actual == {"matchers": submatchers, "reorder": True}
+
+
+def test_unpack_with_reorder(*, resolver_):
+    with given:
+        submatchers = [Mock(ResolvableMatcher)]
+
+    with when:
+        actual = AllMatcher.__unpacked__(matchers=submatchers, resolver=resolver_, reorder=True)
+
+    with then:
+        assert actual.reorder is True
+
+
+def test_structural_equality(*, resolver_):
+    with given:
+        matcher1 = AllMatcher([
+            MethodMatcher("GET", resolver=resolver_),
+            HeaderMatcher({"x-tenant": "acme"}, resolver=resolver_),
+        ], resolver=resolver_)
+        matcher2 = AllMatcher([
+            MethodMatcher("GET", resolver=resolver_),
+            HeaderMatcher({"x-tenant": "acme"}, resolver=resolver_),
+        ], resolver=resolver_)
+        matcher3 = AllMatcher([
+            MethodMatcher("GET", resolver=resolver_),
+            HeaderMatcher({"x-tenant": "other"}, resolver=resolver_),
+        ], resolver=resolver_)
+
+    with when:
+        actual = matcher1 == matcher2
+
+    with then:
+        assert actual is True
+        assert hash(matcher1) == hash(matcher2)
+        assert matcher1 != matcher3
+
+
+def test_get_fingerprint_fields(*, resolver_):
+    with given:
+        fields1 = FingerprintFields({"method": None, "headers": frozenset({"x-key"})})
+        fields2 = FingerprintFields({"headers": frozenset({"x-other"})})
+        submatcher1_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields1))
+        submatcher2_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields2))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual == FingerprintFields({
+            "method": None,
+            "headers": frozenset({"x-key", "x-other"}),
+        })
+
+
+def test_get_fingerprint_fields_with_uncacheable_matcher(*, resolver_):
+    with given:
+        fields = FingerprintFields({"method": None})
+        submatcher1_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields))
+        submatcher2_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=None))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual is None
+
+
+def test_register_with_priority(*, resolver_):
+    with given:
+        matcher = AllMatcher([Mock(ResolvableMatcher)], resolver=resolver_, priority=10)
+
+    with when:
+        actual = matcher(sentinel.handler)
+
+    with then:
+        assert actual == sentinel.handler
+        assert resolver_.mock_calls == [
+            call.register_matcher(matcher.match, sentinel.handler),
+            call.register_attribute("priority", 10, sentinel.handler),
+        ]
+
+
+def test_nested_priority_raises_exception(*, resolver_):
+    with given:
+        submatcher = AllMatcher([Mock(ResolvableMatcher)], resolver=resolver_, priority=10)
+
+    with when, raises(Exception) as exception:
+        AllMatcher([submatcher], resolver=resolver_)
+
+    with then:
+        assert exception.type is AssertionError
+
+
+def test_nested_without_priority(*, resolver_):
+    with given:
+        submatcher = AllMatcher([Mock(ResolvableMatcher)], resolver=resolver_)
+
+    with when:
+        matcher = AllMatcher([submatcher], resolver=resolver_, priority=10)
+
+    with then:
+        assert matcher.priority == 10
+
+
+def test_register_without_priority(*, resolver_):
+    with given:
+        matcher = AllMatcher([Mock(ResolvableMatcher)], resolver=resolver_)
+
+    with when:
+        matcher(sentinel.handler)
+
+    with then:
+        assert resolver_.mock_calls == [
+            call.register_matcher(matcher.match, sentinel.handler),
+        ]
+
+
+def test_repr_with_priority(*, resolver_):
+    with given:
+        resolver_.__repr__ = Mock(return_value="<Resolver>")
+        matcher = AllMatcher(resolver=resolver_, priority=-1, matchers=[
+            Mock(ResolvableMatcher, __repr__=Mock(return_value="<SubMatcher>")),
+        ])
+
+    with when:
+        actual = repr(matcher)
+
+    with then:
+        assert actual == "AllMatcher([<SubMatcher>], resolver=<Resolver>, priority=-1)"
+
+
+def test_pack_with_priority(*, resolver_):
+    with given:
+        submatchers = [Mock(ResolvableMatcher)]
+        matcher = AllMatcher(submatchers, resolver=resolver_, priority=10)
+
+    with when:
+        actual = matcher.__packed__()
+
+    with then:
+        assert actual == {"matchers": submatchers, "priority": 10}
+
+
+def test_unpack_with_priority(*, resolver_):
+    with given:
+        submatchers = [Mock(ResolvableMatcher)]
+
+    with when:
+        actual = AllMatcher.__unpacked__(matchers=submatchers, resolver=resolver_, priority=10)
+
+    with then:
+        assert actual.priority == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("segments1", "segments2", "res"), [
+    (sentinel.segments1, sentinel.segments2, sentinel.segments2),
+    (None, sentinel.segments2, sentinel.segments2),
+    (sentinel.segments1, None, sentinel.segments1),
+    (None, None, None),
+])
+async def test_get_segments(segments1, segments2, res, *, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, get_segments=AsyncMock(return_value=segments1))
+        submatcher2_ = Mock(ResolvableMatcher, get_segments=AsyncMock(return_value=segments2))
+        matcher = AllMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual == res
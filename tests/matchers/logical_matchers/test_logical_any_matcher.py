@@ -3,7 +3,15 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 from pytest import raises
 
-from jj.matchers import AnyMatcher, LogicalMatcher, ResolvableMatcher
+from jj.matchers import (
+    AllMatcher,
+    AnyMatcher,
+    LogicalMatcher,
+    MethodMatcher,
+    PathMatcher,
+    ResolvableMatcher,
+)
+from jj.resolvers import DispatchKeys, FingerprintFields, MatcherCompiler
 
 from ..._test_utils.fixtures import request_, resolver_
 from ..._test_utils.steps import given, then, when
@@ -26,7 +34,7 @@ async def test_single_submatcher(ret_val, res, *, resolver_, request_):
 
     with then:
         assert actual is res
-        assert submatcher_.mock_calls == [call.match(request_)]
+        assert submatcher_.mock_calls == [call.is_sync(), call.match(request_)]
 
 
 @pytest.mark.asyncio
@@ -45,7 +53,7 @@ async def test_multiple_truthy_submatchers(ret_val1, ret_val2, res, *, resolver_
 
     with then:
         assert actual is res
-        assert submatcher1_.mock_calls == [call.match(request_)]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match(request_)]
         assert submatcher2_.mock_calls == []
 
 
@@ -65,8 +73,8 @@ async def test_multiple_false_submatchers(ret_val1, ret_val2, res, *, resolver_,
 
     with then:
         assert actual is res
-        assert submatcher1_.mock_calls == [call.match(request_)]
-        assert submatcher2_.mock_calls == [call.match(request_)]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match(request_)]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match(request_)]
 
 
 def test_empty_submatchers_raises_exception(*, resolver_):
@@ -142,3 +150,237 @@ def test_sub_matchers_property(*, resolver_):
 
     with then:
         assert actual == sub_matchers
+
+
+def test_get_dispatch_keys(*, resolver_):
+    with given:
+        keys1 = DispatchKeys({"method": frozenset({"GET"}), "path": frozenset({"/users"})})
+        keys2 = DispatchKeys({"method": frozenset({"GET", "POST"})})
+        submatcher1_ = Mock(ResolvableMatcher, get_dispatch_keys=Mock(return_value=keys1))
+        submatcher2_ = Mock(ResolvableMatcher, get_dispatch_keys=Mock(return_value=keys2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == DispatchKeys({"method": frozenset({"GET", "POST"})})
+
+
+@pytest.mark.asyncio
+async def test_sync_submatchers_are_not_awaited(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=False),
+                            match=AsyncMock(return_value=False))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                            match_sync=Mock(return_value=True))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.match(request_)
+
+    with then:
+        assert actual is True
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match(request_)]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match_sync(request_)]
+
+
+@pytest.mark.parametrize(("is_sync1", "is_sync2", "res"), [
+    (True, True, True),
+    (True, False, False),
+    (False, True, False),
+])
+def test_is_sync(is_sync1, is_sync2, res, *, resolver_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=is_sync1))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=is_sync2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("ret_val1", "ret_val2", "res"), [
+    (True, False, True),
+    (False, True, True),
+    (False, False, False),
+])
+def test_match_sync(ret_val1, ret_val2, res, *, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=ret_val1))
+        submatcher2_ = Mock(ResolvableMatcher, match_sync=Mock(return_value=ret_val2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.match_sync(request_)
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("ret_val1", "ret_val2", "res"), [
+    (True, False, True),
+    (False, True, True),
+    (False, False, False),
+])
+def test_compile(ret_val1, ret_val2, res, *, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, compile=Mock(return_value=repr(ret_val1)))
+        submatcher2_ = Mock(ResolvableMatcher, compile=Mock(return_value=repr(ret_val2)))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+        compiler = MatcherCompiler()
+
+    with when:
+        compiled = compiler.build([matcher.compile(compiler)])
+
+    with then:
+        assert compiled.function(request_) is res
+        submatcher1_.compile.assert_called_once_with(compiler)
+        submatcher2_.compile.assert_called_once_with(compiler)
+
+
+def test_get_fingerprint_fields(*, resolver_):
+    with given:
+        fields1 = FingerprintFields({"method": None, "headers": frozenset({"x-key"})})
+        fields2 = FingerprintFields({"headers": frozenset({"x-other"})})
+        submatcher1_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields1))
+        submatcher2_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual == FingerprintFields({
+            "method": None,
+            "headers": frozenset({"x-key", "x-other"}),
+        })
+
+
+def test_get_fingerprint_fields_with_uncacheable_matcher(*, resolver_):
+    with given:
+        fields = FingerprintFields({"method": None})
+        submatcher1_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=fields))
+        submatcher2_ = Mock(ResolvableMatcher, get_fingerprint_fields=Mock(return_value=None))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual is None
+
+
+def test_nested_priority_raises_exception(*, resolver_):
+    with given:
+        submatcher = AllMatcher([Mock(ResolvableMatcher)], resolver=resolver_, priority=10)
+
+    with when, raises(Exception) as exception:
+        AnyMatcher([Mock(ResolvableMatcher), submatcher], resolver=resolver_)
+
+    with then:
+        assert exception.type is AssertionError
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("matched1", "segments1", "matched2", "segments2", "res"), [
+    (True, sentinel.segments1, True, sentinel.segments2, sentinel.segments1),
+    (True, None, True, sentinel.segments2, None),
+    (False, sentinel.segments1, True, sentinel.segments2, sentinel.segments2),
+    (False, sentinel.segments1, True, None, None),
+    (False, sentinel.segments1, False, sentinel.segments2, None),
+])
+async def test_get_segments(matched1, segments1, matched2, segments2, res, *,
+                            resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                            match_sync=Mock(return_value=matched1),
+                            get_segments=AsyncMock(return_value=segments1))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                            match_sync=Mock(return_value=matched2),
+                            get_segments=AsyncMock(return_value=segments2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual == res
+
+
+@pytest.mark.asyncio
+async def test_get_segments_without_evaluating_async_matchers(*, resolver_, request_):
+    with given:
+        submatcher1_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=False),
+                            match=AsyncMock(return_value=True),
+                            get_segments=AsyncMock(return_value=sentinel.segments1))
+        submatcher2_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                            match_sync=Mock(return_value=True),
+                            get_segments=AsyncMock(return_value=sentinel.segments2))
+        matcher = AnyMatcher([submatcher1_, submatcher2_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual is None
+        submatcher1_.match.assert_not_called()
+        submatcher2_.match_sync.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_segments_with_results(*, resolver_, request_):
+    with given:
+        submatcher_ = Mock(ResolvableMatcher, is_sync=Mock(return_value=True),
+                           match_sync=Mock(return_value=True),
+                           get_segments=AsyncMock(return_value=sentinel.segments))
+        matcher = AnyMatcher([submatcher_], resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_, sentinel.results)
+
+    with then:
+        assert actual == sentinel.segments
+        submatcher_.get_segments.assert_awaited_once_with(request_, sentinel.results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("method", "path", "res"), [
+    ("GET", "/a/1", {"y": "1"}),
+    ("POST", "/a/1", {"x": "1"}),
+])
+async def test_get_segments_of_matched_branch(method, path, res, *, resolver_, request_):
+    with given:
+        matcher = AnyMatcher([
+            AllMatcher([MethodMatcher("POST", resolver=resolver_),
+                        PathMatcher("/a/{x}", resolver=resolver_)], resolver=resolver_),
+            AllMatcher([MethodMatcher("GET", resolver=resolver_),
+                        PathMatcher("/a/{y}", resolver=resolver_)], resolver=resolver_),
+        ], resolver=resolver_)
+        request_.method, request_.path = method, path
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual == res
+
+
+@pytest.mark.asyncio
+async def test_get_segments_not_from_failed_branch(*, resolver_, request_):
+    with given:
+        matcher = AnyMatcher([
+            AllMatcher([PathMatcher("/a/{x}", resolver=resolver_),
+                        MethodMatcher("GET", resolver=resolver_)], resolver=resolver_),
+            MethodMatcher("PUT", resolver=resolver_),
+        ], resolver=resolver_)
+        request_.method, request_.path = "PUT", "/a/1"
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual is None
@@ -3,8 +3,18 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 from multidict import CIMultiDict
 
-from jj.matchers import AttributeMatcher, HeaderMatcher, RequestMatcher
+from jj.matchers import (
+    AttributeMatcher,
+    ContainMatcher,
+    EqualMatcher,
+    ExistMatcher,
+    HeaderMatcher,
+    NotEqualMatcher,
+    RegexMatcher,
+    RequestMatcher,
+)
 from jj.matchers.attribute_matchers import MultiDictMatcher
+from jj.resolvers import DispatchKeys, FingerprintFields, MatcherCompiler, RegexPattern
 
 from ..._test_utils.fixtures import request_, resolver_
 from ..._test_utils.steps import given, then, when
@@ -93,7 +103,7 @@ async def test_header_matcher_with_value_submatchers_superset(request_):
 
     with then:
         assert actual is False
-        assert submatcher1_.mock_calls == [call.match("1.1")]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match("1.1")]
         assert submatcher2_.mock_calls == []
 
 
@@ -118,8 +128,8 @@ async def test_header_matcher_with_value_submatchers_subset(request_):
 
     with then:
         assert actual is True
-        assert submatcher1_.mock_calls == [call.match("1")]
-        assert submatcher2_.mock_calls == [call.match("2.1"), call.match("2.2")]
+        assert submatcher1_.mock_calls == [call.is_sync(), call.match("1")]
+        assert submatcher2_.mock_calls == [call.is_sync(), call.match("2.1"), call.match("2.2")]
 
 
 def test_is_instance_of_request_matcher(*, resolver_):
@@ -188,3 +198,77 @@ def test_sub_matcher_property(*, resolver_):
 
     with then:
         assert actual == sub_matcher
+
+
+@pytest.mark.parametrize(("headers", "keys"), [
+    ({"X-Key": "1"}, DispatchKeys({("header", "x-key"): frozenset({"1"})})),
+    ({"X-Key": EqualMatcher("1")}, DispatchKeys({("header", "x-key"): frozenset({"1"})})),
+    ({"X-Key": NotEqualMatcher("1")}, DispatchKeys()),
+    ([("X-Key", "1"), ("X-Key", RegexMatcher("^1"))], DispatchKeys({
+        ("header", "x-key"): frozenset({"1"}),
+    })),
+    ({"X-Key": RegexMatcher("^1")}, DispatchKeys({
+        ("header", "x-key"): frozenset({RegexPattern("^1")}),
+    })),
+    (AttributeMatcher(), DispatchKeys()),
+])
+def test_get_dispatch_keys(headers, keys, *, resolver_):
+    with given:
+        matcher = HeaderMatcher(headers, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == keys
+
+
+@pytest.mark.parametrize(("expected", "actual", "res"), [
+    ({"X-Key": "1"}, {"X-Key": "1"}, True),
+    ({"X-Key": "1"}, {"X-Key": "2"}, False),
+    ({"X-Key": RegexMatcher("^[0-9]+$")}, {"X-Key": "1"}, True),
+])
+def test_compile(expected, actual, res, *, resolver_, request_):
+    with given:
+        request_.headers = CIMultiDict(actual)
+        matcher = HeaderMatcher(expected, resolver=resolver_)
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler)])
+
+    with when:
+        actual = compiled.function(request_)
+
+    with then:
+        assert bool(actual) is res
+
+
+@pytest.mark.parametrize(("value", "fields"), [
+    ({"X-Key": "1", "X-Other": ExistMatcher()},
+     FingerprintFields({"headers": frozenset({"X-Key", "X-Other"})})),
+    (ContainMatcher("X-Key"), FingerprintFields({"headers": None})),
+    (AttributeMatcher(), None),
+])
+def test_get_fingerprint_fields(value, fields, *, resolver_):
+    with given:
+        matcher = HeaderMatcher(value, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual == fields
+
+
+def test_get_fingerprint_fields_with_custom_matcher(*, resolver_):
+    with given:
+        class CustomHeaderMatcher(HeaderMatcher):
+            async def match(self, request):
+                return True
+
+        matcher = CustomHeaderMatcher({"X-Key": "1"}, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual is None
@@ -3,7 +3,8 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, MethodMatcher, RequestMatcher
-from jj.matchers.attribute_matchers import EqualMatcher
+from jj.matchers.attribute_matchers import EqualMatcher, NotEqualMatcher
+from jj.resolvers import DispatchKeys, FingerprintFields, MatcherCompiler
 
 from ..._test_utils.fixtures import request_, resolver_
 from ..._test_utils.steps import given, then, when
@@ -122,3 +123,103 @@ def test_sub_matcher_property(*, resolver_):
 
     with then:
         assert actual == sub_matcher
+
+
+@pytest.mark.parametrize(("method", "keys"), [
+    ("*", DispatchKeys()),
+    ("get", DispatchKeys({"method": frozenset({"GET"})})),
+    (EqualMatcher("POST"), DispatchKeys({"method": frozenset({"POST"})})),
+    (NotEqualMatcher("POST"), DispatchKeys()),
+])
+def test_get_dispatch_keys(method, keys, *, resolver_):
+    with given:
+        matcher = MethodMatcher(method, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == keys
+
+
+@pytest.mark.parametrize(("expected", "actual", "res"), [
+    ("*", "GET", True),
+    ("GET", "GET", True),
+    ("GET", "POST", False),
+])
+def test_method_matcher_sync(expected, actual, res, *, resolver_, request_):
+    with given:
+        request_.method = actual
+        matcher = MethodMatcher(expected, resolver=resolver_)
+
+    with when:
+        actual = matcher.match_sync(request_)
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("is_sync", "res"), [
+    (True, True),
+    (False, False),
+])
+def test_is_sync(is_sync, res, *, resolver_):
+    with given:
+        submatcher_ = Mock(AttributeMatcher, is_sync=Mock(return_value=is_sync))
+        matcher = MethodMatcher(submatcher_, resolver=resolver_)
+
+    with when:
+        actual = matcher.is_sync()
+
+    with then:
+        assert actual is res
+
+
+@pytest.mark.parametrize(("expected", "actual", "res"), [
+    ("*", "GET", True),
+    ("GET", "GET", True),
+    ("GET", "POST", False),
+])
+def test_compile(expected, actual, res, *, resolver_, request_):
+    with given:
+        request_.method = actual
+        matcher = MethodMatcher(expected, resolver=resolver_)
+        compiler = MatcherCompiler()
+        compiled = compiler.build([matcher.compile(compiler)])
+
+    with when:
+        actual = compiled.function(request_)
+
+    with then:
+        assert bool(actual) is res
+
+
+@pytest.mark.parametrize(("value", "fields"), [
+    ("GET", FingerprintFields({"method": None})),
+    (NotEqualMatcher("POST"), FingerprintFields({"method": None})),
+    (AttributeMatcher(), None),
+])
+def test_get_fingerprint_fields(value, fields, *, resolver_):
+    with given:
+        matcher = MethodMatcher(value, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual == fields
+
+
+def test_get_fingerprint_fields_with_custom_matcher(*, resolver_):
+    with given:
+        class CustomMethodMatcher(MethodMatcher):
+            async def match(self, request):
+                return True
+
+        matcher = CustomMethodMatcher("GET", resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual is None
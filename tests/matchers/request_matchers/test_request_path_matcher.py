@@ -3,7 +3,14 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 
 from jj.matchers import AttributeMatcher, PathMatcher, RequestMatcher
-from jj.matchers.attribute_matchers import RouteMatcher
+from jj.matchers.attribute_matchers import EqualMatcher, RegexMatcher, RouteMatcher
+from jj.resolvers import (
+    DispatchKeys,
+    FingerprintFields,
+    MatcherCompiler,
+    RegexPattern,
+    RoutePattern,
+)
 
 from ..._test_utils.fixtures import request_, resolver_
 from ..._test_utils.steps import given, then, when
@@ -120,3 +127,134 @@ def test_sub_matcher_property(*, resolver_):
 
     with then:
         assert actual == sub_matcher
+
+
+@pytest.mark.parametrize(("path", "keys"), [
+    ("/users", DispatchKeys({"path": frozenset({"/users"})})),
+    ("/users/{id}", DispatchKeys({"path": frozenset({RoutePattern("/users/{id}")})})),
+    (EqualMatcher("/users"), DispatchKeys({"path": frozenset({"/users"})})),
+    (RegexMatcher("^/users"), DispatchKeys({"path": frozenset({RegexPattern("^/users")})})),
+])
+def test_get_dispatch_keys(path, keys, *, resolver_):
+    with given:
+        matcher = PathMatcher(path, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == keys
+
+
+@pytest.mark.parametrize(("value", "fields"), [
+    ("/users/{id}", FingerprintFields({"path": None})),
+    (RegexMatcher("^/users"), FingerprintFields({"path": None})),
+    (AttributeMatcher(), None),
+])
+def test_get_fingerprint_fields(value, fields, *, resolver_):
+    with given:
+        matcher = PathMatcher(value, resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual == fields
+
+
+def test_get_fingerprint_fields_with_custom_matcher(*, resolver_):
+    with given:
+        class CustomPathMatcher(PathMatcher):
+            async def match(self, request):
+                return True
+
+        matcher = CustomPathMatcher("/users", resolver=resolver_)
+
+    with when:
+        actual = matcher.get_fingerprint_fields()
+
+    with then:
+        assert actual is None
+
+
+@pytest.mark.asyncio
+async def test_match_does_not_set_segments(*, resolver_, request_):
+    with given:
+        request_.path = "/users/1"
+        request_.segments = sentinel.segments
+        matcher = PathMatcher("/users/{id}", resolver=resolver_)
+
+    with when:
+        actual = await matcher.match(request_)
+
+    with then:
+        assert actual is True
+        assert request_.segments == sentinel.segments
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("value", "path", "res"), [
+    ("/users/{id}", "/users/1", {"id": "1"}),
+    ("/users", "/users", {}),
+    ("/users/{id}", "/users", None),
+    (RegexMatcher("^/users"), "/users/1", None),
+])
+async def test_get_segments(value, path, res, *, resolver_, request_):
+    with given:
+        request_.path = path
+        matcher = PathMatcher(value, resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual == res
+
+
+@pytest.mark.asyncio
+async def test_get_segments_from_results(*, resolver_, request_):
+    with given:
+        request_.path = "/users/1"
+        matcher = PathMatcher("/users/{id}", resolver=resolver_)
+        results = {RoutePattern("/users/{id}"): sentinel.segments}
+
+    with when:
+        actual = await matcher.get_segments(request_, results)
+
+    with then:
+        assert actual == sentinel.segments
+
+
+@pytest.mark.parametrize(("value", "path", "res"), [
+    ("/users/{id}", "/users/1", True),
+    ("/users/{id}", "/users", False),
+    (RegexMatcher("^/users"), "/users/1", True),
+])
+def test_compile(value, path, res, *, resolver_, request_):
+    with given:
+        request_.path = path
+        matcher = PathMatcher(value, resolver=resolver_)
+        compiler = MatcherCompiler()
+        compiled = compiler.build([compiler.compile_matcher(matcher)])
+
+    with when:
+        actual = compiled.function(request_)
+
+    with then:
+        assert bool(actual) is res
+        assert compiler.pure_matchers == [matcher]
+
+
+def test_compile_reuses_route_results(*, resolver_, request_):
+    with given:
+        request_.path = "/users/1"
+        matcher = PathMatcher("/users/{id}", resolver=resolver_)
+        compiler = MatcherCompiler()
+        compiled = compiler.build([compiler.compile_matcher(matcher)])
+        results = {RoutePattern("/users/{id}"): None}
+
+    with when:
+        actual = compiled.function(request_, results)
+
+    with then:
+        assert actual is False
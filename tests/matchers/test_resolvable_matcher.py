@@ -4,6 +4,7 @@ import pytest
 from pytest import raises
 
 from jj.matchers import ResolvableMatcher
+from jj.resolvers import DispatchKeys
 
 from .._test_utils.fixtures import handler_, request_, resolver_
 from .._test_utils.steps import given, then, when
@@ -60,3 +61,41 @@ def test_repr(*, resolver_):
 
     with then:
         assert actual == "ResolvableMatcher(resolver=<Resolver>)"
+
+
+def test_get_dispatch_keys_unconstrained(*, resolver_):
+    with given:
+        matcher = ResolvableMatcher(resolver=resolver_)
+
+    with when:
+        actual = matcher.get_dispatch_keys()
+
+    with then:
+        assert actual == DispatchKeys()
+
+
+def test_matchers_without_packed_form_are_compared_by_identity(*, resolver_):
+    with given:
+        matcher1 = ResolvableMatcher(resolver=resolver_)
+        matcher2 = ResolvableMatcher(resolver=resolver_)
+
+    with when:
+        actual = matcher1 == matcher2
+
+    with then:
+        assert actual is False
+        assert matcher1.get_structural_key() is None
+        assert matcher1 == matcher1
+        assert hash(matcher1) == id(matcher1)
+
+
+@pytest.mark.asyncio
+async def test_get_segments_without_segments(*, resolver_, request_):
+    with given:
+        matcher = ResolvableMatcher(resolver=resolver_)
+
+    with when:
+        actual = await matcher.get_segments(request_)
+
+    with then:
+        assert actual is None
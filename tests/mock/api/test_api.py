@@ -142,5 +142,33 @@ async def test_api_history(make_client: ClientFixtureType,
                     "body": "text",
                     "raw": "b'text'"
                 }
-            }
+            },
+            "seq": 1,
         }]
+
+
+@pytest.mark.asyncio
+async def test_api_history_since(make_client: ClientFixtureType):
+    async with make_client() as api:
+        handler = await register_handler(api, response=jj.Response(text="text"))
+        for path in ("/1", "/2", "/3"):
+            await api.client.get(path)
+
+        resp = await api.client.get(f"/__jj__/handlers/{handler.id}/history",
+                                    params={"since": 1, "limit": 1})
+        body = await resp.json()
+
+        assert resp.status == 200
+        assert [item["request"]["HistoryRequest"]["path"] for item in body] == ["/2"]
+        assert [item["seq"] for item in body] == [2]
+
+
+@pytest.mark.asyncio
+async def test_api_history_invalid_since(make_client: ClientFixtureType):
+    async with make_client() as api:
+        handler = await register_handler(api, response=jj.Response(text="text"))
+
+        resp = await api.client.get(f"/__jj__/handlers/{handler.id}/history",
+                                    params={"since": "-1"})
+
+        assert resp.status == BAD_REQUEST
@@ -0,0 +1,73 @@
+import asyncio
+from time import monotonic
+from unittest.mock import Mock, call, sentinel
+
+import pytest
+
+from jj.mock._expiration_scheduler import ExpirationScheduler
+
+from .._test_utils.steps import given, then, when
+
+
+def test_expire():
+    with given:
+        scheduler = ExpirationScheduler(Mock())
+        scheduler.add("id1", sentinel.handler1, 10.0)
+        scheduler.add("id2", sentinel.handler2, 20.0)
+        scheduler.add("id3", sentinel.handler3, 15.0)
+
+    with when:
+        expired = scheduler.expire(15.0)
+
+    with then:
+        assert expired == [("id1", sentinel.handler1), ("id3", sentinel.handler3)]
+        assert len(scheduler) == 1
+
+
+def test_expire_discarded():
+    with given:
+        scheduler = ExpirationScheduler(Mock())
+        scheduler.add("id1", sentinel.handler1, 10.0)
+        scheduler.add("id2", sentinel.handler2, 10.0)
+        scheduler.discard(sentinel.handler1)
+
+    with when:
+        expired = scheduler.expire(10.0)
+
+    with then:
+        assert expired == [("id2", sentinel.handler2)]
+        assert len(scheduler) == 0
+
+
+def test_expire_readded():
+    with given:
+        scheduler = ExpirationScheduler(Mock())
+        scheduler.add("id1", sentinel.handler1, 10.0)
+        scheduler.add("id1", sentinel.handler1, 20.0)
+
+    with when:
+        expired = scheduler.expire(10.0)
+
+    with then:
+        assert expired == []
+        assert len(scheduler) == 1
+
+
+@pytest.mark.asyncio
+async def test_expire_on_timer():
+    with given:
+        on_expired = Mock()
+        scheduler = ExpirationScheduler(on_expired)
+        scheduler.add("id1", sentinel.handler1, monotonic() + 0.01)
+        scheduler.add("id2", sentinel.handler2, monotonic() + 0.01)
+        scheduler.add("id3", sentinel.handler3, monotonic() + 60)
+
+    with when:
+        await asyncio.sleep(0.05)
+
+    with then:
+        assert on_expired.mock_calls == [
+            call([("id1", sentinel.handler1), ("id2", sentinel.handler2)])
+        ]
+        assert len(scheduler) == 1
+        scheduler.close()
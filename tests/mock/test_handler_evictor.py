@@ -0,0 +1,119 @@
+import pytest
+from pytest import raises
+
+from jj.mock import EvictionInfo
+from jj.mock._handler_evictor import HandlerEvictor
+
+from .._test_utils.steps import given, then, when
+
+
+def test_evict_nothing():
+    with given:
+        evictor = HandlerEvictor(max_handlers=2, idle_ttl=60)
+        evictor.add("id1")
+        evictor.add("id2")
+
+    with when:
+        evicted = evictor.evict()
+
+    with then:
+        assert evicted == []
+        assert evictor.info == EvictionInfo(capacity=0, idle=0)
+
+
+def test_evict_over_capacity():
+    with given:
+        evictor = HandlerEvictor(max_handlers=1)
+        evictor.add("id1")
+        evictor.add("id2")
+        evictor.add("id3")
+
+    with when:
+        evicted = evictor.evict()
+
+    with then:
+        assert evicted == ["id1", "id2"]
+        assert evictor.info == EvictionInfo(capacity=2, idle=0)
+
+
+def test_evict_least_recently_hit():
+    with given:
+        evictor = HandlerEvictor(max_handlers=2)
+        evictor.add("id1")
+        evictor.add("id2")
+        evictor.touch("id1")
+        evictor.add("id3")
+
+    with when:
+        evicted = evictor.evict()
+
+    with then:
+        assert evicted == ["id2"]
+
+
+def test_evict_idle():
+    with given:
+        evictor = HandlerEvictor(idle_ttl=10)
+        evictor.add("id1")
+        evictor.add("id2")
+
+    with when:
+        evicted = evictor.evict(now=evictor._used_at["id2"] + 10)
+
+    with then:
+        assert evicted == ["id1", "id2"]
+        assert evictor.info == EvictionInfo(capacity=0, idle=2)
+
+
+def test_evict_not_pinned():
+    with given:
+        evictor = HandlerEvictor(max_handlers=1, idle_ttl=10)
+        evictor.add("id1", pinned=True)
+        evictor.add("id2", pinned=True)
+        evictor.add("id3")
+
+    with when:
+        evicted = evictor.evict(now=evictor._used_at["id3"] + 10)
+
+    with then:
+        assert evicted == ["id3"]
+        assert len(evictor) == 0
+
+
+def test_evict_unpinned():
+    with given:
+        evictor = HandlerEvictor(max_handlers=1)
+        evictor.add("id1", pinned=True)
+        evictor.add("id2")
+        evictor.unpin("id1")
+
+    with when:
+        evicted = evictor.evict()
+
+    with then:
+        assert evicted == ["id2"]
+        assert len(evictor) == 1
+
+
+def test_evict_discarded():
+    with given:
+        evictor = HandlerEvictor(max_handlers=1)
+        evictor.add("id1")
+        evictor.add("id2")
+        evictor.discard("id1")
+
+    with when:
+        evicted = evictor.evict()
+
+    with then:
+        assert evicted == []
+
+
+@pytest.mark.parametrize("kwargs", [{"max_handlers": 0}, {"idle_ttl": 0}])
+def test_evictor_with_invalid_limits(kwargs):
+    with when:
+        with raises(Exception) as exception:
+            HandlerEvictor(**kwargs)
+
+    with then:
+        assert exception.type is AssertionError
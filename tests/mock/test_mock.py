@@ -1,9 +1,16 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from unittest.mock import patch
+
 import pytest
+from packed import pack, unpack
 from pytest import raises
 
 import jj
+from jj.expiration_policy import ExpireAfterRequests, ExpireAfterSeconds, ExpireAt
 from jj.middlewares import SelfMiddleware
-from jj.mock import Mock, RemoteMock
+from jj.mock import EvictionInfo, Mock, RemoteMock
 from jj.mock._remote_mock import _RemoteMockError
 
 from .._test_utils import run
@@ -93,6 +100,18 @@ async def test_mock_deregister_bad_request():
         assert exception.type is _RemoteMockError
 
 
+@pytest.mark.asyncio
+async def test_mock_deregister_legacy_route_bad_request():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        # Handlers are deregistered by id, the payload is only decoded by the legacy route
+        response = await client.delete("/__jj__/deregister",
+                                       headers={"x-jj-remote-mock": "v"}, data=b"")
+        assert response.status == 400
+
+
 @pytest.mark.asyncio
 async def test_mock_handler_order():
     mock = Mock()
@@ -112,6 +131,24 @@ async def test_mock_handler_order():
                 assert body == b"text2"
 
 
+@pytest.mark.asyncio
+async def test_mock_register_equal_matchers():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher1, response1 = jj.match("GET", "/users"), jj.Response(body=b"text1")
+    matcher2, response2 = jj.match("GET", "/users"), jj.Response(body=b"text2")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        async with remote_mock.create_handler(matcher1, response1):
+            async with remote_mock.create_handler(matcher2, response2):
+                handlers = mock._resolver.get_handlers(mock._app.__class__)
+                matchers = [mock._resolver.get_matchers(handler) for handler in handlers]
+
+                assert len(matchers) == 2
+                assert matchers[0][0].__self__ is matchers[1][0].__self__
+
+
 @pytest.mark.asyncio
 async def test_mock_reset():
     mock = Mock()
@@ -179,3 +216,526 @@ async def test_mock_history_after_reset():
 
         history = await handler.fetch_history()
         assert len(history) == 0
+
+
+def test_mock_admin_handlers_not_resolved():
+    mock = Mock()
+
+    handlers = mock.resolver.get_handlers(Mock)
+    matched = [handler for handler in handlers if mock.resolver.get_matchers(handler)]
+
+    assert matched == [Mock.resolve]
+
+
+@pytest.mark.asyncio
+async def test_mock_admin_prefix_unknown_path():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*", "/__jj__/unknown"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        async with remote_mock.create_handler(matcher, response):
+            response = await client.get("/__jj__/unknown")
+            response_body = await response.read()
+
+            assert response.status == 200
+            assert response_body == b"text"
+
+
+@pytest.mark.asyncio
+async def test_mock_admin_header_unknown_method():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("PUT", "/users"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        async with remote_mock.create_handler(matcher, response):
+            response = await client.put("/users", headers={"x-jj-remote-mock": ""})
+
+            assert response.status == 200
+
+
+@pytest.mark.asyncio
+async def test_mock_evicts_least_recently_used():
+    mock = Mock(max_handlers=2)
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        for path in ["/1", "/2"]:
+            await remote_mock.create_handler(jj.match("GET", path), jj.Response()).register()
+        await client.get("/1")
+        await remote_mock.create_handler(jj.match("GET", "/3"), jj.Response()).register()
+
+        statuses = [(await client.get(path)).status for path in ["/1", "/2", "/3"]]
+
+        assert statuses == [200, 404, 200]
+        assert mock.eviction_info == EvictionInfo(capacity=1, idle=0)
+
+
+@pytest.mark.asyncio
+async def test_mock_does_not_evict_pinned():
+    mock = Mock(max_handlers=1)
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        pinned = remote_mock.create_handler(jj.match("GET", "/1"), jj.Response(), pinned=True)
+        await pinned.register()
+        for path in ["/2", "/3"]:
+            await remote_mock.create_handler(jj.match("GET", path), jj.Response()).register()
+
+        statuses = [(await client.get(path)).status for path in ["/1", "/2", "/3"]]
+
+        assert statuses == [200, 404, 200]
+
+
+@pytest.mark.asyncio
+async def test_mock_evicts_expired_handlers():
+    mock = Mock(max_handlers=2)
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        for pinned in [False, True] * 10:
+            handler = remote_mock.create_handler(jj.match("GET", "/"), jj.Response(),
+                                                 ExpireAfterRequests(1), pinned=pinned)
+            await handler.register()
+            assert (await client.get("/")).status == 200
+
+        # Handlers are evicted before a request is resolved, so the last one is still kept
+        assert len(mock._handlers) + len(mock._expired_handlers) <= 3
+        assert len(mock._repo._storage) <= 3
+
+
+@pytest.mark.asyncio
+async def test_mock_expires_handlers_on_deadline():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(jj.match("GET", "/"), jj.Response(),
+                                             ExpireAfterSeconds(0.01))
+        await handler.register()
+        await asyncio.sleep(0.05)
+
+        assert len(mock._handlers) == 0
+        assert (await client.get("/")).status == 404
+
+
+@pytest.mark.asyncio
+async def test_mock_keeps_handlers_before_wall_clock_deadline():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+        handler = remote_mock.create_handler(jj.match("GET", "/"), jj.Response(),
+                                             ExpireAt(expires_at))
+        await handler.register()
+
+        # The deadline has come on the monotonic clock, as if the system clock was set back
+        with patch("jj.mock._expiration_scheduler.monotonic", return_value=monotonic() + 120):
+            mock._expiration_scheduler._fire()
+
+        assert len(mock._expiration_scheduler) == 1
+        assert (await client.get("/")).status == 200
+
+
+@pytest.mark.asyncio
+async def test_mock_evictions_api():
+    mock = Mock(max_handlers=1, idle_ttl=60)
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        for path in ["/1", "/2"]:
+            await remote_mock.create_handler(jj.match("GET", path), jj.Response()).register()
+
+        response = await client.get("/__jj__/evictions")
+
+        assert response.status == 200
+        assert await response.json() == {
+            "max_handlers": 1,
+            "idle_ttl": 60,
+            "capacity": 1,
+            "idle": 0,
+        }
+
+
+@pytest.mark.asyncio
+async def test_mock_handler_priority():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher1, response1 = jj.match("GET", "/users", priority=1), jj.Response(body=b"users")
+    matcher2, response2 = jj.match("*"), jj.Response(body=b"fallback")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        async with remote_mock.create_handler(matcher1, response1):
+            async with remote_mock.create_handler(matcher2, response2):
+                bodies = [await (await client.get(path)).read() for path in ["/users", "/"]]
+
+                assert bodies == [b"users", b"fallback"]
+
+
+@pytest.mark.asyncio
+async def test_mock_register_same_id_replaces_handler():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await handler.register()
+
+        assert len(mock._resolver.get_handlers(mock._app.__class__)) == 1
+        assert not hasattr(mock._app.__class__, str(handler.id))
+
+        await handler.deregister()
+
+        response = await client.get("/")
+        assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_mock_deregister_by_id():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        response = await client.delete(f"/__jj__/handlers/{handler.id}",
+                                       headers={"x-jj-remote-mock": "v"})
+        assert response.status == 200
+
+        response = await client.get("/")
+        assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_mock_history_by_id():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await client.get("/users")
+
+        response = await client.get(f"/__jj__/handlers/{handler.id}/history",
+                                    headers={"x-jj-remote-mock": "v"})
+        assert response.status == 200
+
+        history = unpack(await response.read())
+        assert [item["request"].path for item in history] == ["/users"]
+
+
+@pytest.mark.asyncio
+async def test_mock_wait_for_history():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        waiting = asyncio.create_task(handler.wait_for_history(1, timeout=5))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await client.get("/users")
+
+        history = await asyncio.wait_for(waiting, 1)
+        assert [item["request"].path for item in history] == ["/users"]
+
+
+@pytest.mark.asyncio
+async def test_mock_wait_for_history_timeout():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await client.get("/users")
+
+        history = await handler.wait_for_history(2, timeout=0.01)
+        assert [item["request"].path for item in history] == ["/users"]
+
+
+@pytest.mark.asyncio
+async def test_mock_wait_for_history_with_predicate():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        predicate = jj.match("*", "/items")
+        waiting = asyncio.create_task(handler.wait_for_history(1, timeout=5, predicate=predicate))
+        await client.get("/users")
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await client.get("/items")
+
+        history = await asyncio.wait_for(waiting, 1)
+        assert [item["request"].path for item in history] == ["/items", "/users"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("method", "path"), [
+    ("DELETE", "/__jj__/handlers/{id}"),
+    ("POST", "/__jj__/reset"),
+])
+async def test_mock_wait_for_history_ends_on_delete(method, path):
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        waiting = asyncio.create_task(handler.wait_for_history(1, timeout=5))
+        await asyncio.sleep(0.01)
+
+        response = await client.request(method, path.format(id=handler.id),
+                                        headers={"x-jj-remote-mock": "v"})
+        assert response.status == 200
+
+        history = await asyncio.wait_for(waiting, 1)
+        assert history == []
+
+
+@pytest.mark.asyncio
+async def test_mock_wait_for_history_not_woken_by_other_handlers():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler1 = remote_mock.create_handler(jj.match("*", "/users"), jj.Response())
+        handler2 = remote_mock.create_handler(jj.match("*", "/items"), jj.Response())
+        await remote_mock.register_many([handler1, handler2])
+
+        with patch.object(mock._repo, "get_by_tag", wraps=mock._repo.get_by_tag) as get_by_tag:
+            waiting = asyncio.create_task(handler1.wait_for_history(1, timeout=5))
+            await asyncio.sleep(0.01)
+            for _ in range(5):
+                await client.get("/items")
+            assert get_by_tag.call_count == 1
+
+            await client.get("/users")
+            history = await asyncio.wait_for(waiting, 1)
+
+        assert [item["request"].path for item in history] == ["/users"]
+        # the first scan, the scan of the new item, and the result
+        assert get_by_tag.call_count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", [
+    "min_count=-1",
+    "min_count=one",
+    "timeout=-1",
+    "timeout=inf",
+])
+async def test_mock_wait_for_history_bad_request(query):
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        response = await client.get(f"/__jj__/handlers/{handler.id}/history?{query}",
+                                    headers={"x-jj-remote-mock": "v"})
+        assert response.status == 400
+
+
+@pytest.mark.asyncio
+async def test_mock_remote_handler_with_legacy_routes():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+    # Servers without id routes decode the handler from the payload
+    mock._get_remote_id_handler = lambda request: None
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await client.get("/users")
+
+        history = await handler.fetch_history()
+        assert [item["request"].path for item in history] == ["/users"]
+
+        await handler.deregister()
+
+        response = await client.get("/")
+        assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_mock_error_does_not_switch_to_legacy_routes():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+
+        with raises(Exception) as exception:
+            await remote_mock.fetch_history(handler, since=-1)
+        assert exception.type is _RemoteMockError
+
+        with patch.object(remote_mock, "_send", wraps=remote_mock._send) as send:
+            await handler.deregister()
+
+        assert remote_mock._legacy_routes is False
+        assert [c.args[1] for c in send.call_args_list] == [
+            f"{remote_mock._url}/__jj__/handlers/{handler.id}"
+        ]
+
+
+def test_remote_handler_packs_payload_once():
+    remote_mock = RemoteMock("http://localhost")
+    handler = remote_mock.create_handler(jj.match("*"), jj.Response(body=b"text"))
+
+    payload = handler.pack_payload()
+
+    assert isinstance(payload, bytes)
+    assert handler.pack_payload() is payload
+
+
+@pytest.mark.asyncio
+async def test_mock_batch():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher1, response1 = jj.match("*", "/users"), jj.Response(body=b"users")
+    matcher2, response2 = jj.match("*", "/items"), jj.Response(body=b"items")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler1 = remote_mock.create_handler(matcher1, response1)
+        handler2 = remote_mock.create_handler(matcher2, response2)
+        await remote_mock.register_many([handler1, handler2])
+
+        bodies = [await (await client.get(path)).read() for path in ["/users", "/items"]]
+        assert bodies == [b"users", b"items"]
+
+        history1, history2 = await remote_mock.fetch_history_many([handler1, handler2])
+        assert [item["request"].path for item in history1] == ["/users"]
+        assert [item["request"].path for item in history2] == ["/items"]
+
+        await remote_mock.deregister_many([handler1, handler2])
+
+        statuses = [(await client.get(path)).status for path in ["/users", "/items"]]
+        assert statuses == [404, 404]
+
+
+@pytest.mark.asyncio
+async def test_mock_batch_invalid_operations():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        operations = [
+            {"op": "register", "payload": b""},
+            {"op": "deregister", "id": None},
+            {"op": "unknown"},
+            {"op": "history", "id": "unknown", "since": -1},
+            {"op": "history", "id": "unknown"},
+        ]
+        response = await client.post("/__jj__/batch", headers={"x-jj-remote-mock": "v"},
+                                     data=pack(operations))
+        assert response.status == 200
+
+        results = unpack(await response.read())
+        assert [result["status"] for result in results] == [400, 400, 400, 400, 200]
+        assert results[-1]["history"] == []
+
+
+@pytest.mark.asyncio
+async def test_mock_batch_history_since():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await client.get("/users")
+        await client.get("/items")
+
+        operations = [{"op": "history", "id": str(handler.id), "since": 1}]
+        response = await client.post("/__jj__/batch", headers={"x-jj-remote-mock": "v"},
+                                     data=pack(operations))
+        assert response.status == 200
+
+        results = unpack(await response.read())
+        assert [item["request"].path for item in results[0]["history"]] == ["/items"]
+
+
+@pytest.mark.asyncio
+async def test_mock_batch_register_error():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(None, None)
+
+        with raises(Exception) as exception:
+            await remote_mock.register_many([handler])
+        assert exception.type is _RemoteMockError
+
+
+@pytest.mark.asyncio
+async def test_mock_batch_with_legacy_routes():
+    mock = Mock()
+    self_middleware = SelfMiddleware(mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200, body=b"text")
+    # Servers without the batch route decode the operations as a handler
+    del mock._remote_routes[("POST", "/__jj__/batch")]
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url(""))
+        handler = remote_mock.create_handler(matcher, response)
+        await remote_mock.register_many([handler])
+        await client.get("/users")
+
+        history, = await remote_mock.fetch_history_many([handler])
+        assert [item["request"].path for item in history] == ["/users"]
+
+        await remote_mock.deregister_many([handler])
+
+        response = await client.get("/")
+        assert response.status == 404
@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 from aiohttp import FormData
@@ -217,3 +218,110 @@ async def test_mock_history_post_text_data():
             assert req.path == "/"
             assert req.body == "text"
             assert req.raw == b"text"
+
+
+@pytest.mark.asyncio
+async def test_mock_history_fetches_new_items():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher, response = jj.match("*"), jj.Response()
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response)
+        async with handler:
+            await client.get("/path1")
+            history1 = await handler.fetch_history()
+
+            await client.get("/path2")
+            with patch.object(remote_mock, "_send", wraps=remote_mock._send) as send:
+                history2 = await handler.fetch_history()
+
+            url = send.call_args.args[1]
+            assert url.endswith(f"/history?since={history1[0]['seq']}")
+            assert [item["request"].path for item in history1] == ["/path1"]
+            assert [item["request"].path for item in history2] == ["/path2", "/path1"]
+            assert history2[0]["seq"] > history2[1]["seq"]
+
+
+@pytest.mark.asyncio
+async def test_mock_history_since_and_limit():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher, response = jj.match("*"), jj.Response()
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response)
+        async with handler:
+            for path in ("/path1", "/path2", "/path3"):
+                await client.get(path)
+            history = await remote_mock.fetch_history(handler)
+            since = history[-1]["seq"]
+
+            history = await remote_mock.fetch_history(handler, since=since)
+            assert [item["request"].path for item in history] == ["/path3", "/path2"]
+
+            history = await remote_mock.fetch_history(handler, since=since, limit=1)
+            assert [item["request"].path for item in history] == ["/path2"]
+
+
+@pytest.mark.asyncio
+async def test_mock_history_reset_on_deregister():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher, response = jj.match("*"), jj.Response()
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        handler = RemoteMock(client.make_url("/")).create_handler(matcher, response)
+        async with handler:
+            await client.get("/path1")
+            await handler.fetch_history()
+
+        async with handler:
+            await client.get("/path2")
+
+            history = await handler.fetch_history()
+            assert [item["request"].path for item in history] == ["/path2"]
+
+
+@pytest.mark.asyncio
+async def test_mock_history_fetched_in_full_if_since_is_ignored():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher, response = jj.match("*"), jj.Response()
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response)
+        async with handler:
+            await client.get("/path1")
+            await handler.fetch_history()
+
+            # Legacy routes return the whole history
+            remote_mock._legacy_routes = True
+            await client.get("/path2")
+
+            history = await handler.fetch_history()
+            assert [item["request"].path for item in history] == ["/path2", "/path1"]
+
+
+@pytest.mark.asyncio
+async def test_mock_history_reset_on_mock_reset():
+    mock = Mock()
+    self_middleware = SelfMiddleware(Mock().resolver)
+    matcher, response = jj.match("*"), jj.Response()
+
+    async with run(mock, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        handler = remote_mock.create_handler(matcher, response)
+        await handler.register()
+        await client.get("/path1")
+        await handler.fetch_history()
+
+        await remote_mock.reset()
+        await handler.register()
+        await client.get("/path2")
+
+        history = await handler.fetch_history()
+        assert [item["request"].path for item in history] == ["/path2"]
@@ -1,3 +1,6 @@
+import asyncio
+from unittest.mock import patch
+
 import pytest
 
 import jj
@@ -90,6 +93,21 @@ async def test_mocked_wait_for_requests_timeout():
             assert len(mock.history) == 0
 
 
+@pytest.mark.asyncio
+async def test_mocked_wait_for_requests_attempts():
+    remote_mock = Mock()
+    self_middleware = SelfMiddleware(remote_mock.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200)
+
+    async with run(remote_mock, middlewares=[self_middleware]) as client:
+        handler = RemoteMock(client.make_url("/")).create_handler(matcher, response)
+
+        async with Mocked(handler) as mock:
+            with patch("jj.mock._mocked.LONG_POLL_TIMEOUT", 60.0):
+                await asyncio.wait_for(mock.wait_for_requests(attempts=3), timeout=5)
+            assert len(mock.history) == 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(("disposable", "status"), [
     (True, 404),
@@ -164,3 +182,14 @@ async def test_mocked_with_mock_decorator():
 
         assert response.status == 200
         assert isinstance(mock, Mocked)
+
+
+def test_mocked_set_and_reset_history():
+    handler = RemoteMock("http://localhost").create_handler(jj.match("*"), jj.Response())
+    mock = Mocked(handler)
+
+    mock.set_history([])
+    assert mock.history == []
+
+    mock.reset_history()
+    assert mock.history is None
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 import jj
@@ -107,3 +109,120 @@ async def test_stacked_incorrect_type():
 
     assert exc.type == TypeError
     assert str(exc.value) == "Unsupported type: <class 'NoneType'>"
+
+
+@pytest.mark.asyncio
+async def test_stacked_batches_requests():
+    app = Mock()
+    self_middleware = SelfMiddleware(app.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200)
+
+    async with run(app, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        mocked = [Mocked(remote_mock.create_handler(matcher, response)) for _ in range(3)]
+        mocked.append(Mocked(remote_mock.create_handler(matcher, response),
+                             prefetch_history=False, disposable=False))
+
+        with patch.object(remote_mock, "_send", wraps=remote_mock._send) as request_:
+            async with stacked(mocked) as mocks:
+                response = await client.get("/")
+                assert response.status == 200
+
+        # register, fetch history and deregister
+        assert request_.call_count == 3
+        assert [len(mock.history) for mock in mocks[:3]] == [0, 0, 0]
+        assert mocks[3].history is None
+
+        response = await client.get("/")
+        assert response.status == 200
+
+
+@pytest.mark.asyncio
+async def test_stacked_batches_requests_of_mocked():
+    app = Mock()
+    self_middleware = SelfMiddleware(app.resolver)
+    matcher, response = jj.match("*"), jj.Response(status=200)
+
+    async with run(app, middlewares=[self_middleware]) as client:
+        with patch.dict("os.environ", {"JJ_REMOTE_MOCK_URL": str(client.make_url("/"))}):
+            mocked = [jj.mock.mocked(matcher, response) for _ in range(3)]
+
+        calls = []
+        send = RemoteMock._send
+
+        async def spy(self, *args):
+            calls.append(args)
+            return await send(self, *args)
+
+        with patch.object(RemoteMock, "_send", spy):
+            async with stacked(mocked) as mocks:
+                response = await client.get("/")
+                assert response.status == 200
+
+        # register, fetch history and deregister
+        assert len(calls) == 3
+        assert [len(mock.history) for mock in mocks] == [0, 0, 1]
+
+
+@pytest.mark.asyncio
+async def test_stacked_deregisters_if_history_fails():
+    app1, app2 = Mock(), Mock()
+    matcher1, response1 = jj.match("*", "/users/1"), jj.Response(status=201)
+    matcher2, response2 = jj.match("*", "/users/2"), jj.Response(status=202)
+
+    async with run(app1, middlewares=[SelfMiddleware(app1.resolver)]) as client1, \
+               run(app2, middlewares=[SelfMiddleware(app2.resolver)]) as client2:
+        remote_mock1 = RemoteMock(client1.make_url("/"))
+        remote_mock2 = RemoteMock(client2.make_url("/"))
+        mocked = [
+            Mocked(remote_mock1.create_handler(matcher1, response1)),
+            Mocked(remote_mock2.create_handler(matcher2, response2)),
+        ]
+
+        with patch.object(remote_mock1, "fetch_history_many", side_effect=ConnectionError):
+            with pytest.raises(ConnectionError):
+                async with stacked(mocked) as (mock1, mock2):
+                    await client2.get("/users/2")
+
+        assert mock1.history is None
+        assert mock2.history[0]["request"].path == "/users/2"
+
+        assert (await client1.get("/users/1")).status == 404
+        assert (await client2.get("/users/2")).status == 404
+
+
+@pytest.mark.asyncio
+async def test_stacked_enters_mocked_subclasses():
+    app = Mock()
+    self_middleware = SelfMiddleware(app.resolver)
+    matcher1, response1 = jj.match("*", "/users/1"), jj.Response(status=201)
+    matcher2, response2 = jj.match("*", "/users/2"), jj.Response(status=202)
+    calls = []
+
+    class CustomMocked(Mocked):
+        async def __aenter__(self):
+            calls.append("enter")
+            return await super().__aenter__()
+
+        async def __aexit__(self, *args):
+            calls.append("exit")
+            await super().__aexit__(*args)
+
+    async with run(app, middlewares=[self_middleware]) as client:
+        remote_mock = RemoteMock(client.make_url("/"))
+        mocked = [
+            Mocked(remote_mock.create_handler(matcher1, response1)),
+            CustomMocked(remote_mock.create_handler(matcher2, response2)),
+        ]
+
+        async with stacked(mocked) as (mock1, mock2):
+            assert calls == ["enter"]
+            assert (await client.get("/users/1")).status == 201
+            assert (await client.get("/users/2")).status == 202
+
+        assert calls == ["enter", "exit"]
+        assert mock1.history[0]["request"].path == "/users/1"
+        assert mock2.history[0]["request"].path == "/users/2"
+
+        statuses = [(await client.get(path)).status for path in ["/users/1", "/users/2"]]
+        assert statuses == [404, 404]
@@ -0,0 +1,347 @@
+from unittest.mock import Mock, sentinel
+
+import pytest
+from multidict import CIMultiDict, MultiDict
+
+from jj.resolvers import (
+    DispatchIndex,
+    DispatchKeys,
+    FingerprintFields,
+    HandlerRecord,
+    RegexPattern,
+    RoutePattern,
+)
+
+from .._test_utils.steps import given, then, when
+
+
+def make_keys(method=None, path=None):
+    keys = {}
+    if method is not None:
+        keys["method"] = frozenset(method)
+    if path is not None:
+        keys["path"] = frozenset(path)
+    return DispatchKeys(keys)
+
+
+def make_request(method="GET", path="/", headers=None, query=None):
+    return Mock(method=method, path=path,
+                headers=CIMultiDict(headers or {}), query=MultiDict(query or {}))
+
+
+def make_record(handler, matchers=(), expiration_policy=None):
+    return HandlerRecord(handler, matchers, expiration_policy)
+
+
+def get_handlers(records):
+    return [record.handler for record in records]
+
+
+@pytest.fixture
+def index():
+    return DispatchIndex()
+
+
+def test_empty_index(index):
+    with when:
+        candidates = index.get_candidates(make_request())
+
+    with then:
+        assert candidates is None
+        assert index.get_records() == []
+        assert len(index) == 0
+
+
+def test_get_candidates_without_constraints(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys())
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys())
+
+    with when:
+        candidates = index.get_candidates(make_request())
+
+    with then:
+        assert candidates is None
+
+
+@pytest.mark.parametrize(("method", "path", "res"), [
+    ("GET", "/users", [sentinel.handler1, sentinel.handler3]),
+    ("POST", "/users", [sentinel.handler3]),
+    ("GET", "/items", [sentinel.handler2, sentinel.handler3]),
+    ("DELETE", "/items", [sentinel.handler3]),
+])
+def test_get_candidates(method, path, res, index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(["GET"], ["/users"]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(["GET"], ["/items"]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys())
+
+    with when:
+        candidates = index.get_candidates(make_request(method, path))
+
+    with then:
+        assert get_handlers(candidates) == res
+
+
+def test_get_candidates_in_registration_order(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(path=["/users"]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys())
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys(method=["GET"]))
+        index.add(make_record(sentinel.handler4), sentinel.owner4, make_keys(path=["/items"]))
+
+    with when:
+        candidates = index.get_candidates(make_request("GET", "/users"))
+
+    with then:
+        assert get_handlers(candidates) == [sentinel.handler1, sentinel.handler2,
+                                            sentinel.handler3]
+
+
+def test_handler_without_matchers_is_never_candidate(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, None)
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys(path=["/items"]))
+
+    with when:
+        candidates = index.get_candidates(make_request())
+
+    with then:
+        assert get_handlers(candidates) == [sentinel.handler2]
+        assert sentinel.handler1 in index
+
+
+def test_add_existing_handler_keeps_order(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys())
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys(path=["/items"]))
+
+    with when:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(path=["/"]))
+
+    with then:
+        candidates = index.get_candidates(make_request())
+        assert get_handlers(candidates) == [sentinel.handler1, sentinel.handler2]
+
+
+def test_get_records(index):
+    with given:
+        record1 = make_record(sentinel.handler1)
+        record2 = make_record(sentinel.handler2)
+        index.add(record1, sentinel.owner1, make_keys(path=["/"]))
+        index.add(record2, sentinel.owner2, None)
+
+    with when:
+        records = index.get_records()
+
+    with then:
+        assert records == [record1, record2]
+        assert index.get_record(sentinel.handler1) == record1
+        assert index.get_record(sentinel.handler3) is None
+
+
+def test_update(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner, make_keys(path=["/users"]))
+        index.add(make_record(sentinel.handler2), sentinel.owner, make_keys(path=["/users"]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys(path=["/"]))
+
+    with when:
+        record = make_record(sentinel.owner, (sentinel.matcher,), sentinel.expiration_policy)
+        index.update(sentinel.owner, make_keys(path=["/items"]), record)
+
+    with then:
+        assert index.get_candidates(make_request(path="/users")) == []
+        assert index.get_candidates(make_request(path="/items")) == [
+            make_record(sentinel.handler1, (sentinel.matcher,), sentinel.expiration_policy),
+            make_record(sentinel.handler2, (sentinel.matcher,), sentinel.expiration_policy),
+        ]
+
+
+def test_remove(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(path=["/users"]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys())
+
+    with when:
+        index.remove(sentinel.handler1)
+
+    with then:
+        assert sentinel.handler1 not in index
+        assert index.get_records() == [make_record(sentinel.handler2)]
+
+
+def test_remove_nonexisting_handler(index):
+    with when:
+        res = index.remove(sentinel.handler)
+
+    with then:
+        assert res is None
+
+
+@pytest.mark.parametrize(("path", "res"), [
+    ("/users", [sentinel.handler1]),
+    ("/users/1", [sentinel.handler2]),
+    ("/users/1/items", [sentinel.handler3]),
+    ("/items", []),
+])
+def test_get_candidates_by_route(path, res, index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(path=["/users"]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2,
+                  make_keys(path=[RoutePattern("/users/{id}")]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3,
+                  make_keys(path=[RoutePattern("/users/{id}/items")]))
+
+    with when:
+        candidates = index.get_candidates(make_request(path=path))
+
+    with then:
+        assert get_handlers(candidates) == res
+
+
+def test_get_candidates_collects_route_segments(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  make_keys(path=[RoutePattern("/users/{id}")]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2,
+                  make_keys(path=[RoutePattern("/users/{id}/items")]))
+        results = {}
+
+    with when:
+        candidates = index.get_candidates(make_request(path="/users/1"), results)
+
+    with then:
+        assert get_handlers(candidates) == [sentinel.handler1]
+        assert results == {RoutePattern("/users/{id}"): {"id": "1"}}
+
+
+def test_remove_route(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  make_keys(path=[RoutePattern("/users/{id}")]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2,
+                  make_keys(path=[RoutePattern("/users/{id}")]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3, make_keys(path=["/"]))
+
+    with when:
+        index.remove(sentinel.handler1)
+        index.remove(sentinel.handler2)
+
+    with then:
+        assert index.get_candidates(make_request(path="/users/1")) == []
+        assert len(index._routes) == 0
+
+
+def test_regexes_are_not_indexed_by_default(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  make_keys(path=[RegexPattern("^/users")]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+
+    with when:
+        candidates = index.get_candidates(make_request(path="/items"))
+
+    with then:
+        assert get_handlers(candidates) == [sentinel.handler1]
+
+
+@pytest.mark.parametrize(("path", "res"), [
+    ("/users/1", [sentinel.handler1, sentinel.handler3]),
+    ("/items/1", [sentinel.handler2, sentinel.handler3]),
+    ("/", [sentinel.handler3]),
+])
+def test_get_candidates_by_regex(path, res):
+    with given:
+        index = DispatchIndex(combine_regexes=True)
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  make_keys(path=[RegexPattern("^/users")]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2,
+                  make_keys(path=[RegexPattern("^/items")]))
+        index.add(make_record(sentinel.handler3), sentinel.owner3,
+                  make_keys(path=[RegexPattern("[0-9]*")]))
+
+    with when:
+        candidates = index.get_candidates(make_request(path=path))
+
+    with then:
+        assert get_handlers(candidates) == res
+
+
+@pytest.mark.parametrize(("headers", "query", "res"), [
+    ([("Accept", "text/plain"), ("Accept", "application/json")], {}, [sentinel.handler1]),
+    ({"ACCEPT": "application/json"}, {}, [sentinel.handler1]),
+    ({"Accept": "text/plain"}, {}, []),
+    ({}, {"page": "1"}, [sentinel.handler2]),
+    ({}, {"Page": "1"}, []),
+])
+def test_get_candidates_by_header_and_param_regex(headers, query, res):
+    with given:
+        index = DispatchIndex(combine_regexes=True)
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  DispatchKeys({("header", "accept"): frozenset([RegexPattern("json$")])}))
+        index.add(make_record(sentinel.handler2), sentinel.owner2,
+                  DispatchKeys({("param", "page"): frozenset([RegexPattern("^[0-9]+$")])}))
+
+    with when:
+        candidates = index.get_candidates(make_request(headers=headers, query=query))
+
+    with then:
+        assert get_handlers(candidates) == res
+
+
+def test_remove_regex():
+    with given:
+        index = DispatchIndex(combine_regexes=True)
+        index.add(make_record(sentinel.handler1), sentinel.owner1,
+                  make_keys(path=[RegexPattern("^/users")]))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+
+    with when:
+        index.remove(sentinel.handler1)
+
+    with then:
+        assert index.get_candidates(make_request(path="/users")) == []
+        assert index._scanners == {}
+
+
+def test_fingerprint_fields(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(method=["GET"]),
+                  FingerprintFields({"method": None}))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]),
+                  FingerprintFields({"path": None}))
+
+    with when:
+        actual = index.fingerprint_fields
+
+    with then:
+        assert actual == FingerprintFields({"method": None, "path": None})
+
+
+def test_fingerprint_fields_with_uncacheable_handler(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(method=["GET"]),
+                  FingerprintFields({"method": None}))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+
+    with when:
+        actual = index.fingerprint_fields
+
+    with then:
+        assert actual is None
+
+
+def test_fingerprint_fields_after_remove_uncacheable_handler(index):
+    with given:
+        index.add(make_record(sentinel.handler1), sentinel.owner1, make_keys(method=["GET"]),
+                  FingerprintFields({"method": None}))
+        index.add(make_record(sentinel.handler2), sentinel.owner2, make_keys(path=["/"]))
+
+    with when:
+        index.remove(sentinel.handler2)
+
+    with then:
+        assert index.fingerprint_fields == FingerprintFields({"method": None})
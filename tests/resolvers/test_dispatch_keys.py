@@ -0,0 +1,78 @@
+import pytest
+
+from jj.resolvers import DispatchKeys
+
+from .._test_utils.steps import given, then, when
+
+
+@pytest.mark.parametrize(("keys1", "keys2", "res"), [
+    ({}, {}, {}),
+    ({"method": {"GET"}}, {}, {"method": {"GET"}}),
+    ({}, {"path": {"/"}}, {"path": {"/"}}),
+    ({"method": {"GET"}}, {"path": {"/"}}, {"method": {"GET"}, "path": {"/"}}),
+    ({"method": {"GET", "POST"}}, {"method": {"GET"}}, {"method": {"GET"}}),
+    ({"method": {"GET"}}, {"method": {"GET", "POST"}}, {"method": {"GET"}}),
+])
+def test_and(keys1, keys2, res):
+    with given:
+        dispatch_keys1 = DispatchKeys({k: frozenset(v) for k, v in keys1.items()})
+        dispatch_keys2 = DispatchKeys({k: frozenset(v) for k, v in keys2.items()})
+
+    with when:
+        actual = dispatch_keys1 & dispatch_keys2
+
+    with then:
+        assert actual == DispatchKeys({k: frozenset(v) for k, v in res.items()})
+
+
+@pytest.mark.parametrize(("keys1", "keys2", "res"), [
+    ({}, {}, {}),
+    ({"method": {"GET"}}, {}, {}),
+    ({"method": {"GET"}}, {"path": {"/"}}, {}),
+    ({"method": {"GET"}}, {"method": {"POST"}}, {"method": {"GET", "POST"}}),
+    ({"method": {"GET"}, "path": {"/"}}, {"method": {"POST"}}, {"method": {"GET", "POST"}}),
+])
+def test_or(keys1, keys2, res):
+    with given:
+        dispatch_keys1 = DispatchKeys({k: frozenset(v) for k, v in keys1.items()})
+        dispatch_keys2 = DispatchKeys({k: frozenset(v) for k, v in keys2.items()})
+
+    with when:
+        actual = dispatch_keys1 | dispatch_keys2
+
+    with then:
+        assert actual == DispatchKeys({k: frozenset(v) for k, v in res.items()})
+
+
+def test_get():
+    with given:
+        keys = DispatchKeys({"method": frozenset({"GET"})})
+
+    with when:
+        method, path = keys.get("method"), keys.get("path")
+
+    with then:
+        assert method == frozenset({"GET"})
+        assert path is None
+
+
+def test_dimensions():
+    with given:
+        keys = DispatchKeys({"method": frozenset({"GET"}), "path": frozenset({"/"})})
+
+    with when:
+        actual = keys.dimensions
+
+    with then:
+        assert actual == frozenset({"method", "path"})
+
+
+def test_repr():
+    with given:
+        keys = DispatchKeys({"method": frozenset({"GET"})})
+
+    with when:
+        actual = repr(keys)
+
+    with then:
+        assert actual == "DispatchKeys({'method': frozenset({'GET'})})"
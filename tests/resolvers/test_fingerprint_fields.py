@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+from multidict import CIMultiDict, MultiDict
+
+from jj.resolvers import FingerprintFields
+
+from .._test_utils.steps import given, then, when
+
+
+@pytest.mark.parametrize(("fields1", "fields2", "res"), [
+    ({}, {}, {}),
+    ({"method": None}, {}, {"method": None}),
+    ({}, {"path": None}, {"path": None}),
+    ({"method": None}, {"path": None}, {"method": None, "path": None}),
+    ({"headers": {"a"}}, {"headers": {"b"}}, {"headers": {"a", "b"}}),
+    ({"headers": {"a"}}, {"headers": None}, {"headers": None}),
+    ({"headers": None}, {"headers": {"b"}}, {"headers": None}),
+])
+def test_or(fields1, fields2, res):
+    with given:
+        fingerprint_fields1 = FingerprintFields({
+            k: (frozenset(v) if v is not None else None) for k, v in fields1.items()
+        })
+        fingerprint_fields2 = FingerprintFields({
+            k: (frozenset(v) if v is not None else None) for k, v in fields2.items()
+        })
+
+    with when:
+        actual = fingerprint_fields1 | fingerprint_fields2
+
+    with then:
+        assert actual == FingerprintFields({
+            k: (frozenset(v) if v is not None else None) for k, v in res.items()
+        })
+
+
+def test_get():
+    with given:
+        fields = FingerprintFields({"headers": frozenset({"x-key"}), "method": None})
+
+    with when:
+        actual = fields.get("headers"), fields.get("method"), fields.get("path")
+
+    with then:
+        assert actual == (frozenset({"x-key"}), None, None)
+        assert fields.attributes == frozenset({"headers", "method"})
+
+
+def test_get_fingerprint():
+    with given:
+        fields = FingerprintFields({
+            "method": None,
+            "headers": frozenset({"X-Key"}),
+            "query": None,
+        })
+        request1 = SimpleNamespace(method="GET",
+                                   headers=CIMultiDict({"x-key": "1", "x-request-id": "1"}),
+                                   query=MultiDict([("a", "1"), ("a", "2")]))
+        request2 = SimpleNamespace(method="GET",
+                                   headers=CIMultiDict({"x-key": "1", "x-request-id": "2"}),
+                                   query=MultiDict([("a", "1"), ("a", "2")]))
+
+    with when:
+        actual = fields.get_fingerprint(request1)
+
+    with then:
+        assert actual == ((("1",),), "GET", (("a", "1"), ("a", "2")))
+        assert actual == fields.get_fingerprint(request2)
+
+
+def test_repr():
+    with given:
+        fields = FingerprintFields({"method": None})
+
+    with when:
+        actual = repr(fields)
+
+    with then:
+        assert actual == "FingerprintFields({'method': None})"
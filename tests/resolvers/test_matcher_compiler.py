@@ -0,0 +1,175 @@
+from unittest.mock import AsyncMock, Mock, sentinel
+
+import pytest
+
+from jj.resolvers import MatcherCompiler
+
+from .._test_utils.steps import given, then, when
+
+
+@pytest.fixture
+def compiler():
+    return MatcherCompiler()
+
+
+@pytest.mark.parametrize(("value", "expression"), [
+    ("GET", "'GET'"),
+    (42, "42"),
+    (True, "True"),
+    (None, "None"),
+])
+def test_add_literal_constant(value, expression, compiler):
+    with when:
+        actual = compiler.add_constant(value)
+
+    with then:
+        assert actual == expression
+
+
+def test_add_constant(compiler):
+    with when:
+        name1 = compiler.add_constant(sentinel.value1)
+        name2 = compiler.add_constant(sentinel.value2)
+        name3 = compiler.add_constant(sentinel.value1)
+
+    with then:
+        assert name1 != name2
+        assert name1 == name3
+
+
+def test_get_attribute(compiler):
+    with when:
+        name1 = compiler.get_attribute("method")
+        name2 = compiler.get_attribute("path")
+        name3 = compiler.get_attribute("method")
+
+    with then:
+        assert name1 != name2
+        assert name1 == name3
+
+
+def test_build_hoists_attributes(compiler):
+    with given:
+        method = compiler.get_attribute("method")
+        path = compiler.get_attribute("path")
+        expected = compiler.add_constant(sentinel.path)
+
+    with when:
+        compiled = compiler.build([f"({method} == 'GET')", f"({expected} == {path})"])
+
+    with then:
+        assert compiled.is_async is False
+        assert compiled.function(Mock(method="GET", path=sentinel.path)) is True
+        assert compiled.function(Mock(method="POST", path=sentinel.path)) is False
+        assert compiled.source == "\n".join([
+            "def match(request, results=None):",
+            "    request_method = request.method",
+            "    request_path = request.path",
+            "    return (request_method == 'GET') and (_c0 == request_path)",
+        ])
+
+
+def test_build_preserves_short_circuit(compiler):
+    with given:
+        matcher1_ = Mock(is_sync=Mock(return_value=True), match_sync=Mock(return_value=False))
+        matcher2_ = Mock(is_sync=Mock(return_value=True), match_sync=Mock(return_value=True))
+        expressions = [compiler.call(matcher1_, "request"), compiler.call(matcher2_, "request")]
+
+    with when:
+        compiled = compiler.build(expressions)
+        actual = compiled.function(sentinel.request)
+
+    with then:
+        assert actual is False
+        matcher1_.match_sync.assert_called_once_with(sentinel.request)
+        matcher2_.match_sync.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_build_with_async_matcher(compiler):
+    with given:
+        matcher_ = Mock(is_sync=Mock(return_value=False), match=AsyncMock(return_value=True))
+        expression = compiler.call(matcher_, "request")
+
+    with when:
+        compiled = compiler.build([expression])
+        actual = await compiled.function(sentinel.request)
+
+    with then:
+        assert compiled.is_async is True
+        assert actual is True
+        matcher_.match.assert_awaited_once_with(sentinel.request)
+
+
+@pytest.mark.parametrize("compile_", [None, Mock(return_value=sentinel.expression)])
+def test_compile_matcher_without_expression(compile_, compiler):
+    with given:
+        matcher_ = Mock(compile=compile_, is_sync=Mock(return_value=True))
+
+    with when:
+        actual = compiler.compile_matcher(matcher_)
+
+    with then:
+        assert actual == "_c0.match_sync(request)"
+
+
+def test_compile_attribute(compiler):
+    with given:
+        matcher_ = Mock(compile=Mock(return_value="(value == 1)"))
+
+    with when:
+        actual = compiler.compile_attribute(matcher_, "value")
+
+    with then:
+        assert actual == "(value == 1)"
+        matcher_.compile.assert_called_once_with(compiler, "value")
+
+
+def test_compile_shared_matcher():
+    with given:
+        matcher_ = Mock(compile=Mock(return_value="request.matched()"))
+        compiler = MatcherCompiler({matcher_: 7})
+        compiled = compiler.build([compiler.compile_matcher(matcher_)])
+        request_ = Mock(matched=Mock(return_value=True))
+        results = {}
+
+    with when:
+        actual1 = compiled.function(request_, results)
+        actual2 = compiled.function(request_, results)
+
+    with then:
+        assert actual1 is actual2 is True
+        assert results == {7: True}
+        request_.matched.assert_called_once_with()
+        assert compiler.pure_matchers == [matcher_]
+
+
+def test_memoize():
+    with given:
+        compiler = MatcherCompiler()
+        compiled = compiler.build([compiler.memoize(sentinel.key, "request.matched()")])
+        request_ = Mock(matched=Mock(return_value=sentinel.result))
+        results = {}
+
+    with when:
+        actual1 = compiled.function(request_, results)
+        actual2 = compiled.function(request_, results)
+
+    with then:
+        assert actual1 is actual2 is sentinel.result
+        assert results == {sentinel.key: sentinel.result}
+        request_.matched.assert_called_once_with()
+
+
+def test_compile_matcher_with_calls_is_not_pure():
+    with given:
+        submatcher_ = Mock(is_sync=Mock(return_value=True))
+        matcher_ = Mock(compile=lambda compiler: compiler.call(submatcher_, "request"))
+        compiler = MatcherCompiler({matcher_: 0})
+
+    with when:
+        actual = compiler.compile_matcher(matcher_)
+
+    with then:
+        assert actual == "_c0.match_sync(request)"
+        assert compiler.pure_matchers == []
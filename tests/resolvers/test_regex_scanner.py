@@ -0,0 +1,134 @@
+import re
+
+import pytest
+
+from jj.resolvers import RegexPattern, RegexScanner
+
+from .._test_utils.steps import given, then, when
+
+PATTERNS = [
+    RegexPattern("^/users/[0-9]+$"),
+    RegexPattern("/items"),
+    RegexPattern("items/(?P<id>\\d+)"),
+    RegexPattern("^/USERS", re.IGNORECASE),
+    RegexPattern("(?i)^/files"),
+    RegexPattern("[0-9]+"),
+    RegexPattern("^/(users|items)$"),
+    RegexPattern("/us(ers)?"),
+]
+
+
+@pytest.fixture
+def scanner():
+    return RegexScanner()
+
+
+@pytest.mark.parametrize(("pattern", "literal"), [
+    (RegexPattern("^/users/[0-9]+$"), "/users/"),
+    (RegexPattern("/items"), "/items"),
+    (RegexPattern("a+bcd"), "bcd"),
+    (RegexPattern("^/USERS", re.IGNORECASE), ""),
+    (RegexPattern("(?i)^/files"), ""),
+    (RegexPattern("^/(users|items)$"), "/"),
+    (RegexPattern("[0-9]+"), ""),
+    (RegexPattern("/ a b # comment", re.VERBOSE), "/ab"),
+])
+def test_literal(pattern, literal):
+    with when:
+        actual = pattern.literal
+
+    with then:
+        assert actual == literal
+
+
+@pytest.mark.parametrize("value", [
+    "/users/1",
+    "/users/",
+    "/Users/1",
+    "/FILES/1",
+    "/items",
+    "/shop/items/12",
+    "/users",
+    "/u",
+    "",
+])
+def test_search_same_as_re_search(value, scanner):
+    with given:
+        for pattern in PATTERNS:
+            scanner.add(pattern)
+
+    with when:
+        matched = scanner.search([value])
+
+    with then:
+        assert matched == {pattern for pattern in PATTERNS if pattern.search(value)}
+
+
+def test_search_multiple_values(scanner):
+    with given:
+        scanner.add(RegexPattern("^a"))
+        scanner.add(RegexPattern("^b"))
+        scanner.add(RegexPattern("^c"))
+
+    with when:
+        matched = scanner.search(["apple", "banana"])
+
+    with then:
+        assert matched == {RegexPattern("^a"), RegexPattern("^b")}
+
+
+def test_add_twice(scanner):
+    with given:
+        scanner.add(RegexPattern("/users"))
+
+    with when:
+        scanner.add(RegexPattern("/users"))
+
+    with then:
+        assert len(scanner) == 1
+
+
+def test_remove(scanner):
+    with given:
+        scanner.add(RegexPattern("/users"))
+        scanner.add(RegexPattern("/users/items"))
+        scanner.add(RegexPattern("[0-9]+"))
+
+    with when:
+        scanner.remove(RegexPattern("/users/items"))
+        scanner.remove(RegexPattern("[0-9]+"))
+
+    with then:
+        assert len(scanner) == 1
+        assert scanner.search(["/users/items/1"]) == {RegexPattern("/users")}
+
+
+def test_remove_prunes_empty_branches(scanner):
+    with given:
+        scanner.add(RegexPattern("/users"))
+
+    with when:
+        scanner.remove(RegexPattern("/users"))
+
+    with then:
+        assert len(scanner) == 0
+        assert scanner._root.children == {}
+
+
+def test_remove_nonexisting_pattern(scanner):
+    with given:
+        scanner.add(RegexPattern("/users"))
+
+    with when:
+        scanner.remove(RegexPattern("/use"))
+        scanner.remove(RegexPattern("/items"))
+        scanner.remove(RegexPattern("[0-9]+"))
+
+    with then:
+        assert len(scanner) == 1
+
+
+def test_pattern_repr():
+    with then:
+        assert repr(RegexPattern("^/users")) == "RegexPattern('^/users')"
+        assert repr(RegexPattern("^/users", re.I)) == "RegexPattern('^/users', re.IGNORECASE)"
@@ -0,0 +1,96 @@
+from unittest.mock import sentinel
+
+import pytest
+
+from jj.resolvers import Registry
+
+from .._test_utils.steps import given, then, when
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+def test_initial_version(registry):
+    with then:
+        assert registry.version == 0
+
+
+def test_add_bumps_version(registry):
+    with when:
+        registry.add(sentinel.container, "name", sentinel.key)
+
+    with then:
+        assert registry.version == 1
+        assert list(registry.get(sentinel.container, "name")) == [sentinel.key]
+
+
+@pytest.mark.parametrize("remove", [
+    lambda registry: registry.remove_key(sentinel.container, "name", sentinel.key),
+    lambda registry: registry.remove_name(sentinel.container, "name"),
+    lambda registry: registry.remove_container(sentinel.container),
+])
+def test_remove_bumps_version(remove, registry):
+    with given:
+        registry.add(sentinel.container, "name", sentinel.key)
+
+    with when:
+        remove(registry)
+
+    with then:
+        assert registry.version == 2
+        assert list(registry.get(sentinel.container, "name")) == []
+
+
+@pytest.mark.parametrize("remove", [
+    lambda registry: registry.remove_key(sentinel.container, "name", sentinel.another_key),
+    lambda registry: registry.remove_name(sentinel.container, "another_name"),
+    lambda registry: registry.remove_container(sentinel.another_container),
+])
+def test_remove_nonexisting_keeps_version(remove, registry):
+    with given:
+        registry.add(sentinel.container, "name", sentinel.key)
+
+    with when:
+        remove(registry)
+
+    with then:
+        assert registry.version == 1
+
+
+def test_get_entry(registry):
+    with given:
+        registry.add(sentinel.container, "matchers", sentinel.matcher)
+        registry.add(sentinel.container, "attributes", "name", sentinel.value)
+        registry.add(sentinel.container, "handlers", sentinel.handler)
+
+    with when:
+        entry = registry.get_entry(sentinel.container)
+
+    with then:
+        assert list(entry.matchers) == [sentinel.matcher]
+        assert entry.attributes == {"name": sentinel.value}
+        assert entry.names == {"handlers": {sentinel.handler: None}}
+        assert not hasattr(entry, "__dict__")
+
+
+def test_get_nonexisting_entry(registry):
+    with when:
+        entry = registry.get_entry(sentinel.container)
+
+    with then:
+        assert entry is None
+
+
+@pytest.mark.parametrize("name", ["matchers", "attributes", "handlers"])
+def test_remove_name(name, registry):
+    with given:
+        registry.add(sentinel.container, name, sentinel.key)
+
+    with when:
+        registry.remove_name(sentinel.container, name)
+
+    with then:
+        assert registry.get_entry(sentinel.container).get(name) is None
+        assert list(registry.get(sentinel.container, name)) == []
@@ -0,0 +1,42 @@
+from unittest.mock import Mock, sentinel
+
+from jj.resolvers._request_view import RequestView
+
+from .._test_utils.steps import given, then, when
+
+
+def test_get_request_attribute():
+    with given:
+        view = RequestView(Mock(path=sentinel.path))
+
+    with when:
+        actual = view.path
+
+    with then:
+        assert actual == sentinel.path
+
+
+def test_set_attribute():
+    with given:
+        request = Mock(segments=sentinel.segments)
+        view = RequestView(request)
+
+    with when:
+        view.segments = sentinel.view_segments
+
+    with then:
+        assert view.segments == sentinel.view_segments
+        assert request.segments == sentinel.segments
+
+
+def test_apply():
+    with given:
+        request = Mock(segments=sentinel.segments)
+        view = RequestView(request)
+        view.segments = sentinel.view_segments
+
+    with when:
+        view.apply()
+
+    with then:
+        assert request.segments == sentinel.view_segments
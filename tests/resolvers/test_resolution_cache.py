@@ -0,0 +1,99 @@
+from unittest.mock import sentinel
+
+from pytest import raises
+
+from jj.resolvers import CacheInfo, ResolutionCache, ResolutionChain
+
+from .._test_utils.steps import given, then, when
+
+
+def test_invalid_maxsize():
+    with when, raises(Exception) as exception:
+        ResolutionCache(0)
+
+    with then:
+        assert exception.type is AssertionError
+
+
+def test_get_missing():
+    with given:
+        cache = ResolutionCache(2)
+
+    with when:
+        actual = cache.get(1, sentinel.key)
+
+    with then:
+        assert actual is None
+        assert cache.info == CacheInfo(hits=0, misses=1, maxsize=2, currsize=0)
+
+
+def test_get():
+    with given:
+        cache = ResolutionCache(2)
+        chain = ResolutionChain((sentinel.record,), complete=False)
+        cache.get(1, sentinel.key)
+        cache.set(1, sentinel.key, chain)
+
+    with when:
+        actual = cache.get(1, sentinel.key)
+
+    with then:
+        assert actual == chain
+        assert cache.info == CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+
+
+def test_get_with_another_version():
+    with given:
+        cache = ResolutionCache(2)
+        cache.get(1, sentinel.key)
+        cache.set(1, sentinel.key, ResolutionChain((), complete=True))
+
+    with when:
+        actual = cache.get(2, sentinel.key)
+
+    with then:
+        assert actual is None
+        assert cache.info.currsize == 0
+
+
+def test_set_with_outdated_version():
+    with given:
+        cache = ResolutionCache(2)
+        cache.get(2, sentinel.key)
+
+    with when:
+        cache.set(1, sentinel.key, ResolutionChain((), complete=True))
+
+    with then:
+        assert cache.get(2, sentinel.key) is None
+
+
+def test_evict_least_recently_used():
+    with given:
+        cache = ResolutionCache(2)
+        chain = ResolutionChain((), complete=True)
+        cache.get(1, sentinel.key1)
+        cache.set(1, sentinel.key1, chain)
+        cache.set(1, sentinel.key2, chain)
+        cache.get(1, sentinel.key1)
+
+    with when:
+        cache.set(1, sentinel.key3, chain)
+
+    with then:
+        assert cache.get(1, sentinel.key1) == chain
+        assert cache.get(1, sentinel.key2) is None
+        assert cache.get(1, sentinel.key3) == chain
+
+
+def test_clear():
+    with given:
+        cache = ResolutionCache(2)
+        cache.get(1, sentinel.key)
+        cache.set(1, sentinel.key, ResolutionChain((), complete=True))
+
+    with when:
+        cache.clear()
+
+    with then:
+        assert cache.info.currsize == 0
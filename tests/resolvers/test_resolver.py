@@ -1,10 +1,24 @@
+import asyncio
 from unittest import IsolatedAsyncioTestCase as TestCase
-from unittest.mock import AsyncMock, Mock, call, sentinel
+from unittest.mock import AsyncMock, Mock, call, patch, sentinel
 
 import pytest
+from aiohttp.web_urldispatcher import DynamicResource
+from multidict import CIMultiDict
 
 from jj.apps import create_app
-from jj.resolvers import Registry, Resolver
+from jj.expiration_policy import ExpireAfterRequests
+from jj.matchers import (
+    AllMatcher,
+    AttributeMatcher,
+    EqualMatcher,
+    HeaderMatcher,
+    MethodMatcher,
+    PathMatcher,
+    RegexMatcher,
+    ResolvableMatcher,
+)
+from jj.resolvers import CacheInfo, HandlerRecord, MatcherCompiler, Registry, Resolver
 
 
 class TestResolver(TestCase):
@@ -69,6 +83,54 @@ class TestResolver(TestCase):
         res = self.resolver.deregister_app(type(app))
         self.assertIsNone(res)
 
+    # Unwrap
+
+    def test_unwrap(self):
+        def decorator(fn):
+            def wrapper(*args, **kwargs):
+                return fn(*args, **kwargs)
+            return wrapper
+
+        async def handler(request):
+            pass
+
+        decorated = decorator(handler)
+        self.assertEqual(self.resolver.unwrap(decorated), handler)
+        self.assertEqual(self.resolver.unwrap(handler), handler)
+
+    def test_unwrap_is_cached(self):
+        async def handler(request):
+            pass
+
+        with patch("jj.resolvers._resolver.undecorated", return_value=None) as undecorated_:
+            self.resolver.unwrap(handler)
+            unwrapped = self.resolver.unwrap(handler)
+
+        self.assertEqual(unwrapped, handler)
+        undecorated_.assert_called_once_with(handler)
+
+    def test_get_arity(self):
+        async def handler(request):
+            pass
+
+        async def method(self, request):
+            pass
+
+        self.assertEqual(self.resolver.get_arity(handler), 1)
+        self.assertEqual(self.resolver.get_arity(method), 2)
+
+    def test_get_arity_is_cached_on_register(self):
+        async def handler(request):
+            pass
+
+        self.resolver.register_handler(handler, type(self.default_app))
+
+        with patch("jj.resolvers._resolver.signature") as signature_:
+            arity = self.resolver.get_arity(handler)
+
+        self.assertEqual(arity, 1)
+        signature_.assert_not_called()
+
     # Handlers
 
     def test_get_handlers(self):
@@ -420,3 +482,644 @@ class TestResolver(TestCase):
         handler1.assert_not_called()
         handler2.assert_not_called()
         matcher.assert_called_once_with(request)
+
+    # Dispatch
+
+    def test_get_candidates_without_handlers(self):
+        request = Mock(method="GET", path="/users")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual(list(candidates), [])
+
+    def test_get_candidates(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        MethodMatcher("GET", resolver=self.resolver)(handler1)
+        PathMatcher("/users", resolver=self.resolver)(handler1)
+        PathMatcher("/items", resolver=self.resolver)(handler2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler3)
+
+        request = Mock(method="GET", path="/users")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler3, handler1])
+
+    def test_get_candidates_by_header_value(self):
+        handlers = [AsyncMock(return_value=index) for index in range(3)]
+        for index, handler in enumerate(handlers):
+            HeaderMatcher({"X-Tenant": f"tenant{index}"}, resolver=self.resolver)(handler)
+        handler = AsyncMock(return_value=sentinel.response)
+        HeaderMatcher({"X-Tenant": RegexMatcher("^tenant")}, resolver=self.resolver)(handler)
+
+        request = Mock(headers=CIMultiDict({"x-tenant": "tenant1"}))
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler, handlers[1]])
+
+    def test_get_candidates_after_deregister_matcher(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        path_matcher = PathMatcher("/items", resolver=self.resolver)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler)
+        self.resolver.register_matcher(path_matcher.match, handler)
+
+        self.resolver.deregister_matcher(path_matcher.match, handler)
+
+        request = Mock(method="GET", path="/users")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler])
+
+    def test_get_candidates_after_deregister_handler(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler)
+
+        self.resolver.deregister_handler(handler, type(self.default_app))
+
+        request = Mock(method="GET", path="/users")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual(list(candidates), [])
+
+    def test_get_records_without_handlers(self):
+        records = self.resolver.get_records(type(self.default_app))
+        self.assertEqual(records, ())
+
+    def test_get_records(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(sentinel.matcher1, handler1)
+        self.resolver.register_matcher(sentinel.matcher2, handler2)
+        self.resolver.register_matcher(sentinel.matcher3, handler2)
+        self.resolver.register_attribute("expiration_policy", sentinel.policy, handler2)
+
+        records = self.resolver.get_records(type(self.default_app))
+        self.assertEqual(records, (
+            HandlerRecord(handler2, (sentinel.matcher2, sentinel.matcher3), sentinel.policy),
+            HandlerRecord(handler1, (sentinel.matcher1,), None),
+        ))
+
+    def test_get_records_reuses_snapshot(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        self.resolver.register_matcher(sentinel.matcher, handler)
+
+        records1 = self.resolver.get_records(type(self.default_app))
+        records2 = self.resolver.get_records(type(self.default_app))
+        self.assertIs(records1, records2)
+
+    def test_get_records_after_deregister_matcher(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        self.resolver.register_matcher(sentinel.matcher1, handler)
+        self.resolver.register_matcher(sentinel.matcher2, handler)
+        records1 = self.resolver.get_records(type(self.default_app))
+
+        self.resolver.deregister_matcher(sentinel.matcher1, handler)
+
+        records2 = self.resolver.get_records(type(self.default_app))
+        self.assertEqual(records1, (HandlerRecord(handler, (sentinel.matcher1,
+                                                            sentinel.matcher2), None),))
+        self.assertEqual(records2, (HandlerRecord(handler, (sentinel.matcher2,), None),))
+
+    def test_get_records_after_deregister_attribute(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        self.resolver.register_matcher(sentinel.matcher, handler)
+        self.resolver.register_attribute("expiration_policy", sentinel.policy, handler)
+
+        self.resolver.deregister_attribute("expiration_policy", handler)
+
+        records = self.resolver.get_records(type(self.default_app))
+        self.assertEqual(records, (HandlerRecord(handler, (sentinel.matcher,), None),))
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_expired_handler(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        policy = Mock(is_expired=AsyncMock(return_value=True))
+        self.resolver.register_attribute("expiration_policy", policy, handler2)
+
+        request = Mock()
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+
+        policy.is_expired.assert_called_once_with(request)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_priority(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        matcher3 = AsyncMock(return_value=True)
+        self.resolver.register_matcher(matcher3, handler3)
+        self.resolver.register_attribute("priority", 1, handler1)
+        self.resolver.register_attribute("priority", 1, handler2)
+
+        request = Mock()
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler2)
+
+        matcher3.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_deregistered_priority(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        self.resolver.register_attribute("priority", 1, handler1)
+        self.resolver.deregister_attribute("priority", handler1)
+
+        response = await self.resolver.resolve(Mock(), self.default_app)
+        self.assertEqual(response, handler2)
+
+    def test_get_candidates_with_priority(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=self.resolver)(handler1)
+        MethodMatcher("GET", resolver=self.resolver)(handler2)
+        self.resolver.register_attribute("priority", -1, handler2)
+
+        request = Mock(method="GET", path="/")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler1, handler2])
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_permanently_expired_handler(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        matcher2 = AsyncMock(return_value=True)
+        self.resolver.register_matcher(matcher2, handler2)
+        policy = Mock(is_expired=AsyncMock(return_value=True),
+                      is_permanently_expired=Mock(return_value=True),
+                      get_deadline=Mock(return_value=None))
+        self.resolver.register_attribute("expiration_policy", policy, handler2)
+
+        request = Mock()
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+
+        matcher2.assert_not_called()
+        policy.is_expired.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_deadline_handler(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        policy = Mock(is_expired=AsyncMock(return_value=True),
+                      is_permanently_expired=Mock(return_value=True),
+                      get_deadline=Mock(return_value=0.0))
+        self.resolver.register_attribute("expiration_policy", policy, handler2)
+
+        request = Mock()
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+
+        # the deadline is left to the scheduler, the policy is checked once matched
+        policy.is_permanently_expired.assert_not_called()
+        policy.is_expired.assert_awaited_once_with(request)
+
+    @pytest.mark.asyncio
+    async def test_resolve_skips_non_candidates(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        submatcher1 = Mock(AttributeMatcher, match=AsyncMock(return_value=True),
+                           get_literals=Mock(return_value=frozenset({"GET"})))
+        submatcher2 = Mock(AttributeMatcher, match=AsyncMock(return_value=True),
+                           get_literals=Mock(return_value=frozenset({"POST"})))
+        MethodMatcher(submatcher1, resolver=self.resolver)(handler1)
+        MethodMatcher(submatcher2, resolver=self.resolver)(handler2)
+
+        request = Mock(method="GET", path="/")
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+
+        submatcher1.match.assert_called_once_with("*")
+        submatcher2.match.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_sync_matcher(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        matcher = MethodMatcher("GET", resolver=self.resolver)
+        matcher(handler)
+
+        request = Mock(method="GET", path="/")
+        with patch.object(MethodMatcher, "match") as match_:
+            response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler)
+
+        match_.assert_not_called()
+
+    def test_get_records_with_compiled_matchers(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        MethodMatcher("GET", resolver=self.resolver)(handler)
+        PathMatcher("/users", resolver=self.resolver)(handler)
+
+        record, = self.resolver.get_records(type(self.default_app))
+        compiled_matcher = record.compiled_matcher
+        self.assertIsNotNone(compiled_matcher)
+        self.assertFalse(compiled_matcher.is_async)
+        self.assertTrue(compiled_matcher.function(Mock(method="GET", path="/users")))
+        self.assertFalse(compiled_matcher.function(Mock(method="GET", path="/items")))
+
+    def test_get_records_without_compiling_matchers(self):
+        resolver = Resolver(Registry(), self.default_app, self.default_handler,
+                            compile_matchers=False)
+        handler = AsyncMock(return_value=sentinel.response)
+        MethodMatcher("GET", resolver=resolver)(handler)
+
+        record, = resolver.get_records(type(self.default_app))
+        self.assertIsNone(record.compiled_matcher)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_custom_async_matcher(self):
+        class CustomMatcher(ResolvableMatcher):
+            async def match(self, request):
+                return request.path == "/users"
+
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=self.resolver)(handler1)
+        AllMatcher([
+            MethodMatcher("GET", resolver=self.resolver),
+            CustomMatcher(resolver=self.resolver),
+        ], resolver=self.resolver)(handler2)
+
+        record = self.resolver.get_records(type(self.default_app))[0]
+        self.assertTrue(record.compiled_matcher.is_async)
+
+        response = await self.resolver.resolve(Mock(method="GET", path="/users"),
+                                               self.default_app)
+        self.assertEqual(response, handler2)
+        response = await self.resolver.resolve(Mock(method="GET", path="/items"),
+                                               self.default_app)
+        self.assertEqual(response, handler1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_shared_matcher(self):
+        class Method:
+            __hash__ = object.__hash__
+
+            def __init__(self):
+                self.comparisons = 0
+
+            def __eq__(self, other):
+                self.comparisons += 1
+                return other == "GET"
+
+        method = Method()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher(EqualMatcher(method), resolver=self.resolver)(handler1)
+        AllMatcher([
+            MethodMatcher(EqualMatcher(method), resolver=self.resolver),
+            HeaderMatcher({"x-tenant": "acme"}, resolver=self.resolver),
+        ], resolver=self.resolver)(handler2)
+
+        response = await self.resolver.resolve(Mock(method="GET", headers=CIMultiDict()),
+                                               self.default_app)
+        self.assertEqual(response, handler1)
+        # "*" and "GET" are compared once, though both handlers check the method
+        self.assertEqual(method.comparisons, 2)
+
+    def test_register_handler_compiles_matchers_once(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        app = create_app()
+
+        with patch.object(MatcherCompiler, "build", autospec=True,
+                          side_effect=MatcherCompiler.build) as build:
+            self.resolver.register_attribute("expiration_policy", None, handler)
+            AllMatcher([
+                MethodMatcher("GET", resolver=self.resolver),
+                PathMatcher("/users", resolver=self.resolver),
+            ], priority=1, resolver=self.resolver)(handler)
+            self.resolver.register_handler(handler, type(app))
+
+        self.assertEqual(build.call_count, 1)
+
+    def test_deregister_handler_releases_shared_matchers(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=self.resolver)(handler1)
+        MethodMatcher("GET", resolver=self.resolver)(handler2)
+
+        self.resolver.deregister_handler(handler1, type(self.default_app))
+        self.resolver.deregister_handler(handler2, type(self.default_app))
+
+        self.assertEqual(self.resolver._pure_matchers, {})
+        self.assertEqual(self.resolver._matcher_users, {})
+        self.assertEqual(self.resolver._compiled_matchers, {})
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_by_route(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        PathMatcher("/users/{id}", resolver=self.resolver)(handler1)
+        PathMatcher("/users/{id}/items/{item_id}", resolver=self.resolver)(handler2)
+        PathMatcher("/items/{id}", resolver=self.resolver)(handler3)
+
+        request = Mock(method="GET", path="/users/1/items/2")
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler2)
+        self.assertEqual(request.segments, {"id": "1", "item_id": "2"})
+
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler2])
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_sets_segments_of_winner_only(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=self.resolver)(handler1)
+        AllMatcher([
+            PathMatcher("/users/{name}", resolver=self.resolver),
+            MethodMatcher("POST", resolver=self.resolver),
+        ], resolver=self.resolver)(handler2)
+
+        request = Mock(method="GET", path="/users/1", segments=None)
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+        self.assertIsNone(request.segments)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_extracts_segments_once(self):
+        handler = AsyncMock(return_value=sentinel.response)
+        PathMatcher("/users/{id}", resolver=self.resolver)(handler)
+
+        request = Mock(method="GET", path="/users/1", segments=None)
+        with patch.object(DynamicResource, "_match", autospec=True,
+                          side_effect=DynamicResource._match) as match:
+            response = await self.resolver.resolve(request, self.default_app)
+
+        self.assertEqual(response, handler)
+        self.assertEqual(request.segments, {"id": "1"})
+        self.assertEqual(match.call_count, 1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_reuses_segments_of_route_tree(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        PathMatcher("/users/{id}", resolver=self.resolver)(handler1)
+        PathMatcher("/items/{id}", resolver=self.resolver)(handler2)
+        PathMatcher("/users/{id}/items", resolver=self.resolver)(handler3)
+
+        request = Mock(method="GET", path="/users/1", segments=None)
+        with patch.object(DynamicResource, "_match", autospec=True,
+                          side_effect=DynamicResource._match) as match:
+            response = await self.resolver.resolve(request, self.default_app)
+
+        self.assertEqual(response, handler1)
+        self.assertEqual(request.segments, {"id": "1"})
+        # by the route tree only
+        self.assertEqual(match.call_count, 1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_combined_regexes(self):
+        resolver = Resolver(Registry(), self.default_app, self.default_handler,
+                            combine_regexes=True)
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        PathMatcher(RegexMatcher("^/users/[0-9]+$"), resolver=resolver)(handler1)
+        PathMatcher(RegexMatcher("^/items"), resolver=resolver)(handler2)
+        HeaderMatcher({"Accept": RegexMatcher("json")}, resolver=resolver)(handler3)
+
+        request = Mock(method="GET", path="/users/1", headers=CIMultiDict({"Accept": "*/*"}))
+        candidates = resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler1])
+
+        response = await resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_priority_with_unindexed_handler(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        AllMatcher([
+            MethodMatcher("GET", resolver=self.resolver),
+            PathMatcher("/users", resolver=self.resolver),
+        ], resolver=self.resolver)(handler2)
+
+        request = Mock(method="GET", path="/users")
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler2)
+
+    # Resolution cache
+
+    def make_caching_resolver(self):
+        return Resolver(Registry(), self.default_app, self.default_handler, cache_size=16)
+
+    def test_cache_info_without_cache(self):
+        cache_info = self.resolver.cache_info
+        self.assertEqual(cache_info, CacheInfo(hits=0, misses=0, maxsize=0, currsize=0))
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_cache(self):
+        resolver = self.make_caching_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        PathMatcher("/users/{id}", resolver=resolver)(handler1)
+        AllMatcher([
+            MethodMatcher("GET", resolver=resolver),
+            HeaderMatcher({"X-Tenant": "acme"}, resolver=resolver),
+        ], resolver=resolver)(handler2)
+
+        for request_id in range(3):
+            request = Mock(method="POST", path="/users/1",
+                           headers=CIMultiDict({"X-Tenant": "acme", "X-Request-Id": request_id}))
+            response = await resolver.resolve(request, self.default_app)
+            self.assertEqual(response, handler1)
+            self.assertEqual(request.segments, {"id": "1"})
+
+        self.assertEqual(resolver.cache_info, CacheInfo(hits=2, misses=1, maxsize=16, currsize=1))
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_cache_after_register(self):
+        resolver = self.make_caching_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=resolver)(handler1)
+
+        response = await resolver.resolve(Mock(method="GET"), self.default_app)
+        self.assertEqual(response, handler1)
+
+        MethodMatcher("GET", resolver=resolver)(handler2)
+
+        response = await resolver.resolve(Mock(method="GET"), self.default_app)
+        self.assertEqual(response, handler2)
+        self.assertEqual(resolver.cache_info.hits, 0)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_cache_and_expiration(self):
+        resolver = self.make_caching_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=resolver)(handler1)
+        MethodMatcher("GET", resolver=resolver)(handler2)
+        policy = ExpireAfterRequests(2)
+        resolver.register_attribute("expiration_policy", policy, handler2)
+
+        responses = [await resolver.resolve(Mock(method="GET"), self.default_app)
+                     for _ in range(4)]
+        self.assertEqual(responses, [handler2, handler2, handler1, handler1])
+        self.assertEqual(resolver.cache_info.hits, 3)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_cache_and_all_expired(self):
+        resolver = self.make_caching_resolver()
+        handler = AsyncMock(return_value=sentinel.response)
+        MethodMatcher("GET", resolver=resolver)(handler)
+        policy = Mock(is_expired=AsyncMock(return_value=True))
+        resolver.register_attribute("expiration_policy", policy, handler)
+
+        responses = [await resolver.resolve(Mock(method="GET"), self.default_app)
+                     for _ in range(2)]
+        self.assertEqual(responses, [self.default_handler, self.default_handler])
+        self.assertEqual(policy.is_expired.call_count, 2)
+        self.assertEqual(resolver.cache_info.hits, 1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_cache_and_custom_matcher(self):
+        resolver = self.make_caching_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        MethodMatcher("GET", resolver=resolver)(handler1)
+        matcher = AsyncMock(side_effect=[True, False])
+        resolver.register_matcher(matcher, handler2)
+
+        responses = [await resolver.resolve(Mock(method="GET"), self.default_app)
+                     for _ in range(2)]
+        self.assertEqual(responses, [handler2, handler1])
+        self.assertEqual(resolver.cache_info, CacheInfo(hits=0, misses=0, maxsize=16, currsize=0))
+
+    # Concurrent resolution
+
+    def make_concurrent_resolver(self, concurrency=4):
+        return Resolver(Registry(), self.default_app, self.default_handler,
+                        concurrency=concurrency)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(AssertionError):
+            self.make_concurrent_resolver(concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently(self):
+        resolver = self.make_concurrent_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        evaluated = asyncio.Event()
+
+        async def matcher1(request):
+            evaluated.set()
+            return True
+
+        async def matcher2(request):
+            # the sequential scan would wait here forever
+            await evaluated.wait()
+            return True
+
+        resolver.register_matcher(matcher1, handler1)
+        resolver.register_matcher(matcher2, handler2)
+
+        response = await asyncio.wait_for(resolver.resolve(Mock(), self.default_app), 1)
+        self.assertEqual(response, handler2)
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently_keeps_precedence(self):
+        resolver = self.make_concurrent_resolver()
+        handlers = [AsyncMock(return_value=sentinel.response) for _ in range(3)]
+        # the last registered handler is checked first, but finishes last
+        results, delays = [True, False, True], [0.001, 0.002, 0.003]
+
+        for handler, result, delay in zip(handlers, results, delays):
+            async def matcher(request, result=result, delay=delay):
+                await asyncio.sleep(delay)
+                return result
+            resolver.register_matcher(matcher, handler)
+
+        response = await resolver.resolve(Mock(), self.default_app)
+        self.assertEqual(response, handlers[2])
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently_cancels_pending(self):
+        resolver = self.make_concurrent_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        cancelled = asyncio.Event()
+
+        async def matcher1(request):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return True
+
+        resolver.register_matcher(matcher1, handler1)
+        resolver.register_matcher(AsyncMock(return_value=True), handler2)
+
+        response = await resolver.resolve(Mock(), self.default_app)
+        self.assertEqual(response, handler2)
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently_bounded(self):
+        resolver = self.make_concurrent_resolver(concurrency=2)
+        running, max_running = 0, 0
+
+        async def matcher(request):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return False
+
+        for _ in range(5):
+            resolver.register_matcher(matcher, AsyncMock(return_value=sentinel.response))
+
+        response = await resolver.resolve(Mock(), self.default_app)
+        self.assertEqual(response, self.default_handler)
+        self.assertEqual(max_running, 2)
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently_sets_winner_attributes(self):
+        resolver = self.make_concurrent_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+
+        async def matcher1(request):
+            request.segments = sentinel.segments1
+            return True
+
+        async def matcher2(request):
+            request.segments = sentinel.segments2
+            await asyncio.sleep(0.01)
+            return True
+
+        resolver.register_matcher(matcher1, handler1)
+        resolver.register_matcher(matcher2, handler2)
+
+        request = Mock(segments=None)
+        response = await resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler2)
+        self.assertEqual(request.segments, sentinel.segments2)
+
+    @pytest.mark.asyncio
+    async def test_resolve_concurrently_with_expired_handler(self):
+        resolver = self.make_concurrent_resolver()
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        policy = Mock(is_expired=AsyncMock(return_value=True))
+        resolver.register_attribute("expiration_policy", policy, handler2)
+
+        request = Mock()
+        response = await resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler1)
+        policy.is_expired.assert_called_once_with(request)
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, Mock, call, sentinel
 import pytest
 
 from jj.apps import create_app
-from jj.resolvers import Registry, ReversedResolver
+from jj.resolvers import HandlerRecord, Registry, ReversedResolver
 
 
 class TestReversedResolver(TestCase):
@@ -65,3 +65,43 @@ class TestReversedResolver(TestCase):
         handler1.assert_not_called()
         handler2.assert_not_called()
         matcher.assert_called_once_with(request)
+
+    def test_get_candidates(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+
+        request = Mock(method="GET", path="/")
+        candidates = self.resolver.get_candidates(request, type(self.default_app))
+        self.assertEqual([record.handler for record in candidates], [handler1, handler2])
+
+    def test_get_records(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        self.resolver.register_matcher(sentinel.matcher1, handler1)
+        self.resolver.register_matcher(sentinel.matcher2, handler2)
+
+        records = self.resolver.get_records(type(self.default_app))
+        self.assertEqual(records, (
+            HandlerRecord(handler1, (sentinel.matcher1,), None),
+            HandlerRecord(handler2, (sentinel.matcher2,), None),
+        ))
+
+    @pytest.mark.asyncio
+    async def test_resolve_request_with_priority(self):
+        handler1 = AsyncMock(return_value=sentinel.response1)
+        handler2 = AsyncMock(return_value=sentinel.response2)
+        handler3 = AsyncMock(return_value=sentinel.response3)
+        matcher1 = AsyncMock(return_value=True)
+        self.resolver.register_matcher(matcher1, handler1)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler2)
+        self.resolver.register_matcher(AsyncMock(return_value=True), handler3)
+        self.resolver.register_attribute("priority", 1, handler2)
+        self.resolver.register_attribute("priority", 1, handler3)
+
+        request = Mock()
+        response = await self.resolver.resolve(request, self.default_app)
+        self.assertEqual(response, handler2)
+
+        matcher1.assert_not_called()
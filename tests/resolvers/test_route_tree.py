@@ -0,0 +1,136 @@
+import pytest
+
+from jj.matchers.attribute_matchers import RouteMatcher
+from jj.resolvers import RoutePattern, RouteTree
+
+from .._test_utils.steps import given, then, when
+
+ROUTES = [
+    "/",
+    "/users",
+    "/users/{id}",
+    "/users/{id}/items/{item_id}",
+    "/users/{id}.json",
+    "/users/me",
+    "/files/{tail:.*}",
+    "/{version:v\\d+}/status",
+    "/a b/{id}",
+]
+
+
+@pytest.fixture
+def tree():
+    return RouteTree()
+
+
+@pytest.mark.parametrize("path", [
+    "/",
+    "",
+    "/users",
+    "/users/",
+    "/users/1",
+    "/users/me",
+    "/users/1.json",
+    "/users/1/items/2",
+    "/users/1/items",
+    "/users/1/items/2/3",
+    "/users//items/2",
+    "/files",
+    "/files/",
+    "/files/a/b/c",
+    "/v1/status",
+    "/vx/status",
+    "/a b/1",
+    "/users/%7Bid%7D",
+    "/unknown",
+])
+def test_match_same_as_route_matcher(path, tree):
+    with given:
+        for route in ROUTES:
+            tree.add(RoutePattern(route))
+
+    with when:
+        matched = tree.match(path)
+
+    with then:
+        expected = {}
+        for route in ROUTES:
+            matcher = RouteMatcher(route)
+            if matcher._resource.match(path) is not None:
+                expected[RoutePattern(route)] = matcher.get_segments(path)
+        assert matched == expected
+
+
+def test_match_segments(tree):
+    with given:
+        tree.add(RoutePattern("/users/{id}/items/{item_id}"))
+
+    with when:
+        matched = tree.match("/users/1/items/2")
+
+    with then:
+        assert matched == {
+            RoutePattern("/users/{id}/items/{item_id}"): {"id": "1", "item_id": "2"},
+        }
+
+
+def test_add_twice(tree):
+    with given:
+        tree.add(RoutePattern("/users/{id}"))
+
+    with when:
+        tree.add(RoutePattern("/users/{id}"))
+
+    with then:
+        assert len(tree) == 1
+
+
+def test_remove(tree):
+    with given:
+        tree.add(RoutePattern("/users/{id}"))
+        tree.add(RoutePattern("/users/{id}/items/{item_id}"))
+
+    with when:
+        tree.remove(RoutePattern("/users/{id}/items/{item_id}"))
+
+    with then:
+        assert len(tree) == 1
+        assert tree.match("/users/1/items/2") == {}
+        assert tree.match("/users/1") == {RoutePattern("/users/{id}"): {"id": "1"}}
+
+
+def test_remove_prunes_empty_branches(tree):
+    with given:
+        tree.add(RoutePattern("/users/{id}/items/{item_id}"))
+        tree.add(RoutePattern("/files/{tail:.*}"))
+
+    with when:
+        tree.remove(RoutePattern("/users/{id}/items/{item_id}"))
+        tree.remove(RoutePattern("/files/{tail:.*}"))
+
+    with then:
+        assert len(tree) == 0
+        assert tree._root.is_empty()
+
+
+def test_remove_nonexisting_route(tree):
+    with given:
+        tree.add(RoutePattern("/users/{id}"))
+
+    with when:
+        tree.remove(RoutePattern("/users/{id}/items"))
+        tree.remove(RoutePattern("/items/{id}"))
+
+    with then:
+        assert len(tree) == 1
+
+
+def test_route_pattern_repr():
+    with given:
+        route = RoutePattern("/users/{id}")
+
+    with when:
+        actual = repr(route)
+
+    with then:
+        assert actual == "RoutePattern('/users/{id}')"
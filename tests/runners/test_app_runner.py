@@ -0,0 +1,83 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase as TestCase
+from unittest.mock import Mock, call
+
+import pytest
+
+import jj
+from jj.handlers import default_handler
+from jj.matchers import MethodMatcher
+from jj.middlewares import BaseMiddleware
+from jj.requests import Request
+from jj.resolvers import Registry, ReversedResolver
+from jj.responses import Response
+from jj.runners import AppRunner
+
+
+class TestAppRunner(TestCase):
+    def setUp(self):
+        self.resolver = ReversedResolver(Registry(), jj.App(), default_handler)
+
+    def make_request(self):
+        request_ = Mock(Request)
+        request_.headers.get.return_value = None
+        return request_
+
+    def make_app(self, mock_):
+        class Middleware(BaseMiddleware):
+            async def do(self, request, handler, app):
+                mock_(request)
+                return await handler(request)
+
+        class App(jj.App):
+            resolver = self.resolver
+
+            @Middleware(resolver)
+            @MethodMatcher("*", resolver=resolver)
+            async def handler(request):
+                return Response(status=200)
+
+        return App()
+
+    @pytest.mark.asyncio
+    async def test_handle(self):
+        mock_ = Mock()
+        runner = AppRunner(self.make_app(mock_), self.resolver, [], asyncio.get_running_loop())
+        request_ = self.make_request()
+
+        response = await runner._handle(request_)
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(mock_.mock_calls, [call(request_)])
+
+    @pytest.mark.asyncio
+    async def test_handle_reuses_chain(self):
+        app = self.make_app(Mock())
+        runner = AppRunner(app, self.resolver, [], asyncio.get_running_loop())
+
+        with self.subTest("build"):
+            await runner._handle(self.make_request())
+            chains = dict(runner._chains)
+            self.assertEqual(len(chains), 1)
+
+        with self.subTest("reuse"):
+            await runner._handle(self.make_request())
+            self.assertEqual(runner._chains, chains)
+
+    @pytest.mark.asyncio
+    async def test_handle_rebuilds_chain_on_registry_change(self):
+        mock_ = Mock()
+        app = self.make_app(Mock())
+        runner = AppRunner(app, self.resolver, [], asyncio.get_running_loop())
+        await runner._handle(self.make_request())
+
+        class Middleware(BaseMiddleware):
+            async def do(self, request, handler, app):
+                mock_(request)
+                return await handler(request)
+        Middleware(self.resolver)(type(app).handler)
+
+        request_ = self.make_request()
+        await runner._handle(request_)
+
+        self.assertEqual(mock_.mock_calls, [call(request_)])